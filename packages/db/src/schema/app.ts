@@ -1,4 +1,4 @@
-import { pgTable, text, timestamp, integer, jsonb, real, boolean, vector, index } from 'drizzle-orm/pg-core';
+import { pgTable, text, timestamp, integer, jsonb, real, boolean, vector, index, primaryKey } from 'drizzle-orm/pg-core';
 import { sql } from 'drizzle-orm';
 import { users } from './auth';
 
@@ -341,6 +341,22 @@ export const schedules = pgTable('schedules', {
   updatedAt: timestamp('updated_at', { mode: 'date' }).defaultNow().notNull(),
 });
 
+// One row per schedule task, written alongside schedules.tasks so per-task
+// filters (status, dates, critical path) are plain index scans.
+export const scheduleTasks = pgTable('schedule_tasks', {
+  scheduleId: text('schedule_id')
+    .notNull()
+    .references(() => schedules.id, { onDelete: 'cascade' }),
+  taskId: text('task_id').notNull(),
+  startDate: timestamp('start_date', { mode: 'date' }),
+  endDate: timestamp('end_date', { mode: 'date' }),
+  onCriticalPath: boolean('on_critical_path').default(false).notNull(),
+  payload: jsonb('payload').notNull(), // full ScheduleTask
+}, (table) => [
+  primaryKey({ columns: [table.scheduleId, table.taskId] }),
+  index('idx_schedule_tasks_critical').on(table.scheduleId).where(sql`${table.onCriticalPath}`),
+]);
+
 export const milestones = pgTable('milestones', {
   id: text('id')
     .primaryKey()
@@ -4,7 +4,7 @@ import {
   projects, rooms, designVariants, uploads, userApiKeys, jobs,
   bomResults, drawingResults, cutlistResults, mepCalculations,
   categories, products, vendors, productPrices, productEmbeddings,
-  schedules, milestones, siteLogs, changeOrders,
+  schedules, scheduleTasks, milestones, siteLogs, changeOrders,
   purchaseOrders, payments, invoices,
   comments, approvals, notifications,
   contractors, contractorReviews, contractorAssignments,
@@ -192,6 +192,11 @@ export const schedulesRelations = relations(schedules, ({ one, many }) => ({
   project: one(projects, { fields: [schedules.projectId], references: [projects.id] }),
   job: one(jobs, { fields: [schedules.jobId], references: [jobs.id] }),
   milestones: many(milestones),
+  scheduleTasks: many(scheduleTasks),
+}));
+
+export const scheduleTasksRelations = relations(scheduleTasks, ({ one }) => ({
+  schedule: one(schedules, { fields: [scheduleTasks.scheduleId], references: [schedules.id] }),
 }));
 
 export const milestonesRelations = relations(milestones, ({ one, many }) => ({
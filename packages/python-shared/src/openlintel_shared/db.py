@@ -14,8 +14,10 @@ Usage in a FastAPI service::
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
-from typing import Annotated
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated, Any
+from uuid import uuid4
 
 import structlog
 from fastapi import Depends
@@ -26,6 +28,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from openlintel_shared.config import Settings, get_settings
 
@@ -35,6 +38,19 @@ _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _json_codec_options() -> dict[str, Any]:
+    """Return engine options that encode/decode JSON columns with orjson, if installed."""
+    try:
+        import orjson
+    except ImportError:
+        return {}
+
+    def _dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+
+    return {"json_serializer": _dumps, "json_deserializer": orjson.loads}
+
+
 def _get_engine(settings: Settings | None = None) -> AsyncEngine:
     """Create or return the cached async engine."""
     global _engine  # noqa: PLW0603
@@ -44,13 +60,38 @@ def _get_engine(settings: Settings | None = None) -> AsyncEngine:
     if settings is None:
         settings = get_settings()
 
+    if settings.DB_EXTERNAL_POOLER:
+        # PgBouncer in transaction mode owns the pooling; asyncpg's prepared
+        # statements do not survive being moved between server connections,
+        # so disable the caches and give every statement a unique name.
+        _engine = create_async_engine(
+            settings.async_database_url,
+            echo=settings.LOG_LEVEL == "debug",
+            poolclass=NullPool,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+            **_json_codec_options(),
+        )
+        return _engine
+
     _engine = create_async_engine(
         settings.async_database_url,
         echo=settings.LOG_LEVEL == "debug",
-        pool_size=10,
-        max_overflow=20,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_pre_ping=True,
-        pool_recycle=300,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Pooled connections live long, so repeated statements (e.g. the job
+        # status UPDATEs and milestone INSERTs) are parsed and planned once.
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+        **_json_codec_options(),
     )
     return _engine
 
@@ -105,6 +146,31 @@ def get_session_factory(settings: Settings | None = None) -> async_sessionmaker[
     return _get_session_factory(settings)
 
 
+@asynccontextmanager
+async def session_scope(settings: Settings | None = None) -> AsyncIterator[AsyncSession]:
+    """Open a short-lived session for one unit of work outside a request.
+
+    Long-running background jobs should wrap each status write or lookup
+    in its own scope rather than holding one session for the whole job, so
+    a pooled connection is only checked out while a statement runs::
+
+        async with session_scope() as db:
+            await update_job_status(db, job_id, status="running", progress=40)
+
+    The session is committed on success, rolled back on exception, and
+    closed on exit, returning its connection to the pool.
+    """
+    session = _get_session_factory(settings)()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 async def check_db_health(settings: Settings | None = None) -> bool:
     """Execute a lightweight ``SELECT 1`` to verify database connectivity.
 
@@ -9,6 +9,7 @@ models needed (the Drizzle schema in TypeScript is the source of truth).
 from __future__ import annotations
 
 import json
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Any
@@ -19,6 +20,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = structlog.get_logger(__name__)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps_output(value: dict[str, Any]) -> str:
+    """Serialise a job's ``output_json`` with orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(value)
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # ---------------------------------------------------------------------------
 # Job lifecycle helpers
@@ -44,7 +57,7 @@ async def update_job_status(
 
     if output_json is not None:
         sets.append("output_json = :output_json")
-        params["output_json"] = json.dumps(output_json)
+        params["output_json"] = _dumps_output(output_json)
 
     if error is not None:
         sets.append("error = :error")
@@ -64,6 +77,82 @@ async def update_job_status(
     logger.info("job_status_updated", job_id=job_id, status=status, progress=progress)
 
 
+async def claim_job(db: AsyncSession, job_id: str, *, progress: int = 0) -> bool:
+    """Atomically move a ``pending`` job to ``running``.
+
+    Duplicate or concurrent deliveries of the same job race on the row lock;
+    only the caller whose UPDATE still sees ``status = 'pending'`` gets a row
+    back, so each job runs once even across workers and processes.
+
+    Returns
+    -------
+    bool
+        ``True`` if this caller claimed the job and should run it.
+    """
+    result = await db.execute(
+        text(
+            "UPDATE jobs SET status = 'running', progress = :progress, "
+            "started_at = :started_at "
+            "WHERE id = :job_id AND status = 'pending' "
+            "RETURNING id"
+        ),
+        {"job_id": job_id, "progress": progress, "started_at": datetime.now(timezone.utc)},
+    )
+    claimed = result.first() is not None
+    await db.commit()
+
+    logger.info("job_claimed" if claimed else "job_claim_skipped", job_id=job_id)
+    return claimed
+
+
+class ProgressThrottler:
+    """Coalesce intermediate progress updates for one job.
+
+    Background jobs report progress at every step, and each report is a
+    commit round-trip.  :meth:`update` writes intermediate ``running``
+    updates only when at least ``min_interval`` seconds have passed since
+    the previous write; terminal states (``completed``/``failed``) are
+    always written.
+    """
+
+    def __init__(self, job_id: str, *, min_interval: float = 0.5) -> None:
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self._last_write: float | None = None
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        status: str,
+        progress: int | None = None,
+        output_json: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> bool:
+        """Forward to :func:`update_job_status` unless the write can be skipped.
+
+        Returns
+        -------
+        bool
+            ``True`` if the update was written.
+        """
+        now = time.monotonic()
+        terminal = status in ("completed", "failed")
+        if (
+            not terminal
+            and self._last_write is not None
+            and now - self._last_write < self.min_interval
+        ):
+            return False
+
+        await update_job_status(
+            db, self.job_id, status=status, progress=progress,
+            output_json=output_json, error=error,
+        )
+        self._last_write = now
+        return True
+
+
 # ---------------------------------------------------------------------------
 # DB fetch helpers
 # ---------------------------------------------------------------------------
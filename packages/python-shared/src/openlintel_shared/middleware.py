@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import time
 import uuid
-from typing import Callable
+from typing import Any, Callable
 
 import structlog
 from fastapi import FastAPI, Request, Response
@@ -162,18 +162,32 @@ def configure_logging(settings: Settings | None = None) -> None:
         structlog.processors.UnicodeDecoder(),
     ]
 
+    renderer: Any
+    logger_factory: Any
+    if log_level == "DEBUG":
+        renderer = structlog.dev.ConsoleRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
+    else:
+        try:
+            import orjson
+        except ImportError:
+            renderer = structlog.processors.JSONRenderer()
+            logger_factory = structlog.PrintLoggerFactory()
+        else:
+            # orjson renders straight to bytes, so write them without decoding
+            renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+            logger_factory = structlog.BytesLoggerFactory()
+
     structlog.configure(
         processors=[
             *shared_processors,
             structlog.processors.format_exc_info,
-            structlog.dev.ConsoleRenderer()
-            if log_level == "DEBUG"
-            else structlog.processors.JSONRenderer(),
+            renderer,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(
             structlog.get_level_from_name(log_level)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
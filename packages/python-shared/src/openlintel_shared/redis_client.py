@@ -11,12 +11,20 @@ from typing import Any
 
 import redis.asyncio as aioredis
 import structlog
+import zstandard
 
 from openlintel_shared.config import Settings, get_settings
 
 logger = structlog.get_logger(__name__)
 
 _pool: aioredis.Redis | None = None  # type: ignore[type-arg]
+_binary_pool: aioredis.Redis | None = None  # type: ignore[type-arg]
+
+# Compressed cache values start with this version byte; anything else is read
+# as plain JSON, so keys written by ``cache_set`` stay readable.
+_ZSTD_PREFIX = b"\x01"
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
 
 
 def get_redis(settings: Settings | None = None) -> aioredis.Redis:  # type: ignore[type-arg]
@@ -50,15 +58,49 @@ def get_redis(settings: Settings | None = None) -> aioredis.Redis:  # type: igno
     return _pool
 
 
+def get_binary_redis(settings: Settings | None = None) -> aioredis.Redis:  # type: ignore[type-arg]
+    """Return a cached async Redis client that returns raw ``bytes``.
+
+    Needed for values that are not UTF-8 text, such as the compressed
+    payloads written by :func:`cache_set_compressed`.
+
+    Parameters
+    ----------
+    settings:
+        Optional settings override (useful in tests).
+
+    Returns
+    -------
+    redis.asyncio.Redis
+        The async Redis client.
+    """
+    global _binary_pool  # noqa: PLW0603
+    if _binary_pool is not None:
+        return _binary_pool
+
+    if settings is None:
+        settings = get_settings()
+
+    _binary_pool = aioredis.from_url(
+        settings.REDIS_URL,
+        decode_responses=False,
+        max_connections=20,
+    )
+    return _binary_pool
+
+
 async def close_redis() -> None:
-    """Close the Redis connection pool.
+    """Close the Redis connection pools.
 
     Call this in your FastAPI ``shutdown`` lifespan event.
     """
-    global _pool  # noqa: PLW0603
+    global _pool, _binary_pool  # noqa: PLW0603
     if _pool is not None:
         await _pool.aclose()
         _pool = None
+    if _binary_pool is not None:
+        await _binary_pool.aclose()
+        _binary_pool = None
 
 
 # ── Cache Helpers ─────────────────────────────────────────────────────────────
@@ -114,6 +156,282 @@ async def cache_set(
     await client.set(key, serialised, ex=ttl)
 
 
+async def cache_get_json(key: str, *, settings: Settings | None = None) -> str | None:
+    """Retrieve a raw JSON document from Redis without decoding it.
+
+    Pass the result straight to ``Model.model_validate_json`` to skip the
+    intermediate ``dict``.
+
+    Parameters
+    ----------
+    key:
+        The cache key.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    str | None
+        The stored JSON text, or ``None`` on cache miss.
+    """
+    client = get_redis(settings)
+    raw: str | None = await client.get(key)
+    return raw
+
+
+def compress_payload(value: Any) -> bytes:
+    """Serialise a value to JSON and zstd-compress it for storage.
+
+    Use when writing through a raw (e.g. pipelined) binary client; the result
+    is what :func:`cache_set_compressed` stores and is read back by
+    :func:`decompress_payload`.
+
+    Parameters
+    ----------
+    value:
+        Any JSON-serialisable Python object.
+
+    Returns
+    -------
+    bytes
+        The marked, compressed payload.
+    """
+    serialised = json.dumps(value, default=str).encode()
+    return _ZSTD_PREFIX + _zstd_compressor.compress(serialised)
+
+
+def decompress_payload(raw: bytes) -> bytes:
+    """Return the JSON bytes of a cached value, decompressing it if needed.
+
+    Parameters
+    ----------
+    raw:
+        A value as stored by :func:`cache_set_compressed` or :func:`cache_set`.
+
+    Returns
+    -------
+    bytes
+        The JSON document.
+    """
+    if raw[:1] == _ZSTD_PREFIX:
+        return _zstd_decompressor.decompress(raw[1:])
+    return raw
+
+
+async def cache_set_compressed(
+    key: str,
+    value: Any,
+    ttl: int = 3600,
+    *,
+    settings: Settings | None = None,
+) -> None:
+    """Store a JSON-serialisable value zstd-compressed in Redis with a TTL.
+
+    Worth it for large, repetitive payloads such as schedules.  Read back
+    with :func:`cache_get_compressed` or :func:`cache_get_compressed_json`.
+
+    Parameters
+    ----------
+    key:
+        The cache key.
+    value:
+        Any JSON-serialisable Python object.
+    ttl:
+        Time-to-live in seconds (default 1 hour).
+    settings:
+        Optional settings override.
+    """
+    client = get_binary_redis(settings)
+    await client.set(key, compress_payload(value), ex=ttl)
+
+
+async def cache_get_compressed_json(key: str, *, settings: Settings | None = None) -> bytes | None:
+    """Retrieve a value written by :func:`cache_set_compressed` as JSON bytes.
+
+    Plain JSON values (e.g. written by :func:`cache_set`) are returned as-is.
+
+    Parameters
+    ----------
+    key:
+        The cache key.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    bytes | None
+        The JSON document, or ``None`` on cache miss.
+    """
+    client = get_binary_redis(settings)
+    raw: bytes | None = await client.get(key)
+    if raw is None:
+        return None
+    return decompress_payload(raw)
+
+
+async def cache_get_compressed(key: str, *, settings: Settings | None = None) -> Any | None:
+    """Retrieve and deserialise a value written by :func:`cache_set_compressed`.
+
+    Parameters
+    ----------
+    key:
+        The cache key.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    Any | None
+        The deserialised Python object, or ``None`` on cache miss.
+    """
+    payload = await cache_get_compressed_json(key, settings=settings)
+    if payload is None:
+        return None
+    return json.loads(payload)
+
+
+async def cache_hash_set(
+    key: str,
+    mapping: dict[str, Any],
+    ttl: int = 3600,
+    *,
+    settings: Settings | None = None,
+) -> None:
+    """Store JSON-serialisable values as fields of a Redis hash and refresh its TTL.
+
+    Only the given fields are written; other fields of the hash are kept.
+
+    Parameters
+    ----------
+    key:
+        The hash key.
+    mapping:
+        Field name to JSON-serialisable value.
+    ttl:
+        Time-to-live in seconds for the whole hash (default 1 hour).
+    settings:
+        Optional settings override.
+    """
+    if not mapping:
+        return
+    client = get_redis(settings)
+    serialised = {field: json.dumps(value, default=str) for field, value in mapping.items()}
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping=serialised)
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+async def cache_hash_get(key: str, field: str, *, settings: Settings | None = None) -> Any | None:
+    """Retrieve a single JSON-serialised field from a Redis hash.
+
+    Parameters
+    ----------
+    key:
+        The hash key.
+    field:
+        The field name.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    Any | None
+        The deserialised value, or ``None`` if the hash or field is missing.
+    """
+    client = get_redis(settings)
+    raw = await client.hget(key, field)
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def cache_hash_get_all(key: str, *, settings: Settings | None = None) -> dict[str, Any]:
+    """Retrieve every field of a Redis hash, deserialising each value.
+
+    Parameters
+    ----------
+    key:
+        The hash key.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    dict[str, Any]
+        Field name to deserialised value; empty if the hash does not exist.
+    """
+    client = get_redis(settings)
+    raw: dict[str, str] = await client.hgetall(key)
+    return {field: json.loads(value) for field, value in raw.items()}
+
+
+async def cache_sorted_add(
+    key: str,
+    value: Any,
+    score: float,
+    ttl: int = 3600,
+    *,
+    settings: Settings | None = None,
+) -> None:
+    """Add a JSON-serialisable value to a Redis sorted set and refresh its TTL.
+
+    Parameters
+    ----------
+    key:
+        The sorted set key.
+    value:
+        Any JSON-serialisable Python object, stored as the member.
+    score:
+        Sort score for the member.
+    ttl:
+        Time-to-live in seconds for the whole set (default 1 hour).
+    settings:
+        Optional settings override.
+    """
+    client = get_redis(settings)
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.zadd(key, {json.dumps(value, default=str): score})
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+async def cache_sorted_page(
+    key: str,
+    offset: int,
+    limit: int,
+    *,
+    settings: Settings | None = None,
+) -> tuple[int, list[str]]:
+    """Return one page of a sorted set, highest score first, plus its size.
+
+    Both reads go out in a single pipelined round trip.  Members are returned
+    as raw JSON strings so callers can validate them without decoding twice.
+
+    Parameters
+    ----------
+    key:
+        The sorted set key.
+    offset:
+        Number of members to skip.
+    limit:
+        Maximum number of members to return.
+    settings:
+        Optional settings override.
+
+    Returns
+    -------
+    tuple[int, list[str]]
+        The total number of members and the requested page.
+    """
+    client = get_redis(settings)
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.zcard(key)
+        pipe.zrevrange(key, offset, offset + limit - 1)
+        total, members = await pipe.execute()
+    return total, members
+
+
 async def cache_delete(key: str, *, settings: Settings | None = None) -> None:
     """Delete a key from the cache.
 
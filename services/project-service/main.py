@@ -95,8 +95,10 @@ async def health_check() -> HealthResponse:
 
 # -- Include routers -------------------------------------------------------
 
-app.include_router(schedules.router)
+# The job router's static /job path is registered ahead of the schedules
+# router's /{schedule_id} routes that share its prefix.
 app.include_router(schedule_job.router)
+app.include_router(schedules.router)
 app.include_router(milestones.router)
 app.include_router(site_logs.router)
 app.include_router(change_orders.router)
@@ -12,26 +12,105 @@ would miss.
 
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 import uuid
+from array import array
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any, TypedDict
 
 import structlog
 from langgraph.graph import END, StateGraph
+from pydantic import ValidationError
 
 from openlintel_shared.llm import AgentBase, LiteLLMClient
 
 from src.models.change_order import (
     ChangeOrderStatus,
-    CostImpact,
     ImpactAnalysis,
-    ScheduleImpact,
+    LineItemChange,
 )
 from src.services.critical_path import compute_critical_path
 
 logger = structlog.get_logger(__name__)
 
+# Completion parameters shared by every impact analysis LLM call.  Nodes may
+# override ``temperature`` / ``max_tokens`` through ``_call_json``.
+_MODEL = "openai/gpt-4o-mini"
+_COMPLETION_DEFAULTS: dict[str, Any] = {
+    "model": _MODEL,
+    "temperature": 0.2,
+    "max_tokens": 2000,
+    "response_format": {"type": "json_object"},
+}
+
+
+# -- Prompts ----------------------------------------------------------------
+#
+# Each prompt is split into a static system message (instructions + output
+# schema) and a dynamic user message (change order + project data).  Keeping
+# the static part first and byte-identical across calls lets the provider
+# reuse its cached prefix.
+
+SCHEDULE_IMPACT_SYSTEM_PROMPT = """You are a construction project scheduling expert.
+
+A change order has been submitted for an interior construction project.
+You will be given the change order and the current schedule tasks as a
+tab-separated table with a header row.
+
+Analyse the impact on the schedule and return a JSON object:
+{
+    "directly_affected_task_ids": ["task IDs that are directly impacted"],
+    "duration_changes": {"task_id": new_duration_days},
+    "new_tasks_needed": [
+        {"name": "task name", "trade": "trade_type", "duration_days": N, "room_id": "room_id", "insert_after_task_id": "task_id"}
+    ],
+    "removed_task_ids": ["task IDs no longer needed"],
+    "explanation": "Brief explanation of schedule impact"
+}
+
+Return ONLY the JSON object."""
+
+COST_IMPACT_SYSTEM_PROMPT = """You are a construction cost estimator for residential interior projects in India.
+
+A change order has been submitted.  You will be given the change order and a
+summary of the current bill of materials.
+
+Analyse the cost impact and return a JSON object:
+{
+    "cost_delta": <number - positive means more expensive>,
+    "cost_delta_percent": <percentage change>,
+    "affected_categories": ["list of affected material categories"],
+    "line_item_changes": [
+        {"item": "item name", "original_cost": N, "revised_cost": N, "reason": "why"}
+    ],
+    "explanation": "Brief explanation of cost impact"
+}
+
+If you cannot determine exact costs, provide reasonable estimates based on
+typical Indian interior project costs.
+
+Return ONLY the JSON object."""
+
+RISK_ASSESSMENT_SYSTEM_PROMPT = """You are a senior construction project risk assessor.
+
+Assess the overall risk of a change order based on its analysed schedule and
+cost impacts.
+
+Return a JSON object:
+{
+    "risk_level": "low" | "medium" | "high" | "critical",
+    "recommendations": [
+        "Specific, actionable recommendation 1",
+        "Specific, actionable recommendation 2",
+        ...
+    ]
+}
+
+Return ONLY the JSON object."""
+
 
 # -- State definition -------------------------------------------------------
 
@@ -58,11 +137,18 @@ class ImpactState(TypedDict, total=False):
     schedule_impact: dict[str, Any] | None
     cost_impact: dict[str, Any] | None
     risk_assessment: dict[str, Any] | None
+    # Whether the schedule / cost LLM analysis failed and its node fell back
+    # to an unchanged schedule or a zero cost delta
+    schedule_analysis_failed: bool
+    cost_analysis_failed: bool
 
     # Output
-    impact_analysis: dict[str, Any] | None
+    impact_analysis: ImpactAnalysis | None
     error: str | None
 
+    # Logger bound to ``change_order_id`` once per run
+    log: Any
+
 
 # -- Agent implementation ---------------------------------------------------
 
@@ -116,82 +202,111 @@ class ImpactAgent(AgentBase):
             "schedule_impact": None,
             "cost_impact": None,
             "risk_assessment": None,
+            "schedule_analysis_failed": False,
+            "cost_analysis_failed": False,
             "impact_analysis": None,
             "error": None,
+            "log": logger.bind(change_order_id=kwargs["change_order_id"]),
         }
 
+    # -- LLM helper ---------------------------------------------------------
+
+    async def _call_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        state: ImpactState,
+        **overrides: Any,
+    ) -> tuple[dict[str, Any], str | None]:
+        """Run a JSON-mode completion and parse the response.
+
+        ``overrides`` replace entries of ``_COMPLETION_DEFAULTS`` (e.g.
+        ``temperature`` or ``max_tokens``) for this call only.
+
+        Returns
+        -------
+        tuple
+            ``(parsed_object, None)`` on success, or ``({}, error_message)``
+            if the call or the JSON parse failed.
+        """
+        params = {**_COMPLETION_DEFAULTS, **overrides} if overrides else _COMPLETION_DEFAULTS
+        try:
+            response = await self._llm.completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                encrypted_key=state.get("encrypted_key"),
+                iv=state.get("iv"),
+                auth_tag=state.get("auth_tag"),
+                plain_api_key=state.get("plain_api_key"),
+                **params,
+            )
+            parsed = json.loads(response.choices[0].message.content or "{}")
+        except Exception as exc:
+            return {}, str(exc)
+
+        if not isinstance(parsed, dict):
+            return {}, f"expected a JSON object, got {type(parsed).__name__}"
+        return parsed, None
+
     # -- Node implementations -----------------------------------------------
 
     async def _analyze_schedule_impact(self, state: ImpactState) -> dict[str, Any]:
         """Node 1: Analyse schedule impact of the change order."""
-        logger.info(
-            "impact_analyze_schedule",
-            change_order_id=state["change_order_id"],
-        )
+        log = state["log"]
+        log.info("impact_analyze_schedule")
 
         schedule_data = state["schedule_data"]
         change_details = state["change_details"]
         tasks = schedule_data.get("tasks", [])
         dependencies = schedule_data.get("dependencies", [])
 
-        # Use LLM to identify which tasks are affected
-        prompt = f"""You are a construction project scheduling expert.
+        details_json = json.dumps(change_details, indent=2, default=str)
 
-A change order has been submitted for an interior construction project.
+        # Large schedules are trimmed to the tasks most relevant to the change
+        # so the prompt size stays bounded.
+        prompt_tasks = _select_prompt_tasks(
+            tasks,
+            " ".join((state["change_title"], state["change_description"], details_json)),
+        )
+        task_table = _format_task_table(prompt_tasks)
+        omitted = len(tasks) - len(prompt_tasks)
+        if omitted:
+            task_table += f"\n(... {omitted} additional tasks omitted ...)"
 
-Change Order:
+        # Use LLM to identify which tasks are affected
+        user_prompt = f"""Change Order:
 - Type: {state['change_order_type']}
 - Title: {state['change_title']}
 - Description: {state['change_description']}
-- Details: {json.dumps(change_details, indent=2, default=str)}
+- Details: {details_json}
 
 Current Schedule Tasks:
-{json.dumps([{{"id": t.get("id"), "name": t.get("name"), "trade": t.get("trade"), "duration_days": t.get("duration_days"), "room_id": t.get("room_id")}} for t in tasks], indent=2)}
-
-Analyse the impact on the schedule and return a JSON object:
-{{
-    "directly_affected_task_ids": ["task IDs that are directly impacted"],
-    "duration_changes": {{"task_id": new_duration_days}},
-    "new_tasks_needed": [
-        {{"name": "task name", "trade": "trade_type", "duration_days": N, "room_id": "room_id", "insert_after_task_id": "task_id"}}
-    ],
-    "removed_task_ids": ["task IDs no longer needed"],
-    "explanation": "Brief explanation of schedule impact"
-}}
-
-Return ONLY the JSON object."""
+{task_table}"""
 
         affected_task_ids: list[str] = []
         duration_changes: dict[str, int] = {}
         explanation = "Unable to determine schedule impact."
 
-        try:
-            response = await self._llm.completion(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                encrypted_key=state.get("encrypted_key"),
-                iv=state.get("iv"),
-                auth_tag=state.get("auth_tag"),
-                plain_api_key=state.get("plain_api_key"),
-                temperature=0.2,
-                max_tokens=2000,
-            )
-
-            content = response.choices[0].message.content or "{}"
-            content = content.strip()
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if lines[-1].strip() == "```" else "\n".join(lines[1:])
-                content = content.strip()
+        # The baseline critical path does not depend on the LLM output, so
+        # compute it in a worker thread while the request is in flight.
+        original_cp_future = asyncio.create_task(
+            asyncio.to_thread(compute_critical_path, tasks, dependencies)
+        )
 
-            analysis = json.loads(content)
+        analysis, error = await self._call_json(
+            SCHEDULE_IMPACT_SYSTEM_PROMPT,
+            user_prompt,
+            state,
+        )
+        if error is None:
             affected_task_ids = analysis.get("directly_affected_task_ids", [])
             duration_changes = analysis.get("duration_changes", {})
             explanation = analysis.get("explanation", "")
-
-        except Exception as exc:
-            logger.warning("impact_schedule_llm_failed", error=str(exc))
-            explanation = f"LLM analysis unavailable: {exc}"
+        else:
+            log.warning("impact_schedule_llm_failed", error=error)
+            explanation = f"LLM analysis unavailable: {error}"
 
         # Compute revised schedule with changes applied
         revised_tasks = []
@@ -202,59 +317,37 @@ Return ONLY the JSON object."""
             revised_tasks.append(revised)
 
         # Recompute critical path with revised durations
-        original_cp = compute_critical_path(tasks, dependencies)
-        revised_cp = compute_critical_path(revised_tasks, dependencies)
+        original_cp = await original_cp_future
+        revised_cp = await asyncio.to_thread(compute_critical_path, revised_tasks, dependencies)
 
         # Find cascading tasks (those affected via dependencies)
-        cascading_ids: list[str] = []
-        dep_map: dict[str, list[str]] = {}
-        for dep in dependencies:
-            dep_map.setdefault(dep["from_task_id"], []).append(dep["to_task_id"])
-
-        visited: set[str] = set()
-        queue = list(affected_task_ids)
-        while queue:
-            tid = queue.pop(0)
-            if tid in visited:
-                continue
-            visited.add(tid)
-            for successor in dep_map.get(tid, []):
-                if successor not in affected_task_ids:
-                    cascading_ids.append(successor)
-                queue.append(successor)
+        cascading_ids = _cascading_task_ids(affected_task_ids, dependencies)
 
         schedule_impact = {
             "affected_task_ids": affected_task_ids,
-            "cascading_task_ids": list(set(cascading_ids)),
+            "cascading_task_ids": cascading_ids,
             "original_duration_days": original_cp.total_duration,
             "revised_duration_days": revised_cp.total_duration,
             "delay_days": revised_cp.total_duration - original_cp.total_duration,
-            "critical_path_changed": set(original_cp.critical_path_ids) != set(revised_cp.critical_path_ids),
+            "critical_path_changed": original_cp.critical_path_idset != revised_cp.critical_path_idset,
             "revised_end_date": None,
             "explanation": explanation,
         }
 
-        return {"schedule_impact": schedule_impact}
+        return {"schedule_impact": schedule_impact, "schedule_analysis_failed": error is not None}
 
     async def _analyze_cost_impact(self, state: ImpactState) -> dict[str, Any]:
         """Node 2: Analyse cost impact of the change order."""
-        logger.info(
-            "impact_analyze_cost",
-            change_order_id=state["change_order_id"],
-        )
+        log = state["log"]
+        log.info("impact_analyze_cost")
 
         bom_data = state["bom_data"]
         change_details = state["change_details"]
 
         items = bom_data.get("items", [])
-        original_cost = sum(
-            (item.get("unit_price") or 0) * item.get("quantity", 0) * (1 + item.get("waste_factor", 0.05))
-            for item in items
-        )
+        original_cost, categories = _summarise_bom(items)
 
-        prompt = f"""You are a construction cost estimator for residential interior projects in India.
-
-A change order has been submitted:
+        user_prompt = f"""Change Order:
 - Type: {state['change_order_type']}
 - Title: {state['change_title']}
 - Description: {state['change_description']}
@@ -263,59 +356,33 @@ A change order has been submitted:
 Current BOM summary:
 - Total items: {len(items)}
 - Original total cost: INR {original_cost:,.2f}
-- Categories: {json.dumps(list(set(item.get("category", "unknown") for item in items)))}
-
-Analyse the cost impact and return a JSON object:
-{{
-    "cost_delta": <number - positive means more expensive>,
-    "cost_delta_percent": <percentage change>,
-    "affected_categories": ["list of affected material categories"],
-    "line_item_changes": [
-        {{"item": "item name", "original_cost": N, "revised_cost": N, "reason": "why"}}
-    ],
-    "explanation": "Brief explanation of cost impact"
-}}
-
-If you cannot determine exact costs, provide reasonable estimates based on
-typical Indian interior project costs.
-
-Return ONLY the JSON object."""
+- Categories: {json.dumps(categories)}"""
 
         cost_delta = 0.0
         cost_delta_percent = 0.0
         affected_categories: list[str] = []
-        line_item_changes: list[dict[str, Any]] = []
+        line_item_changes: list[LineItemChange] = []
         cost_explanation = "Unable to determine cost impact."
 
-        try:
-            response = await self._llm.completion(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                encrypted_key=state.get("encrypted_key"),
-                iv=state.get("iv"),
-                auth_tag=state.get("auth_tag"),
-                plain_api_key=state.get("plain_api_key"),
-                temperature=0.2,
-                max_tokens=2000,
-            )
-
-            content = response.choices[0].message.content or "{}"
-            content = content.strip()
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if lines[-1].strip() == "```" else "\n".join(lines[1:])
-                content = content.strip()
-
-            analysis = json.loads(content)
-            cost_delta = float(analysis.get("cost_delta", 0))
-            cost_delta_percent = float(analysis.get("cost_delta_percent", 0))
-            affected_categories = analysis.get("affected_categories", [])
-            line_item_changes = analysis.get("line_item_changes", [])
-            cost_explanation = analysis.get("explanation", "")
-
-        except Exception as exc:
-            logger.warning("impact_cost_llm_failed", error=str(exc))
-            cost_explanation = f"LLM analysis unavailable: {exc}"
+        analysis, error = await self._call_json(
+            COST_IMPACT_SYSTEM_PROMPT,
+            user_prompt,
+            state,
+        )
+        if error is None:
+            try:
+                cost_delta = float(analysis.get("cost_delta", 0))
+                cost_delta_percent = float(analysis.get("cost_delta_percent", 0))
+                affected_categories = analysis.get("affected_categories", [])
+                line_item_changes = _parse_line_item_changes(analysis.get("line_item_changes", []))
+                cost_explanation = analysis.get("explanation", "")
+            except (TypeError, ValueError) as exc:
+                error = str(exc)
+                cost_delta = cost_delta_percent = 0.0
+
+        if error is not None:
+            log.warning("impact_cost_llm_failed", error=error)
+            cost_explanation = f"LLM analysis unavailable: {error}"
 
         revised_cost = original_cost + cost_delta
 
@@ -329,23 +396,17 @@ Return ONLY the JSON object."""
             "explanation": cost_explanation,
         }
 
-        return {"cost_impact": cost_impact}
+        return {"cost_impact": cost_impact, "cost_analysis_failed": error is not None}
 
     async def _assess_risk(self, state: ImpactState) -> dict[str, Any]:
         """Node 3: Assess overall risk and generate recommendations."""
-        logger.info(
-            "impact_assess_risk",
-            change_order_id=state["change_order_id"],
-        )
+        log = state["log"]
+        log.info("impact_assess_risk")
 
         schedule_impact = state.get("schedule_impact", {})
         cost_impact = state.get("cost_impact", {})
 
-        prompt = f"""You are a senior construction project risk assessor.
-
-Assess the overall risk of this change order based on the analysed impacts:
-
-Change Order:
+        user_prompt = f"""Change Order:
 - Type: {state['change_order_type']}
 - Title: {state['change_title']}
 - Description: {state['change_description']}
@@ -357,80 +418,208 @@ Schedule Impact:
 
 Cost Impact:
 - Cost change: INR {cost_impact.get('cost_delta', 0):,.2f} ({cost_impact.get('cost_delta_percent', 0):.1f}%)
-- Categories affected: {cost_impact.get('affected_categories', [])}
+- Categories affected: {cost_impact.get('affected_categories', [])}"""
 
-Return a JSON object:
-{{
-    "risk_level": "low" | "medium" | "high" | "critical",
-    "recommendations": [
-        "Specific, actionable recommendation 1",
-        "Specific, actionable recommendation 2",
-        ...
-    ]
-}}
-
-Return ONLY the JSON object."""
+        delay = abs(schedule_impact.get("delay_days", 0))
+        cost_pct = abs(cost_impact.get("cost_delta_percent", 0))
 
-        risk_level = "medium"
-        recommendations: list[str] = []
+        analysed = not (
+            state.get("schedule_analysis_failed") or state.get("cost_analysis_failed")
+        )
 
-        try:
-            response = await self._llm.completion(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                encrypted_key=state.get("encrypted_key"),
-                iv=state.get("iv"),
-                auth_tag=state.get("auth_tag"),
-                plain_api_key=state.get("plain_api_key"),
+        if analysed and delay == 0 and cost_pct < _TRIVIAL_COST_DELTA_PERCENT:
+            # Both analyses succeeded and found no schedule slip and a
+            # negligible cost change -- the LLM would only confirm a low
+            # rating, so skip the round-trip.  A zero impact from a failed
+            # analysis is unknown, not trivial, and still goes to the LLM.
+            log.info("impact_risk_llm_skipped", cost_delta_percent=cost_pct)
+            risk_level = "low"
+            recommendations = list(_LOW_RISK_RECOMMENDATIONS)
+        else:
+            assessment, error = await self._call_json(
+                RISK_ASSESSMENT_SYSTEM_PROMPT,
+                user_prompt,
+                state,
                 temperature=0.3,
                 max_tokens=1000,
             )
-
-            content = response.choices[0].message.content or "{}"
-            content = content.strip()
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if lines[-1].strip() == "```" else "\n".join(lines[1:])
-                content = content.strip()
-
-            assessment = json.loads(content)
-            risk_level = assessment.get("risk_level", "medium")
-            recommendations = assessment.get("recommendations", [])
-
-        except Exception as exc:
-            logger.warning("impact_risk_llm_failed", error=str(exc))
-            # Heuristic risk assessment fallback
-            delay = abs(schedule_impact.get("delay_days", 0))
-            cost_pct = abs(cost_impact.get("cost_delta_percent", 0))
-
-            if delay > 14 or cost_pct > 20:
-                risk_level = "critical"
-            elif delay > 7 or cost_pct > 10:
-                risk_level = "high"
-            elif delay > 3 or cost_pct > 5:
-                risk_level = "medium"
+            if error is None:
+                risk_level = assessment.get("risk_level", "medium")
+                recommendations = assessment.get("recommendations", [])
             else:
-                risk_level = "low"
-
-            recommendations = [
-                "Review the change order details with the site supervisor.",
-                "Update the project timeline and communicate new dates to stakeholders.",
-                "Re-evaluate material procurement to align with the revised schedule.",
-            ]
+                log.warning("impact_risk_llm_failed", error=error)
+                # Heuristic risk assessment fallback
+                risk_level = _heuristic_risk_level(delay, cost_pct)
+                recommendations = list(_FALLBACK_RECOMMENDATIONS)
 
         # Assemble the final impact analysis
         now = datetime.now(tz=timezone.utc)
 
-        impact_analysis = ImpactAnalysis(
-            change_order_id=state["change_order_id"],
-            schedule_impact=ScheduleImpact(**schedule_impact),
-            cost_impact=CostImpact(**cost_impact),
-            risk_level=risk_level,
-            recommendations=recommendations,
-            analyzed_at=now,
-        )
+        # Risk level, recommendations, affected IDs/categories and the
+        # explanations come from the LLM, so the result is validated.  The
+        # model is returned as-is and serialised once by the caller (HTTP
+        # response / cache write).
+        impact_analysis = ImpactAnalysis.model_validate({
+            "change_order_id": state["change_order_id"],
+            "schedule_impact": schedule_impact,
+            "cost_impact": cost_impact,
+            "risk_level": risk_level,
+            "recommendations": recommendations,
+            "analyzed_at": now,
+        })
 
         return {
             "risk_assessment": {"risk_level": risk_level, "recommendations": recommendations},
-            "impact_analysis": impact_analysis.model_dump(mode="json"),
+            "impact_analysis": impact_analysis,
         }
+
+
+# -- Helper functions -------------------------------------------------------
+
+# Cost changes below this percentage (with zero delay) are rated low risk
+# without consulting the LLM.
+_TRIVIAL_COST_DELTA_PERCENT = 1.0
+
+_LOW_RISK_RECOMMENDATIONS: tuple[str, ...] = (
+    "No schedule delay and negligible cost change -- proceed with the change order.",
+    "Record the change in the site log so the as-built documentation stays current.",
+)
+
+_FALLBACK_RECOMMENDATIONS: tuple[str, ...] = (
+    "Review the change order details with the site supervisor.",
+    "Update the project timeline and communicate new dates to stakeholders.",
+    "Re-evaluate material procurement to align with the revised schedule.",
+)
+
+
+def _heuristic_risk_level(delay_days: float, cost_delta_percent: float) -> str:
+    """Rate risk from absolute schedule delay and cost change thresholds."""
+    if delay_days > 14 or cost_delta_percent > 20:
+        return "critical"
+    if delay_days > 7 or cost_delta_percent > 10:
+        return "high"
+    if delay_days > 3 or cost_delta_percent > 5:
+        return "medium"
+    return "low"
+
+
+# Maximum number of tasks embedded in the schedule-impact prompt.
+_MAX_PROMPT_TASKS = 50
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_TASK_PROMPT_FIELDS: tuple[str, ...] = ("id", "name", "trade", "duration_days", "room_id")
+
+
+def _cascading_task_ids(
+    affected_task_ids: list[str],
+    dependencies: list[dict[str, Any]],
+) -> list[str]:
+    """Return tasks reachable through dependencies from the affected tasks.
+
+    Task IDs are interned to integers once and the successor lists are packed
+    into ``array("i")`` buffers, so the traversal runs over small ints rather
+    than string-keyed dicts.  The affected tasks themselves are excluded.
+    """
+    index: dict[str, int] = {}
+    ids: list[str] = []
+    successors: list[array] = []
+
+    def intern(task_id: str) -> int:
+        idx = index.get(task_id)
+        if idx is None:
+            idx = index[task_id] = len(ids)
+            ids.append(task_id)
+            successors.append(array("i"))
+        return idx
+
+    for dep in dependencies:
+        from_idx = intern(dep["from_task_id"])
+        successors[from_idx].append(intern(dep["to_task_id"]))
+
+    seen = bytearray(len(ids))
+    queue: deque[int] = deque()
+    for task_id in affected_task_ids:
+        idx = index.get(task_id)
+        if idx is not None and not seen[idx]:
+            seen[idx] = 1
+            queue.append(idx)
+
+    while queue:
+        for succ in successors[queue.popleft()]:
+            if not seen[succ]:
+                seen[succ] = 1
+                queue.append(succ)
+
+    affected = set(affected_task_ids)
+    return [ids[i] for i in range(len(ids)) if seen[i] and ids[i] not in affected]
+
+
+def _parse_line_item_changes(raw: Any) -> list[LineItemChange]:
+    """Validate the LLM's line item changes, dropping malformed entries."""
+    if not isinstance(raw, list):
+        return []
+    changes: list[LineItemChange] = []
+    for item in raw:
+        try:
+            changes.append(LineItemChange.model_validate(item))
+        except ValidationError:
+            continue
+    return changes
+
+
+def _select_prompt_tasks(tasks: list[dict[str, Any]], change_text: str) -> list[dict[str, Any]]:
+    """Return at most ``_MAX_PROMPT_TASKS`` tasks, preferring relevant ones.
+
+    Tasks are scored by how well their ID, room, trade, and name match the
+    words of the change order, with a bonus for critical-path tasks.  The
+    selected tasks keep their original schedule order.
+    """
+    if len(tasks) <= _MAX_PROMPT_TASKS:
+        return tasks
+
+    lowered = change_text.lower()
+    change_words = set(_WORD_RE.findall(lowered))
+
+    def score(task: dict[str, Any]) -> int:
+        points = 0
+        task_id = str(task.get("id") or "").lower()
+        if task_id and task_id in lowered:
+            points += 8
+        room_id = str(task.get("room_id") or "").lower()
+        if room_id and room_id in lowered:
+            points += 4
+        trade = str(task.get("trade") or "").lower()
+        if trade and (trade in lowered or set(trade.split("_")) <= change_words):
+            points += 2
+        points += len(change_words.intersection(_WORD_RE.findall(str(task.get("name", "")).lower())))
+        if task.get("is_critical"):
+            points += 1
+        return points
+
+    ranked = sorted(range(len(tasks)), key=lambda idx: -score(tasks[idx]))
+    keep = sorted(ranked[:_MAX_PROMPT_TASKS])
+    return [tasks[idx] for idx in keep]
+
+
+def _format_task_table(tasks: list[dict[str, Any]]) -> str:
+    """Render tasks as a compact tab-separated table for the schedule prompt.
+
+    Only the fields the LLM needs are emitted, without building an
+    intermediate dict per task; the table costs far fewer input tokens than
+    pretty-printed JSON.
+    """
+    lines = ["\t".join(_TASK_PROMPT_FIELDS)]
+    for task in tasks:
+        lines.append("\t".join(str(task.get(field, "")) for field in _TASK_PROMPT_FIELDS))
+    return "\n".join(lines)
+
+
+def _summarise_bom(items: list[dict[str, Any]]) -> tuple[float, list[str]]:
+    """Return the total BOM cost (including waste) and its distinct categories."""
+    original_cost = sum(
+        (item.get("unit_price") or 0) * item.get("quantity", 0) * (1 + item.get("waste_factor", 0.05))
+        for item in items
+    )
+    categories = {item.get("category", "unknown") for item in items}
+    return original_cost, list(categories)
@@ -14,28 +14,32 @@ Each node mutates a shared ``ScheduleState`` TypedDict that flows through the gr
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-import math
+import time
 import uuid
-from collections import defaultdict
-from datetime import date, datetime, timedelta, timezone
-from typing import Any, TypedDict
-
+from collections import defaultdict, deque
+from datetime import date, datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Protocol, TypedDict
+
+import numpy as np
+import orjson
 import structlog
 from langgraph.graph import END, StateGraph
 
+from openlintel_shared.ids import uuid7_batch
 from openlintel_shared.llm import AgentBase, LiteLLMClient
+from openlintel_shared.redis_client import cache_get, cache_set
 from openlintel_shared.schemas.bom import MaterialCategory
 
 from src.models.schedule import (
     TRADE_ORDER,
     TRADE_SEQUENCE,
-    Milestone,
     MilestoneStatus,
-    Schedule,
     ScheduleStatus,
-    ScheduleTask,
-    TaskDependency,
     TaskStatus,
     TradeType,
 )
@@ -62,6 +66,28 @@ CATEGORY_TO_TRADE: dict[str, TradeType] = {
     "hardware": TradeType.CARPENTRY,
 }
 
+# Same mapping keyed to the trade's string value, as stored on task dicts
+CATEGORY_TO_TRADE_VALUE: dict[str, str] = {
+    category: trade.value for category, trade in CATEGORY_TO_TRADE.items()
+}
+
+# Trade sequence position keyed to the trade's string value, stamped on each
+# task as ``_order`` so sorting does not rebuild ``TradeType`` enums
+TRADE_ORDER_BY_VALUE: dict[str, int] = {trade.value: idx for trade, idx in TRADE_ORDER.items()}
+
+# Projects with at least this many rooms analyse their scope in a worker thread
+_SCOPE_OFFLOAD_ROOM_COUNT = 50
+
+# Tasks without BOM materials whose heuristic estimate is at most this many
+# days are not sent to the LLM for refinement
+_REFINE_MAX_TRIVIAL_DAYS = 2
+
+# Large refinements are split into room-aligned chunks of about this many
+# tasks, streamed concurrently (at most ``_REFINE_CONCURRENCY`` at a time) so
+# wall-clock time is bounded by the longest chunk, not the whole response.
+_REFINE_CHUNK_TASKS = 40
+_REFINE_CONCURRENCY = 8
+
 # Base duration estimates per trade (days per 100 sqft of room area)
 BASE_DURATION_PER_100SQFT: dict[TradeType, float] = {
     TradeType.DEMOLITION: 1.5,
@@ -78,6 +104,160 @@ BASE_DURATION_PER_100SQFT: dict[TradeType, float] = {
 }
 
 
+# -- Duration estimation prompt --------------------------------------------
+
+DURATION_MODEL = "openai/gpt-4o-mini"
+
+# Static instructions sent as the system message.  Keeping them byte-identical
+# across runs, ahead of the per-project task list, lets the provider reuse
+# its cached prefix.
+DURATION_ESTIMATE_SYSTEM_PROMPT = """You are an expert construction project manager for residential interior projects in India.
+
+Given a task list with preliminary duration estimates, refine the durations
+based on typical Indian residential interior project timelines.
+
+For each task, return a JSON array with objects containing:
+- "task_id": the task ID
+- "duration_days": refined duration in calendar days (integer, minimum 1)
+- "reasoning": brief note on why you adjusted (or kept) the duration
+
+Consider:
+- Typical crew sizes for Indian residential interiors (2-4 workers per trade)
+- Curing times for civil work (minimum 7 days for plaster/concrete)
+- Paint drying between coats (1-2 days)
+- Carpentry complexity for modular furniture
+- Parallel work possibility within a single room is NOT applicable here (tasks are sequential per trade)
+
+Return ONLY the JSON array, no other text."""
+
+
+# -- Duration refinement cache ----------------------------------------------
+
+
+class DurationCache(Protocol):
+    """Store for LLM duration refinements keyed by a task-summary digest.
+
+    Values are lists aligned with the summarised tasks, holding the refined
+    duration or ``None`` for tasks the LLM left unchanged.  Implementations
+    may match near-identical summaries (e.g. by embedding similarity) as long
+    as the returned list has the same length as the summary.
+    """
+
+    async def get(self, key: str) -> list[int | None] | None: ...
+
+    async def set(self, key: str, durations: list[int | None]) -> None: ...
+
+
+class RedisDurationCache:
+    """Exact-match ``DurationCache`` backed by the shared Redis cache."""
+
+    KEY_PREFIX = "schedule_durations:"
+
+    def __init__(self, ttl: int = 3600 * 24 * 7) -> None:
+        self._ttl = ttl
+
+    async def get(self, key: str) -> list[int | None] | None:
+        cached = await cache_get(f"{self.KEY_PREFIX}{key}")
+        return cached if isinstance(cached, list) else None
+
+    async def set(self, key: str, durations: list[int | None]) -> None:
+        await cache_set(f"{self.KEY_PREFIX}{key}", durations, ttl=self._ttl)
+
+
+# -- Duration LLM circuit breaker -------------------------------------------
+
+
+class _FailureRateBreaker:
+    """Skip calls to a provider while its recent failure rate is too high.
+
+    Outcomes of the last ``window`` calls are kept; once at least
+    ``min_calls`` have been recorded and more than ``max_failure_rate`` of
+    them failed, the breaker opens for ``cooldown_seconds``.  After the
+    cooldown the history is cleared so the next call probes the provider.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        max_failure_rate: float = 0.5,
+        cooldown_seconds: float = 60.0,
+    ) -> None:
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._min_calls = min_calls
+        self._max_failure_rate = max_failure_rate
+        self._cooldown_seconds = cooldown_seconds
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        """Return ``False`` while the breaker is open."""
+        if self._open_until == 0.0:
+            return True
+        if time.monotonic() < self._open_until:
+            return False
+        self._open_until = 0.0
+        self._outcomes.clear()
+        return True
+
+    def record(self, *, failed: bool) -> None:
+        """Record a call outcome, opening the breaker if the rate is exceeded."""
+        self._outcomes.append(failed)
+        if len(self._outcomes) < self._min_calls:
+            return
+        if sum(self._outcomes) / len(self._outcomes) > self._max_failure_rate:
+            self._open_until = time.monotonic() + self._cooldown_seconds
+
+
+# Shared across agent instances: the routers build a new ScheduleAgent per
+# request, so per-instance state would never accumulate.
+_DURATION_LLM_BREAKER = _FailureRateBreaker()
+
+
+# -- Columnar task table ----------------------------------------------------
+
+
+class TaskTable:
+    """Column-oriented view of the task list for the dependency/CPM stages.
+
+    Row ``i`` corresponds to ``tasks[i]``.  Rooms are encoded as integers in
+    order of first appearance so grouping by room keeps the task-list order,
+    and trades are encoded by their position in the trade sequence.
+    """
+
+    def __init__(
+        self,
+        task_ids: list[str],
+        room_codes: np.ndarray,
+        trade_order: np.ndarray,
+        duration: np.ndarray,
+    ) -> None:
+        self.task_ids = task_ids
+        self.room_codes = room_codes
+        self.trade_order = trade_order
+        self.duration = duration
+
+    @classmethod
+    def from_tasks(cls, tasks: list[dict[str, Any]]) -> TaskTable:
+        """Build the table from task dicts produced by ``_create_task_list``."""
+        count = len(tasks)
+        room_index: dict[str, int] = {}
+        room_codes = np.fromiter(
+            (room_index.setdefault(t["room_id"], len(room_index)) for t in tasks),
+            dtype=np.int64,
+            count=count,
+        )
+        trade_order = np.fromiter(
+            (TRADE_ORDER_BY_VALUE.get(t["trade"], len(TRADE_ORDER)) for t in tasks),
+            dtype=np.int64,
+            count=count,
+        )
+        duration = np.fromiter((t["duration_days"] for t in tasks), dtype=np.int64, count=count)
+        return cls([t["id"] for t in tasks], room_codes, trade_order, duration)
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+
 # -- State definition -------------------------------------------------------
 
 
@@ -103,6 +283,7 @@ class ScheduleState(TypedDict, total=False):
     # Intermediate
     scope_analysis: dict[str, Any]
     tasks: list[dict[str, Any]]
+    task_table: TaskTable
     dependencies: list[dict[str, Any]]
     critical_path_ids: list[str]
     total_duration_days: int
@@ -125,13 +306,19 @@ class ScheduleAgent(AgentBase):
     dependency links, critical path analysis, and milestones.
     """
 
+    # Below this many tasks the LLM refinement is not worth a round-trip and
+    # the heuristic estimates are used as-is.
+    MIN_TASKS_FOR_LLM_REFINE = 5
+
     def __init__(
         self,
         llm_client: LiteLLMClient | None = None,
+        duration_cache: DurationCache | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
         self._llm = llm_client or LiteLLMClient()
+        self._duration_cache = duration_cache or RedisDurationCache()
 
     def build_graph(self) -> StateGraph:
         """Construct the schedule generation state graph."""
@@ -191,43 +378,20 @@ class ScheduleAgent(AgentBase):
         )
 
         rooms = state["rooms"]
-        bom_items = state["bom_items"]
 
-        # Compute room areas and identify needed trades per room
-        room_analysis: dict[str, dict[str, Any]] = {}
-        for room in rooms:
-            room_id = room["id"]
-            dims = room.get("dimensions", {})
-            length_mm = dims.get("length_mm", 3000)
-            width_mm = dims.get("width_mm", 3000)
-            area_sqft = (length_mm * width_mm) / (304.8 * 304.8)
-
-            # Determine which trades are needed for this room based on BOM
-            room_bom = [item for item in bom_items if item.get("room_id") == room_id]
-            room_trades: set[str] = set()
-            for item in room_bom:
-                cat = item.get("category", "")
-                trade = CATEGORY_TO_TRADE.get(cat)
-                if trade:
-                    room_trades.add(trade.value)
-
-            # Always include demolition (even if minimal) and cleanup
-            room_trades.add(TradeType.DEMOLITION.value)
-            room_trades.add(TradeType.CLEANUP.value)
-
-            # If no BOM, infer trades from room type
-            if len(room_trades) <= 2:
-                room_type = room.get("type", "bedroom")
-                room_trades.update(_infer_trades_for_room_type(room_type))
-
-            room_analysis[room_id] = {
-                "room_id": room_id,
-                "room_name": room.get("name", "Room"),
-                "room_type": room.get("type", "bedroom"),
-                "area_sqft": round(area_sqft, 1),
-                "trades_needed": sorted(room_trades),
-                "bom_item_count": len(room_bom),
-            }
+        # Index BOM items by room once instead of filtering the full BOM per room
+        bom_by_room: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for item in state["bom_items"]:
+            bom_by_room[item.get("room_id")].append(item)
+
+        # Compute room areas and identify needed trades per room.  Large
+        # projects run the sweep off the event loop so other requests are
+        # not starved while it runs.
+        if len(rooms) >= _SCOPE_OFFLOAD_ROOM_COUNT:
+            analyses = await asyncio.to_thread(_analyze_rooms, rooms, bom_by_room)
+        else:
+            analyses = _analyze_rooms(rooms, bom_by_room)
+        room_analysis = {analysis["room_id"]: analysis for analysis in analyses}
 
         scope = {
             "total_rooms": len(rooms),
@@ -247,6 +411,8 @@ class ScheduleAgent(AgentBase):
         scope = state["scope_analysis"]
         schedule_id = state["schedule_id"]
         tasks: list[dict[str, Any]] = []
+        task_areas: list[float] = []
+        task_rates: list[float] = []
 
         for room_id, room_data in scope.get("rooms", {}).items():
             trades_needed = room_data.get("trades_needed", [])
@@ -257,29 +423,39 @@ class ScheduleAgent(AgentBase):
                 if trade_value.value not in trades_needed:
                     continue
 
-                task_id = str(uuid.uuid4())
-                task_name = f"{room_name} - {_trade_display_name(trade_value)}"
+                display_name = _trade_display_name(trade_value)
+                task_name = f"{room_name} - {display_name}"
 
-                # Estimate base duration from area
-                base_rate = BASE_DURATION_PER_100SQFT.get(trade_value, 2.0)
-                estimated_days = max(1, math.ceil((area_sqft / 100.0) * base_rate))
+                # Base duration is estimated from area for all tasks at once below
+                task_areas.append(area_sqft)
+                task_rates.append(BASE_DURATION_PER_100SQFT.get(trade_value, 2.0))
 
                 task = {
-                    "id": task_id,
+                    "id": "",  # assigned in bulk below
                     "schedule_id": schedule_id,
                     "room_id": room_id,
                     "trade": trade_value.value,
                     "name": task_name,
-                    "description": f"{_trade_display_name(trade_value)} work for {room_name}",
-                    "duration_days": estimated_days,
+                    "description": f"{display_name} work for {room_name}",
+                    "duration_days": 1,
                     "status": TaskStatus.NOT_STARTED.value,
                     "depends_on": [],
                     "resource_requirements": {},
                     "estimated_cost": None,
                     "is_critical": False,
+                    "_order": TRADE_ORDER_BY_VALUE[trade_value.value],
                 }
                 tasks.append(task)
 
+        estimated_days = np.maximum(
+            1,
+            np.ceil(np.array(task_areas, dtype=np.float64) / 100.0 * np.array(task_rates, dtype=np.float64)),
+        ).astype(np.int64).tolist()
+
+        for task, task_id, days in zip(tasks, uuid7_batch(len(tasks)), estimated_days, strict=True):
+            task["id"] = task_id
+            task["duration_days"] = days
+
         return {"tasks": tasks}
 
     async def _estimate_durations(self, state: ScheduleState) -> dict[str, Any]:
@@ -290,99 +466,172 @@ class ScheduleAgent(AgentBase):
         bom_items = state["bom_items"]
         scope = state["scope_analysis"]
 
+        if len(tasks) < self.MIN_TASKS_FOR_LLM_REFINE:
+            logger.info(
+                "schedule_duration_refine_skipped",
+                schedule_id=state["schedule_id"],
+                reason="too_few_tasks",
+                task_count=len(tasks),
+            )
+            return {"tasks": tasks}
+
+        # Index BOM items by (room_id, trade) in a single pass so each task
+        # does an O(1) lookup instead of rescanning the whole BOM.
+        bom_count: dict[tuple[str, str], int] = defaultdict(int)
+        bom_quantity: dict[tuple[str, str], float] = defaultdict(float)
+        for item in bom_items:
+            trade_value = CATEGORY_TO_TRADE_VALUE.get(item.get("category", ""))
+            if trade_value:
+                key = (item.get("room_id"), trade_value)
+                bom_count[key] += 1
+                bom_quantity[key] += item.get("quantity", 0)
+
         # Build a summary for the LLM
+        area_by_room = {
+            room_id: room_data.get("area_sqft", 100)
+            for room_id, room_data in scope.get("rooms", {}).items()
+        }
+        # Only tasks with materials or a non-trivial heuristic estimate are
+        # sent for refinement; the rest keep their heuristic duration.
+        refine_tasks: list[dict[str, Any]] = []
         task_summary = []
         for task in tasks:
-            room_data = scope.get("rooms", {}).get(task["room_id"], {})
-            room_bom = [
-                item for item in bom_items
-                if item.get("room_id") == task["room_id"]
-                and CATEGORY_TO_TRADE.get(item.get("category", ""), None)
-                and CATEGORY_TO_TRADE[item["category"]].value == task["trade"]
-            ]
+            key = (task["room_id"], task["trade"])
+            material_items = bom_count.get(key, 0)
+            if not material_items and task["duration_days"] <= _REFINE_MAX_TRIVIAL_DAYS:
+                continue
+            refine_tasks.append(task)
             task_summary.append({
                 "task_id": task["id"],
                 "name": task["name"],
                 "trade": task["trade"],
-                "area_sqft": room_data.get("area_sqft", 100),
+                "area_sqft": area_by_room.get(task["room_id"], 100),
                 "current_estimate_days": task["duration_days"],
-                "material_items": len(room_bom),
-                "material_quantity_total": sum(item.get("quantity", 0) for item in room_bom),
+                "material_items": material_items,
+                "material_quantity_total": bom_quantity.get(key, 0),
             })
 
-        prompt = f"""You are an expert construction project manager for residential interior projects in India.
+        if not refine_tasks:
+            logger.info(
+                "schedule_duration_refine_skipped",
+                schedule_id=state["schedule_id"],
+                reason="no_refinable_tasks",
+                task_count=len(tasks),
+            )
+            return {"tasks": tasks}
 
-Given the following task list with preliminary duration estimates, refine the durations
-based on typical Indian residential interior project timelines.
+        # Identical task summaries (same rooms, trades, and BOM quantities)
+        # reuse the previous refinement instead of calling the LLM again.
+        cache_key = _duration_cache_key(task_summary)
+        try:
+            cached = await self._duration_cache.get(cache_key)
+        except Exception as exc:
+            logger.warning("schedule_duration_cache_get_failed", error=str(exc))
+            cached = None
 
-Tasks:
-{json.dumps(task_summary, indent=2)}
+        if cached is not None and len(cached) == len(refine_tasks):
+            for task, duration in zip(refine_tasks, cached, strict=True):
+                if duration:
+                    task["duration_days"] = duration
+            logger.info(
+                "schedule_durations_cache_hit",
+                schedule_id=state["schedule_id"],
+                task_count=len(refine_tasks),
+            )
+            return {"tasks": tasks}
 
-For each task, return a JSON array with objects containing:
-- "task_id": the task ID
-- "duration_days": refined duration in calendar days (integer, minimum 1)
-- "reasoning": brief note on why you adjusted (or kept) the duration
+        if not _DURATION_LLM_BREAKER.allow():
+            logger.info(
+                "schedule_duration_refine_skipped",
+                schedule_id=state["schedule_id"],
+                reason="llm_circuit_open",
+                task_count=len(refine_tasks),
+            )
+            return {"tasks": tasks}
+
+        tasks_by_id = {task["id"]: task for task in refine_tasks}
+        refined_map: dict[str, int] = {}
+
+        chunks = _chunk_task_summary(task_summary, refine_tasks, _REFINE_CHUNK_TASKS)
+        semaphore = asyncio.Semaphore(_REFINE_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                self._refine_chunk(state, chunk, tasks_by_id, refined_map, semaphore)
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
 
-Consider:
-- Typical crew sizes for Indian residential interiors (2-4 workers per trade)
-- Curing times for civil work (minimum 7 days for plaster/concrete)
-- Paint drying between coats (1-2 days)
-- Carpentry complexity for modular furniture
-- Parallel work possibility within a single room is NOT applicable here (tasks are sequential per trade)
+        if errors:
+            _DURATION_LLM_BREAKER.record(failed=True)
+            logger.warning(
+                "schedule_duration_llm_failed",
+                error=str(errors[0]),
+                failed_chunks=len(errors),
+                chunk_count=len(chunks),
+                schedule_id=state["schedule_id"],
+            )
+            # Keep heuristic estimates (and any refinements already streamed)
+            return {"tasks": tasks}
 
-Return ONLY the JSON array, no other text."""
+        _DURATION_LLM_BREAKER.record(failed=False)
+        logger.info(
+            "schedule_durations_refined",
+            schedule_id=state["schedule_id"],
+            refined_count=len(refined_map),
+            chunk_count=len(chunks),
+        )
 
         try:
+            await self._duration_cache.set(
+                cache_key, [refined_map.get(task["id"]) for task in refine_tasks]
+            )
+        except Exception as cache_exc:
+            logger.warning("schedule_duration_cache_set_failed", error=str(cache_exc))
+
+        return {"tasks": tasks}
+
+    async def _refine_chunk(
+        self,
+        state: ScheduleState,
+        task_summary: list[dict[str, Any]],
+        tasks_by_id: dict[str, dict[str, Any]],
+        refined_map: dict[str, int],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Stream LLM duration refinements for one chunk of tasks.
+
+        Refinements are applied to ``tasks_by_id`` and recorded in
+        ``refined_map`` as soon as each object is complete in the stream.
+        """
+        user_prompt = f"""Tasks:
+{orjson.dumps(task_summary, option=orjson.OPT_INDENT_2).decode()}"""
+
+        async with semaphore:
             response = await self._llm.completion(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+                model=DURATION_MODEL,
+                messages=[
+                    _system_message(DURATION_ESTIMATE_SYSTEM_PROMPT, DURATION_MODEL),
+                    {"role": "user", "content": user_prompt},
+                ],
                 encrypted_key=state.get("encrypted_key"),
                 iv=state.get("iv"),
                 auth_tag=state.get("auth_tag"),
                 plain_api_key=state.get("plain_api_key"),
                 temperature=0.2,
                 max_tokens=4000,
+                stream=True,
             )
 
-            content = response.choices[0].message.content or "[]"
-            content = content.strip()
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if lines[-1].strip() == "```" else "\n".join(lines[1:])
-                content = content.strip()
-
-            refinements = json.loads(content)
-            if not isinstance(refinements, list):
-                refinements = [refinements]
-
-            # Build lookup of refined durations
-            refined_map: dict[str, int] = {}
-            for item in refinements:
-                task_id = item.get("task_id", "")
-                duration = item.get("duration_days")
-                if task_id and duration and isinstance(duration, (int, float)):
-                    refined_map[task_id] = max(1, int(duration))
-
-            # Apply refinements
-            for task in tasks:
-                if task["id"] in refined_map:
-                    task["duration_days"] = refined_map[task["id"]]
-
-            logger.info(
-                "schedule_durations_refined",
-                schedule_id=state["schedule_id"],
-                refined_count=len(refined_map),
-            )
-
-        except Exception as exc:
-            logger.warning(
-                "schedule_duration_llm_failed",
-                error=str(exc),
-                schedule_id=state["schedule_id"],
-            )
-            # Keep heuristic estimates as fallback
-
-        return {"tasks": tasks}
+            parser = _JsonObjectStream()
+            async for chunk in response:
+                for item in parser.feed(chunk.choices[0].delta.content or ""):
+                    task_id = item.get("task_id", "")
+                    duration = item.get("duration_days")
+                    if task_id in tasks_by_id and duration and isinstance(duration, (int, float)):
+                        refined_map[task_id] = max(1, int(duration))
+                        tasks_by_id[task_id]["duration_days"] = refined_map[task_id]
 
     async def _set_dependencies(self, state: ScheduleState) -> dict[str, Any]:
         """Node 4: Build the dependency graph between tasks.
@@ -394,49 +643,53 @@ Return ONLY the JSON array, no other text."""
         logger.info("schedule_set_dependencies", schedule_id=state["schedule_id"])
 
         tasks = state["tasks"]
+        table = TaskTable.from_tasks(tasks)
+        task_ids = table.task_ids
         dependencies: list[dict[str, Any]] = []
 
-        # Group tasks by room
-        room_tasks: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        for task in tasks:
-            room_tasks[task["room_id"]].append(task)
-
-        # Sort each room's tasks by trade sequence order
-        for room_id in room_tasks:
-            room_tasks[room_id].sort(
-                key=lambda t: TRADE_ORDER.get(TradeType(t["trade"]), 99)
-            )
-
-        # Within each room: sequential dependencies along trade sequence
-        for room_id, rtasks in room_tasks.items():
-            for i in range(1, len(rtasks)):
-                dep = {
-                    "from_task_id": rtasks[i - 1]["id"],
-                    "to_task_id": rtasks[i]["id"],
-                    "lag_days": 0,
-                }
-                dependencies.append(dep)
-                rtasks[i]["depends_on"] = rtasks[i].get("depends_on", []) + [rtasks[i - 1]["id"]]
+        # Order rows by room (first appearance), then trade sequence; lexsort
+        # is stable so equal trades keep their task-list order.
+        order = np.lexsort((table.trade_order, table.room_codes))
+        sorted_rooms = table.room_codes[order]
+
+        # Within each room: sequential dependencies along trade sequence.
+        # Consecutive rows of the sorted order that share a room form an edge.
+        same_room = sorted_rooms[1:] == sorted_rooms[:-1]
+        for prev_idx, next_idx in zip(
+            order[:-1][same_room].tolist(), order[1:][same_room].tolist(), strict=True
+        ):
+            prev_id = task_ids[prev_idx]
+            dependencies.append({
+                "from_task_id": prev_id,
+                "to_task_id": task_ids[next_idx],
+                "lag_days": 0,
+            })
+            tasks[next_idx].setdefault("depends_on", []).append(prev_id)
 
         # Cross-room: demolition in all rooms must finish before any civil starts
         # This models the common practice of completing demolition across all rooms first
-        demolition_tasks = [t for t in tasks if t["trade"] == TradeType.DEMOLITION.value]
-        civil_tasks = [t for t in tasks if t["trade"] == TradeType.CIVIL.value]
-
-        for demo_task in demolition_tasks:
-            for civil_task in civil_tasks:
-                # Only add cross-room dependencies (within-room already handled)
-                if demo_task["room_id"] != civil_task["room_id"]:
-                    dep = {
-                        "from_task_id": demo_task["id"],
-                        "to_task_id": civil_task["id"],
-                        "lag_days": 0,
-                    }
-                    dependencies.append(dep)
-                    civil_task["depends_on"] = civil_task.get("depends_on", []) + [demo_task["id"]]
+        demo_rows = np.flatnonzero(table.trade_order == TRADE_ORDER[TradeType.DEMOLITION])
+        demo_rooms = table.room_codes[demo_rows]
+        civil_rows = np.flatnonzero(table.trade_order == TRADE_ORDER[TradeType.CIVIL])
+
+        for civil_idx in civil_rows.tolist():
+            # Only add cross-room dependencies (within-room already handled)
+            fan_in_rows = demo_rows[demo_rooms != table.room_codes[civil_idx]]
+            if not len(fan_in_rows):
+                continue
+            fan_in = [task_ids[i] for i in fan_in_rows.tolist()]
+            civil_id = task_ids[civil_idx]
+            dependencies.extend(
+                {"from_task_id": demo_id, "to_task_id": civil_id, "lag_days": 0}
+                for demo_id in fan_in
+            )
+            civil_depends_on = tasks[civil_idx].setdefault("depends_on", [])
+            existing = set(civil_depends_on)
+            civil_depends_on.extend(d for d in fan_in if d not in existing)
 
         return {
             "tasks": tasks,
+            "task_table": table,
             "dependencies": dependencies,
         }
 
@@ -454,18 +707,34 @@ Return ONLY the JSON array, no other text."""
         project_start = date.fromisoformat(state["start_date"])
         working_days = state.get("working_days_per_week", 6)
 
-        for task in tasks:
-            earliest_start_days = cp_result.task_earliest_start.get(task["id"], 0)
-            task_start = _add_working_days(project_start, earliest_start_days, working_days)
-            task_end = _add_working_days(task_start, task["duration_days"], working_days)
-
+        # Map working-day offsets to calendar dates for all tasks at once
+        table = state.get("task_table")
+        if table is None or len(table) != len(tasks):
+            table = TaskTable.from_tasks(tasks)
+        earliest = cp_result.task_earliest_start
+        start_days = np.fromiter(
+            (earliest.get(task_id, 0) for task_id in table.task_ids),
+            dtype=np.int64,
+            count=len(table),
+        )
+        end_days = start_days + table.duration
+        horizon = int(end_days.max()) if len(tasks) else 0
+        calendar = _working_day_offsets(project_start, horizon, working_days)
+        origin = np.datetime64(project_start, "D")
+        start_dates = (origin + calendar[start_days]).astype(object)
+        end_dates = (origin + calendar[end_days]).astype(object)
+
+        critical_ids = cp_result.critical_path_idset
+        for task, task_start, task_end in zip(tasks, start_dates, end_dates, strict=True):
             task["start_date"] = task_start.isoformat()
             task["end_date"] = task_end.isoformat()
-            task["is_critical"] = task["id"] in cp_result.critical_path_ids
+            # Parsed dates are kept for the milestone/result build so the ISO
+            # strings are not re-parsed downstream.
+            task["_start_date_obj"] = task_start
+            task["_end_date_obj"] = task_end
+            task["is_critical"] = task["id"] in critical_ids
 
-        # Calculate project end date
         total_duration = cp_result.total_duration
-        project_end = _add_working_days(project_start, total_duration, working_days)
 
         return {
             "tasks": tasks,
@@ -484,130 +753,130 @@ Return ONLY the JSON array, no other text."""
 
         milestones: list[dict[str, Any]] = []
 
-        # Create a milestone for each trade completion
-        trade_tasks: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        for task in tasks:
-            trade_tasks[task["trade"]].append(task)
-
-        for trade_value in TRADE_SEQUENCE:
+        # Create a milestone for each trade completion.  A stable sort on the
+        # trade-order key yields the trade groups in sequence order with tasks
+        # in their original order, and each group is scanned once for its
+        # task IDs and latest end date.
+        project_end_date: date | None = None
+        by_order = itemgetter("_order")
+        for order, group in groupby(sorted(tasks, key=by_order), key=by_order):
+            trade_value = TRADE_SEQUENCE[order]
             trade_str = trade_value.value
-            if trade_str not in trade_tasks:
-                continue
-
-            t_tasks = trade_tasks[trade_str]
+            task_ids: list[str] = []
             # Milestone date is the latest end date among tasks of this trade
-            end_dates = [
-                date.fromisoformat(t["end_date"])
-                for t in t_tasks
-                if t.get("end_date")
-            ]
-            if not end_dates:
+            milestone_date: date | None = None
+            for task in group:
+                task_ids.append(task["id"])
+                end = _task_date(task, "end_date")
+                if end is not None and (milestone_date is None or end > milestone_date):
+                    milestone_date = end
+            if milestone_date is None:
                 continue
+            if project_end_date is None or milestone_date > project_end_date:
+                project_end_date = milestone_date
 
-            milestone_date = max(end_dates)
+            display_name = _trade_display_name(trade_value)
             milestone = {
-                "id": str(uuid.uuid4()),
+                "id": "",  # assigned in bulk below
                 "schedule_id": schedule_id,
-                "name": f"{_trade_display_name(trade_value)} Complete",
-                "description": f"All {_trade_display_name(trade_value).lower()} work completed across all rooms",
+                "name": f"{display_name} Complete",
+                "description": f"All {display_name.lower()} work completed across all rooms",
                 "target_date": milestone_date.isoformat(),
                 "actual_date": None,
                 "status": MilestoneStatus.PENDING.value,
                 "trade": trade_str,
-                "task_ids": [t["id"] for t in t_tasks],
+                "task_ids": task_ids,
             }
             milestones.append(milestone)
 
         # Project completion milestone
-        all_end_dates = [
-            date.fromisoformat(t["end_date"])
-            for t in tasks
-            if t.get("end_date")
-        ]
-        if all_end_dates:
-            project_end = max(all_end_dates)
+        if project_end_date is not None:
             milestones.append({
-                "id": str(uuid.uuid4()),
+                "id": "",  # assigned in bulk below
                 "schedule_id": schedule_id,
                 "name": "Project Handover",
                 "description": "All work completed and site handed over to client",
-                "target_date": project_end.isoformat(),
+                "target_date": project_end_date.isoformat(),
                 "actual_date": None,
                 "status": MilestoneStatus.PENDING.value,
                 "trade": None,
                 "task_ids": [t["id"] for t in tasks],
             })
 
+        for milestone, milestone_id in zip(milestones, uuid7_batch(len(milestones)), strict=True):
+            milestone["id"] = milestone_id
+
         # Build the final schedule result
         now = datetime.now(tz=timezone.utc)
-        project_start_date = date.fromisoformat(state["start_date"])
-
-        task_models = []
-        for t in tasks:
-            task_models.append(ScheduleTask(
-                id=t["id"],
-                schedule_id=schedule_id,
-                room_id=t["room_id"],
-                trade=TradeType(t["trade"]),
-                name=t["name"],
-                description=t.get("description", ""),
-                duration_days=t["duration_days"],
-                start_date=date.fromisoformat(t["start_date"]) if t.get("start_date") else None,
-                end_date=date.fromisoformat(t["end_date"]) if t.get("end_date") else None,
-                status=TaskStatus(t.get("status", "not_started")),
-                depends_on=t.get("depends_on", []),
-                resource_requirements=t.get("resource_requirements", {}),
-                estimated_cost=t.get("estimated_cost"),
-                is_critical=t.get("is_critical", False),
-            ))
-
-        dep_models = [
-            TaskDependency(
-                from_task_id=d["from_task_id"],
-                to_task_id=d["to_task_id"],
-                lag_days=d.get("lag_days", 0),
-            )
+
+        # The dicts below were produced by the earlier nodes and are trusted, so
+        # the result is emitted directly in ``Schedule.model_dump(mode="json")``
+        # shape.  Validation happens once at the API boundary, where the cached
+        # payload is loaded with ``Schedule(**cached)``.
+        task_results = [
+            {
+                "id": t["id"],
+                "schedule_id": schedule_id,
+                "room_id": t["room_id"],
+                "trade": t["trade"],
+                "name": t["name"],
+                "description": t.get("description", ""),
+                "duration_days": t["duration_days"],
+                "start_date": t.get("start_date"),
+                "end_date": t.get("end_date"),
+                "status": t.get("status", TaskStatus.NOT_STARTED.value),
+                "depends_on": list(t.get("depends_on", [])),
+                "resource_requirements": t.get("resource_requirements", {}),
+                "estimated_cost": t.get("estimated_cost"),
+                "is_critical": t.get("is_critical", False),
+            }
+            for t in tasks
+        ]
+
+        dep_results = [
+            {
+                "from_task_id": d["from_task_id"],
+                "to_task_id": d["to_task_id"],
+                "lag_days": d.get("lag_days", 0),
+            }
             for d in state["dependencies"]
         ]
 
-        milestone_models = [
-            Milestone(
-                id=m["id"],
-                schedule_id=schedule_id,
-                name=m["name"],
-                description=m.get("description", ""),
-                target_date=date.fromisoformat(m["target_date"]),
-                actual_date=date.fromisoformat(m["actual_date"]) if m.get("actual_date") else None,
-                status=MilestoneStatus(m.get("status", "pending")),
-                trade=TradeType(m["trade"]) if m.get("trade") else None,
-                task_ids=m.get("task_ids", []),
-            )
+        milestone_results = [
+            {
+                "id": m["id"],
+                "schedule_id": schedule_id,
+                "name": m["name"],
+                "description": m.get("description", ""),
+                "target_date": m["target_date"],
+                "actual_date": m.get("actual_date") or None,
+                "status": m.get("status", MilestoneStatus.PENDING.value),
+                "trade": m.get("trade") or None,
+                "task_ids": list(m.get("task_ids", [])),
+            }
             for m in milestones
         ]
 
-        project_end_date = None
-        if all_end_dates:
-            project_end_date = max(all_end_dates)
-
-        schedule = Schedule(
-            id=schedule_id,
-            project_id=state["project_id"],
-            name=f"{state['project_name']} - Construction Schedule",
-            status=ScheduleStatus.COMPLETE,
-            tasks=task_models,
-            dependencies=dep_models,
-            milestones=milestone_models,
-            critical_path_task_ids=state["critical_path_ids"],
-            total_duration_days=state["total_duration_days"],
-            start_date=project_start_date,
-            end_date=project_end_date,
-            created_at=now,
-            updated_at=now,
-        )
+        timestamp = _json_datetime(now)
+        schedule_result = {
+            "id": schedule_id,
+            "project_id": state["project_id"],
+            "name": f"{state['project_name']} - Construction Schedule",
+            "status": ScheduleStatus.COMPLETE.value,
+            "tasks": task_results,
+            "dependencies": dep_results,
+            "milestones": milestone_results,
+            "critical_path_task_ids": list(state["critical_path_ids"]),
+            "total_duration_days": state["total_duration_days"],
+            "start_date": project_start.isoformat(),
+            "end_date": project_end_date.isoformat() if project_end_date is not None else None,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+        }
 
         return {
             "milestones": milestones,
-            "schedule_result": schedule.model_dump(mode="json"),
+            "schedule_result": schedule_result,
             "status": ScheduleStatus.COMPLETE,
         }
 
@@ -615,78 +884,228 @@ Return ONLY the JSON array, no other text."""
 # -- Helper functions -------------------------------------------------------
 
 
-def _trade_display_name(trade: TradeType) -> str:
-    """Return a human-readable display name for a trade."""
-    names: dict[TradeType, str] = {
-        TradeType.DEMOLITION: "Demolition",
-        TradeType.CIVIL: "Civil Work",
-        TradeType.PLUMBING_ROUGH_IN: "Plumbing Rough-In",
-        TradeType.ELECTRICAL_ROUGH_IN: "Electrical Rough-In",
-        TradeType.FALSE_CEILING: "False Ceiling",
-        TradeType.FLOORING: "Flooring",
-        TradeType.CARPENTRY: "Carpentry",
-        TradeType.PAINTING: "Painting",
-        TradeType.MEP_FIXTURES: "MEP Fixtures",
-        TradeType.SOFT_FURNISHING: "Soft Furnishing",
-        TradeType.CLEANUP: "Cleanup & Handover",
-    }
-    return names.get(trade, trade.value.replace("_", " ").title())
+def _chunk_task_summary(
+    task_summary: list[dict[str, Any]],
+    refine_tasks: list[dict[str, Any]],
+    max_tasks: int,
+) -> list[list[dict[str, Any]]]:
+    """Split a task summary into chunks of at most ``max_tasks`` entries.
+
+    ``refine_tasks`` runs parallel to ``task_summary`` and supplies each
+    entry's room.  Rooms are never split, so the LLM sees each room's tasks
+    together; a single room larger than ``max_tasks`` forms its own chunk.
+    """
+    by_room: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for entry, task in zip(task_summary, refine_tasks, strict=True):
+        by_room[task["room_id"]].append(entry)
+
+    chunks: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    for room_entries in by_room.values():
+        if current and len(current) + len(room_entries) > max_tasks:
+            chunks.append(current)
+            current = []
+        current.extend(room_entries)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _duration_cache_key(task_summary: list[dict[str, Any]]) -> str:
+    """Return a stable digest of the task summary and model.
+
+    Task IDs are random per run, so they are left out; the position of each
+    task in the summary identifies it instead.
+    """
+    content = [
+        {key: value for key, value in entry.items() if key != "task_id"}
+        for entry in task_summary
+    ]
+    payload = orjson.dumps([DURATION_MODEL, content], option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
-def _infer_trades_for_room_type(room_type: str) -> set[str]:
-    """Infer which trades are needed based on room type when BOM is not available."""
-    base_trades = {
-        TradeType.DEMOLITION.value,
-        TradeType.CIVIL.value,
-        TradeType.ELECTRICAL_ROUGH_IN.value,
-        TradeType.FLOORING.value,
-        TradeType.PAINTING.value,
-        TradeType.CLEANUP.value,
-    }
+def _system_message(content: str, model: str) -> dict[str, Any]:
+    """Build a system message, marking it cacheable where the provider needs it.
 
-    if room_type in ("bathroom", "kitchen", "utility"):
-        base_trades.add(TradeType.PLUMBING_ROUGH_IN.value)
-        base_trades.add(TradeType.MEP_FIXTURES.value)
+    Anthropic only caches prompt prefixes that carry an explicit
+    ``cache_control`` marker; OpenAI caches identical prefixes automatically
+    and may reject unknown content-part fields, so it gets a plain message.
+    """
+    if model.startswith("anthropic/"):
+        return {
+            "role": "system",
+            "content": [
+                {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}},
+            ],
+        }
+    return {"role": "system", "content": content}
 
-    if room_type in ("living_room", "bedroom", "dining"):
-        base_trades.add(TradeType.FALSE_CEILING.value)
-        base_trades.add(TradeType.SOFT_FURNISHING.value)
 
-    if room_type in ("bedroom", "living_room", "kitchen", "study"):
-        base_trades.add(TradeType.CARPENTRY.value)
+class _JsonObjectStream:
+    """Incrementally extract top-level JSON objects from streamed text.
 
-    if room_type in ("bathroom", "kitchen"):
-        base_trades.add(TradeType.MEP_FIXTURES.value)
+    Characters outside an object -- array brackets, commas, code fences --
+    are ignored, so both ``[{...}, {...}]`` and a bare ``{...}`` work.  Each
+    call to :meth:`feed` returns the objects completed by that chunk.
+    """
 
-    return base_trades
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        completed: list[dict[str, Any]] = []
+        for char in text:
+            if self._depth == 0:
+                if char != "{":
+                    continue
+                self._buffer = []
+
+            self._buffer.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = json.loads("".join(self._buffer))
+                    if isinstance(obj, dict):
+                        completed.append(obj)
+        return completed
+
+
+_TRADE_DISPLAY_NAMES: dict[TradeType, str] = {
+    TradeType.DEMOLITION: "Demolition",
+    TradeType.CIVIL: "Civil Work",
+    TradeType.PLUMBING_ROUGH_IN: "Plumbing Rough-In",
+    TradeType.ELECTRICAL_ROUGH_IN: "Electrical Rough-In",
+    TradeType.FALSE_CEILING: "False Ceiling",
+    TradeType.FLOORING: "Flooring",
+    TradeType.CARPENTRY: "Carpentry",
+    TradeType.PAINTING: "Painting",
+    TradeType.MEP_FIXTURES: "MEP Fixtures",
+    TradeType.SOFT_FURNISHING: "Soft Furnishing",
+    TradeType.CLEANUP: "Cleanup & Handover",
+}
 
+# Trades every room needs when no BOM is available
+_BASE_ROOM_TRADES: frozenset[str] = frozenset({
+    TradeType.DEMOLITION.value,
+    TradeType.CIVIL.value,
+    TradeType.ELECTRICAL_ROUGH_IN.value,
+    TradeType.FLOORING.value,
+    TradeType.PAINTING.value,
+    TradeType.CLEANUP.value,
+})
+
+_WET_ROOM_TRADES = frozenset({TradeType.PLUMBING_ROUGH_IN.value, TradeType.MEP_FIXTURES.value})
+_FURNISHED_ROOM_TRADES = frozenset({TradeType.FALSE_CEILING.value, TradeType.SOFT_FURNISHING.value})
+_CARPENTRY_TRADES = frozenset({TradeType.CARPENTRY.value})
+
+_ROOM_TYPE_TRADES: dict[str, frozenset[str]] = {
+    "bathroom": _BASE_ROOM_TRADES | _WET_ROOM_TRADES,
+    "kitchen": _BASE_ROOM_TRADES | _WET_ROOM_TRADES | _CARPENTRY_TRADES,
+    "utility": _BASE_ROOM_TRADES | _WET_ROOM_TRADES,
+    "living_room": _BASE_ROOM_TRADES | _FURNISHED_ROOM_TRADES | _CARPENTRY_TRADES,
+    "bedroom": _BASE_ROOM_TRADES | _FURNISHED_ROOM_TRADES | _CARPENTRY_TRADES,
+    "dining": _BASE_ROOM_TRADES | _FURNISHED_ROOM_TRADES,
+    "study": _BASE_ROOM_TRADES | _CARPENTRY_TRADES,
+}
 
-def _add_working_days(start: date, working_days_count: int, working_days_per_week: int) -> date:
-    """Add a number of working days to a start date, skipping rest days.
 
-    Assumes the working week starts on Monday.  For a 6-day week, Sunday is
-    the rest day.  For 5-day weeks, Saturday and Sunday are rest days.
-    """
-    if working_days_per_week >= 7:
-        return start + timedelta(days=working_days_count)
+def _analyze_rooms(
+    rooms: list[dict[str, Any]],
+    bom_by_room: dict[str, list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Return the scope analysis for each room, in input order."""
+    return [_analyze_one_room(room, bom_by_room.get(room["id"], [])) for room in rooms]
+
+
+def _analyze_one_room(room: dict[str, Any], room_bom: list[dict[str, Any]]) -> dict[str, Any]:
+    """Compute a room's area and the trades it needs from its BOM items."""
+    room_id = room["id"]
+    dims = room.get("dimensions", {})
+    length_mm = dims.get("length_mm", 3000)
+    width_mm = dims.get("width_mm", 3000)
+    area_sqft = (length_mm * width_mm) / (304.8 * 304.8)
+
+    # Determine which trades are needed for this room based on BOM
+    room_trades: set[str] = set()
+    for item in room_bom:
+        trade_value = CATEGORY_TO_TRADE_VALUE.get(item.get("category", ""))
+        if trade_value:
+            room_trades.add(trade_value)
+
+    # Always include demolition (even if minimal) and cleanup
+    room_trades.add(TradeType.DEMOLITION.value)
+    room_trades.add(TradeType.CLEANUP.value)
+
+    # If no BOM, infer trades from room type
+    if len(room_trades) <= 2:
+        room_type = room.get("type", "bedroom")
+        room_trades.update(_infer_trades_for_room_type(room_type))
+
+    return {
+        "room_id": room_id,
+        "room_name": room.get("name", "Room"),
+        "room_type": room.get("type", "bedroom"),
+        "area_sqft": round(area_sqft, 1),
+        "trades_needed": sorted(room_trades),
+        "bom_item_count": len(room_bom),
+    }
+
+
+def _trade_display_name(trade: TradeType) -> str:
+    """Return a human-readable display name for a trade."""
+    return _TRADE_DISPLAY_NAMES.get(trade) or trade.value.replace("_", " ").title()
+
 
-    rest_days_per_week = 7 - working_days_per_week
-    current = start
-    remaining = working_days_count
+def _infer_trades_for_room_type(room_type: str) -> frozenset[str]:
+    """Infer which trades are needed based on room type when BOM is not available."""
+    return _ROOM_TYPE_TRADES.get(room_type, _BASE_ROOM_TRADES)
+
+
+def _json_datetime(value: datetime) -> str:
+    """Format a UTC datetime the way Pydantic's JSON mode does (``Z`` suffix)."""
+    return value.isoformat().replace("+00:00", "Z")
 
-    while remaining > 0:
-        current += timedelta(days=1)
-        weekday = current.weekday()  # 0=Monday, 6=Sunday
 
-        # For 6-day week: skip Sunday (6)
-        # For 5-day week: skip Saturday (5) and Sunday (6)
-        if working_days_per_week == 6 and weekday == 6:
-            continue
-        elif working_days_per_week == 5 and weekday >= 5:
-            continue
-        elif working_days_per_week < 5 and weekday >= working_days_per_week:
-            continue
+def _task_date(task: dict[str, Any], field: str) -> date | None:
+    """Return a task's start/end date, preferring the pre-parsed ``date`` object."""
+    parsed = task.get(f"_{field}_obj")
+    if parsed is not None:
+        return parsed
+    raw = task.get(field)
+    return date.fromisoformat(raw) if raw else None
 
-        remaining -= 1
 
-    return current
+def _working_day_offsets(start: date, working_days_count: int, working_days_per_week: int) -> np.ndarray:
+    """Return calendar-day offsets from ``start`` for 0..``working_days_count`` working days.
+
+    Element ``k`` is the number of calendar days from ``start`` to the
+    ``k``-th working day after it (``0`` for ``k == 0``), computed for every
+    ``k`` at once with a vectorised weekday mask instead of a day-by-day loop.
+    """
+    if working_days_per_week >= 7:
+        return np.arange(working_days_count + 1, dtype=np.int64)
+
+    # Enough calendar days to contain ``working_days_count`` working days
+    span = (working_days_count // working_days_per_week + 1) * 7
+    days = np.arange(1, span + 1, dtype=np.int64)
+    # Working days are Monday..(working_days_per_week - 1); e.g. a 6-day week
+    # rests on Sunday and a 5-day week on Saturday and Sunday.
+    is_working = (days + start.weekday()) % 7 < working_days_per_week
+    offsets = np.concatenate((np.zeros(1, dtype=np.int64), days[is_working]))
+    return offsets[: working_days_count + 1]
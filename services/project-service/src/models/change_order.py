@@ -9,13 +9,13 @@ the project schedule and budget.
 from __future__ import annotations
 
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class ChangeOrderType(str, Enum):
+class ChangeOrderType(StrEnum):
     """Type of change order."""
 
     MATERIAL_SWAP = "material_swap"
@@ -25,7 +25,7 @@ class ChangeOrderType(str, Enum):
     SPECIFICATION_CHANGE = "specification_change"
 
 
-class ChangeOrderStatus(str, Enum):
+class ChangeOrderStatus(StrEnum):
     """Processing status for a change order."""
 
     DRAFT = "draft"
@@ -61,6 +61,18 @@ class ScheduleImpact(BaseModel):
     explanation: str = Field(default="", description="LLM-generated explanation of schedule impact")
 
 
+class LineItemChange(BaseModel):
+    """Cost change for a single BOM line item."""
+
+    # The LLM may attach extra context per item; keep it rather than drop it
+    model_config = ConfigDict(extra="allow")
+
+    item: str = Field(default="", description="Line item name")
+    original_cost: float | None = Field(default=None, description="Cost before the change")
+    revised_cost: float | None = Field(default=None, description="Cost after the change")
+    reason: str = Field(default="", description="Why the item's cost changes")
+
+
 class CostImpact(BaseModel):
     """Impact of a change order on project costs."""
 
@@ -72,7 +84,7 @@ class CostImpact(BaseModel):
         default_factory=list,
         description="Material categories affected",
     )
-    line_item_changes: list[dict[str, Any]] = Field(
+    line_item_changes: list[LineItemChange] = Field(
         default_factory=list,
         description="Detailed per-item cost changes",
     )
@@ -7,8 +7,10 @@ output shapes consumed by the scheduling agent and Gantt export.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import date, datetime
-from enum import Enum
+from enum import StrEnum
+from types import MappingProxyType
 from typing import Annotated, Any
 
 from pydantic import BaseModel, Field
@@ -17,7 +19,7 @@ from pydantic import BaseModel, Field
 # -- Enumerations -----------------------------------------------------------
 
 
-class TradeType(str, Enum):
+class TradeType(StrEnum):
     """Trade sequence for interior construction.
 
     The ordering reflects the canonical execution sequence -- each trade
@@ -38,7 +40,7 @@ class TradeType(str, Enum):
     CLEANUP = "cleanup"
 
 
-class ScheduleStatus(str, Enum):
+class ScheduleStatus(StrEnum):
     """Processing status for a schedule."""
 
     PENDING = "pending"
@@ -47,7 +49,7 @@ class ScheduleStatus(str, Enum):
     FAILED = "failed"
 
 
-class TaskStatus(str, Enum):
+class TaskStatus(StrEnum):
     """Status of an individual schedule task."""
 
     NOT_STARTED = "not_started"
@@ -57,7 +59,7 @@ class TaskStatus(str, Enum):
     BLOCKED = "blocked"
 
 
-class MilestoneStatus(str, Enum):
+class MilestoneStatus(StrEnum):
     """Status of a project milestone."""
 
     PENDING = "pending"
@@ -67,7 +69,7 @@ class MilestoneStatus(str, Enum):
 
 # -- Trade sequence ordering ------------------------------------------------
 
-TRADE_SEQUENCE: list[TradeType] = [
+TRADE_SEQUENCE: tuple[TradeType, ...] = (
     TradeType.DEMOLITION,
     TradeType.CIVIL,
     TradeType.PLUMBING_ROUGH_IN,
@@ -79,9 +81,11 @@ TRADE_SEQUENCE: list[TradeType] = [
     TradeType.MEP_FIXTURES,
     TradeType.SOFT_FURNISHING,
     TradeType.CLEANUP,
-]
+)
 
-TRADE_ORDER: dict[TradeType, int] = {trade: idx for idx, trade in enumerate(TRADE_SEQUENCE)}
+TRADE_ORDER: Mapping[TradeType, int] = MappingProxyType(
+    {trade: idx for idx, trade in enumerate(TRADE_SEQUENCE)}
+)
 
 
 # -- Sub-models -------------------------------------------------------------
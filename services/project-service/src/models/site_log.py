@@ -8,13 +8,13 @@ labour counts at the construction site.
 from __future__ import annotations
 
 from datetime import date, datetime
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 
-class WeatherCondition(str, Enum):
+class WeatherCondition(StrEnum):
     """Weather conditions affecting site work."""
 
     CLEAR = "clear"
@@ -25,7 +25,7 @@ class WeatherCondition(str, Enum):
     COLD = "cold"
 
 
-class LogSeverity(str, Enum):
+class LogSeverity(StrEnum):
     """Severity level for site log entries."""
 
     INFO = "info"
@@ -7,16 +7,29 @@ to understand how proposed changes affect the project schedule and budget.
 
 from __future__ import annotations
 
-import uuid
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 from typing import Annotated, Any
 
 import structlog
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import Response
+from redis.exceptions import WatchError
+from structlog.contextvars import bind_contextvars
 
 from openlintel_shared.auth import get_current_user
 from openlintel_shared.config import Settings, get_settings
-from openlintel_shared.redis_client import cache_get, cache_set
+from openlintel_shared.ids import uuid7
+from openlintel_shared.redis_client import (
+    cache_get_json,
+    decompress_payload,
+    get_binary_redis,
+    get_redis,
+)
 
 from src.agents.impact_agent import ImpactAgent
 from src.models.change_order import (
@@ -36,6 +49,12 @@ CHANGE_ORDER_CACHE_PREFIX = "change_order:"
 SCHEDULE_CACHE_PREFIX = "schedule:"
 CACHE_TTL = 3600 * 24  # 24 hours
 
+# Each change order also has a tiny ``{key}:updated_at`` stamp.  GET requests
+# compare it against a process-local copy of the order and skip fetching and
+# parsing the full payload when it has not changed.
+UPDATED_AT_SUFFIX = ":updated_at"
+_LOCAL_CACHE_MAX_SIZE = 1024
+_local_change_orders: OrderedDict[str, tuple[str, ChangeOrder]] = OrderedDict()
 
 # ---------------------------------------------------------------------------
 # POST /api/v1/change-orders — Create a change order
@@ -52,10 +71,11 @@ CACHE_TTL = 3600 * 24  # 24 hours
 async def create_change_order(
     request: ChangeOrderCreate,
     user_id: Annotated[str, Depends(get_current_user)],
-) -> ChangeOrderResponse:
+) -> Response:
     """Create a change order and store it in cache."""
     now = datetime.now(tz=timezone.utc)
-    order_id = str(uuid.uuid4())
+    order_id = uuid7()
+    bind_contextvars(order_id=order_id, project_id=request.project_id)
 
     change_order = ChangeOrder(
         id=order_id,
@@ -72,22 +92,16 @@ async def create_change_order(
         updated_at=now,
     )
 
-    await cache_set(
-        f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}",
-        change_order.model_dump(mode="json"),
-        ttl=CACHE_TTL,
-    )
+    await _store_change_order(change_order)
 
-    logger.info(
-        "change_order_created",
-        order_id=order_id,
-        project_id=request.project_id,
-        type=request.type.value,
-    )
+    logger.info("change_order_created", type=str(request.type))
 
-    return ChangeOrderResponse(
-        change_order=change_order,
-        message="Change order created. Use POST /change-orders/{id}/analyze to run impact analysis.",
+    return _json_response(
+        ChangeOrderResponse(
+            change_order=change_order,
+            message="Change order created. Use POST /change-orders/{id}/analyze to run impact analysis.",
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
@@ -104,9 +118,21 @@ async def create_change_order(
 async def get_change_order(
     order_id: str,
     user_id: Annotated[str, Depends(get_current_user)],
-) -> ChangeOrderResponse:
-    """Retrieve a change order from cache."""
-    cached = await cache_get(f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}")
+) -> Response:
+    """Retrieve a change order from cache.
+
+    Repeated reads of an unchanged order (e.g. a UI polling during analysis)
+    are served from a process-local copy after checking its ``updated_at``
+    stamp in Redis.
+    """
+    key = f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}"
+    stamp: str | None = await get_redis().get(f"{key}{UPDATED_AT_SUFFIX}")
+    local = _local_change_orders.get(order_id)
+    if stamp is not None and local is not None and local[0] == stamp:
+        _local_change_orders.move_to_end(order_id)
+        return _json_response(ChangeOrderResponse(change_order=local[1], message=""))
+
+    cached = await cache_get_json(key)
 
     if cached is None:
         raise HTTPException(
@@ -114,10 +140,11 @@ async def get_change_order(
             detail=f"Change order {order_id} not found",
         )
 
-    return ChangeOrderResponse(
-        change_order=ChangeOrder(**cached),
-        message="",
-    )
+    change_order = ChangeOrder.model_validate_json(cached)
+    if stamp is not None:
+        _remember_change_order(stamp, change_order)
+
+    return _json_response(ChangeOrderResponse(change_order=change_order, message=""))
 
 
 # ---------------------------------------------------------------------------
@@ -128,11 +155,13 @@ async def get_change_order(
 @router.post(
     "/{order_id}/analyze",
     response_model=ChangeOrderResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Analyze change order impact",
     description=(
-        "Run impact analysis on a change order to determine its effect on "
+        "Queue impact analysis on a change order to determine its effect on "
         "the project schedule and budget. Optionally provide current schedule "
-        "and BOM data for more accurate analysis."
+        "and BOM data for more accurate analysis. Returns immediately; poll "
+        "GET /change-orders/{id} until the status leaves ANALYZING."
     ),
 )
 async def analyze_change_order(
@@ -141,97 +170,259 @@ async def analyze_change_order(
     background_tasks: BackgroundTasks,
     user_id: Annotated[str, Depends(get_current_user)],
     settings: Annotated[Settings, Depends(get_settings)],
-) -> ChangeOrderResponse:
-    """Run the ImpactAgent to analyse the change order's effects.
+) -> Response:
+    """Queue the ImpactAgent to analyse the change order's effects.
 
     If schedule/BOM data is not provided in the request body, the endpoint
     attempts to load it from cache using the schedule_id stored on the
-    change order.
+    change order.  The change order is marked ANALYZING and the analysis
+    runs as a background task.
     """
-    cached = await cache_get(f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}")
+    bind_contextvars(order_id=order_id)
 
-    if cached is None:
+    # Load the change order, and its schedule if not provided, together
+    schedule_data = request.schedule_data
+    change_order, schedule_cached = await _load_order_with_schedule(
+        order_id, include_schedule=not schedule_data
+    )
+
+    if change_order is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Change order {order_id} not found",
         )
 
-    change_order = ChangeOrder(**cached)
-
-    # Load schedule data if not provided
-    schedule_data = request.schedule_data
-    if not schedule_data:
-        schedule_cached = await cache_get(f"{SCHEDULE_CACHE_PREFIX}{change_order.schedule_id}")
-        if schedule_cached:
-            schedule_data = schedule_cached
-
-    bom_data = request.bom_data
+    if schedule_cached:
+        schedule_data = json.loads(decompress_payload(schedule_cached))
 
     # Update status to analyzing
     change_order.status = ChangeOrderStatus.ANALYZING
     change_order.updated_at = datetime.now(tz=timezone.utc)
-    await cache_set(
-        f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}",
-        change_order.model_dump(mode="json"),
-        ttl=CACHE_TTL,
+    await _store_change_order(change_order)
+
+    background_tasks.add_task(
+        _run_impact_analysis,
+        change_order=change_order,
+        schedule_data=schedule_data,
+        bom_data=request.bom_data,
+    )
+
+    logger.info("change_order_analysis_queued")
+
+    return _json_response(
+        ChangeOrderResponse(
+            change_order=change_order,
+            message="Impact analysis queued. Poll GET /change-orders/{id} for the result.",
+        ),
+        status_code=status.HTTP_202_ACCEPTED,
     )
 
-    # Run impact analysis
+
+# ---------------------------------------------------------------------------
+# Background task
+# ---------------------------------------------------------------------------
+
+
+async def _run_impact_analysis(
+    change_order: ChangeOrder,
+    schedule_data: dict[str, Any],
+    bom_data: dict[str, Any],
+) -> None:
+    """Run the ImpactAgent in the background and store the analysed change order.
+
+    On failure the change order is returned to DRAFT so it can be re-analysed.
+    """
+    order_id = change_order.id
+    bind_contextvars(order_id=order_id, project_id=change_order.project_id)
+
+    # Concurrent requests for the same change order and inputs share a
+    # single agent run.
     try:
-        agent = ImpactAgent()
-        result = await agent.invoke(
-            change_order_id=order_id,
-            change_order_type=change_order.type.value,
-            change_title=change_order.title,
-            change_description=change_order.description,
-            change_details=change_order.change_details,
-            schedule_data=schedule_data,
-            bom_data=bom_data,
+        result = await _IMPACT_COALESCER.run(
+            _impact_request_key(change_order, schedule_data, bom_data),
+            lambda: ImpactAgent().invoke(
+                change_order_id=order_id,
+                change_order_type=str(change_order.type),
+                change_title=change_order.title,
+                change_description=change_order.description,
+                change_details=change_order.change_details,
+                schedule_data=schedule_data,
+                bom_data=bom_data,
+            ),
         )
 
-        impact_data = result.get("impact_analysis")
-        if impact_data:
-            change_order.impact_analysis = ImpactAnalysis(**impact_data)
+        impact_analysis: ImpactAnalysis | None = result.get("impact_analysis")
+        if impact_analysis is not None:
+            change_order.impact_analysis = impact_analysis
             change_order.status = ChangeOrderStatus.ANALYZED
+            # The analysis is stamped when it completes; reuse that instant
+            change_order.updated_at = impact_analysis.analyzed_at or datetime.now(tz=timezone.utc)
         else:
             change_order.status = ChangeOrderStatus.DRAFT
+            change_order.updated_at = datetime.now(tz=timezone.utc)
 
-        change_order.updated_at = datetime.now(tz=timezone.utc)
-
-        await cache_set(
-            f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}",
-            change_order.model_dump(mode="json"),
-            ttl=CACHE_TTL,
-        )
+        await _store_change_order(change_order)
 
         logger.info(
             "change_order_analyzed",
-            order_id=order_id,
             risk_level=change_order.impact_analysis.risk_level if change_order.impact_analysis else None,
         )
 
-        return ChangeOrderResponse(
-            change_order=change_order,
-            message="Impact analysis complete.",
-        )
-
     except Exception as exc:
         logger.error(
             "change_order_analysis_failed",
-            order_id=order_id,
             error=str(exc),
             exc_info=True,
         )
 
-        change_order.status = ChangeOrderStatus.DRAFT
-        change_order.updated_at = datetime.now(tz=timezone.utc)
-        await cache_set(
-            f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}",
-            change_order.model_dump(mode="json"),
-            ttl=CACHE_TTL,
-        )
+        await _reset_analyzing_order(order_id)
 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Impact analysis failed: {exc}",
-        ) from exc
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _json_response(body: ChangeOrderResponse, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialise a response model once with pydantic-core and return it as-is.
+
+    Returning a ``Response`` makes FastAPI skip re-validating and re-encoding
+    the ``response_model``; the model is still used for the OpenAPI schema.
+    """
+    return Response(
+        content=body.model_dump_json(),
+        media_type="application/json",
+        status_code=status_code,
+    )
+
+
+async def _store_change_order(change_order: ChangeOrder) -> None:
+    """Persist a change order together with its ``updated_at`` stamp."""
+    key = f"{CHANGE_ORDER_CACHE_PREFIX}{change_order.id}"
+    stamp = change_order.updated_at.isoformat() if change_order.updated_at else ""
+    async with get_redis().pipeline(transaction=True) as pipe:
+        pipe.set(key, change_order.model_dump_json(), ex=CACHE_TTL)
+        pipe.set(f"{key}{UPDATED_AT_SUFFIX}", stamp, ex=CACHE_TTL)
+        await pipe.execute()
+    _local_change_orders.pop(change_order.id, None)
+
+
+async def _reset_analyzing_order(order_id: str) -> None:
+    """Return a change order stuck in ANALYZING to DRAFT after a failed run.
+
+    The stored order is read, updated and re-written through the model in a
+    ``WATCH`` transaction, so a concurrent store (e.g. another analysis
+    finishing) wins instead of being overwritten.  Orders that have already
+    left ANALYZING are left untouched.
+    """
+    key = f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}"
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            cached = await pipe.get(key)
+            if cached is None:
+                return
+            change_order = ChangeOrder.model_validate_json(cached)
+            if change_order.status != ChangeOrderStatus.ANALYZING:
+                return
+
+            change_order.status = ChangeOrderStatus.DRAFT
+            change_order.updated_at = datetime.now(tz=timezone.utc)
+            pipe.multi()
+            pipe.set(key, change_order.model_dump_json(), keepttl=True)
+            pipe.set(f"{key}{UPDATED_AT_SUFFIX}", change_order.updated_at.isoformat(), keepttl=True)
+            await pipe.execute()
+    except WatchError:
+        logger.info("change_order_reset_skipped", reason="modified_concurrently")
+    finally:
+        _local_change_orders.pop(order_id, None)
+
+
+def _remember_change_order(stamp: str, change_order: ChangeOrder) -> None:
+    """Keep a local copy of a change order, evicting the least recently used."""
+    _local_change_orders[change_order.id] = (stamp, change_order)
+    _local_change_orders.move_to_end(change_order.id)
+    while len(_local_change_orders) > _LOCAL_CACHE_MAX_SIZE:
+        _local_change_orders.popitem(last=False)
+
+
+class _ImpactCoalescer:
+    """Share one in-flight impact analysis between identical concurrent requests.
+
+    The first caller for a key starts the analysis; callers arriving while it
+    is running await the same result instead of issuing their own LLM calls.
+    The entry is dropped as soon as the run finishes, so later requests
+    always start a fresh analysis.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+
+            def _finished(done: asyncio.Future[dict[str, Any]]) -> None:
+                self._inflight.pop(key, None)
+                if not done.cancelled():
+                    done.exception()  # mark retrieved if every waiter went away
+
+            future.add_done_callback(_finished)
+
+        # Shield so one disconnecting client does not cancel the shared run
+        return await asyncio.shield(future)
+
+
+_IMPACT_COALESCER = _ImpactCoalescer()
+
+
+def _impact_request_key(
+    change_order: ChangeOrder,
+    schedule_data: dict[str, Any],
+    bom_data: dict[str, Any],
+) -> str:
+    """Return a digest identifying the inputs of an impact analysis run."""
+    payload = json.dumps(
+        [
+            change_order.id,
+            str(change_order.type),
+            change_order.title,
+            change_order.description,
+            change_order.change_details,
+            schedule_data,
+            bom_data,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+async def _load_order_with_schedule(
+    order_id: str,
+    *,
+    include_schedule: bool,
+) -> tuple[ChangeOrder | None, bytes | None]:
+    """Return the cached change order and, optionally, its raw schedule payload.
+
+    The schedule key is only known once the order has been read, so this is
+    a ``GET`` of the order followed by a ``GET`` of its schedule.  The
+    schedule may be zstd-compressed, so both reads use the binary client and
+    callers pass the schedule through ``decompress_payload``.
+    """
+    redis = get_binary_redis()
+    cached = await redis.get(f"{CHANGE_ORDER_CACHE_PREFIX}{order_id}")
+    if cached is None:
+        return None, None
+
+    change_order = ChangeOrder.model_validate_json(cached)
+    schedule_raw: bytes | None = None
+    if include_schedule and change_order.schedule_id:
+        schedule_raw = await redis.get(f"{SCHEDULE_CACHE_PREFIX}{change_order.schedule_id}")
+    return change_order, schedule_raw
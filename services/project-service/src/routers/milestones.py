@@ -9,24 +9,42 @@ be manually updated as work progresses on site.
 from __future__ import annotations
 
 from datetime import date
+from operator import attrgetter
 from typing import Annotated, Any
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from openlintel_shared.auth import get_current_user
-from openlintel_shared.redis_client import cache_get, cache_set
+from openlintel_shared.redis_client import (
+    cache_delete,
+    cache_get_compressed_json,
+    cache_hash_get,
+    cache_hash_get_all,
+    cache_hash_set,
+)
 
-from src.models.schedule import MilestoneStatus
+from src.models.schedule import Milestone, MilestoneStatus, Schedule
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/milestones", tags=["milestones"])
 
 SCHEDULE_CACHE_PREFIX = "schedule:"
+# Milestones live in their own hash (one field per milestone ID) so reads and
+# updates do not transfer the whole schedule.
+MILESTONES_CACHE_SUFFIX = ":milestones"
+# Cached Gantt export of the schedule; it embeds milestone state, so it is
+# dropped whenever a milestone changes.
+GANTT_CACHE_SUFFIX = ":gantt"
 SCHEDULE_CACHE_TTL = 3600 * 24  # 24 hours
 
+# Built once at import so the validation/serialisation schema is reused
+_MILESTONE_ADAPTER: TypeAdapter[Milestone] = TypeAdapter(Milestone)
+_MILESTONE_LIST_ADAPTER: TypeAdapter[list[Milestone]] = TypeAdapter(list[Milestone])
+_STATUS_VALUES: dict[MilestoneStatus, str] = {s: s.value for s in MilestoneStatus}
+
 
 # -- Request models ---------------------------------------------------------
 
@@ -70,22 +88,22 @@ async def list_milestones(
     schedule_id: str,
     user_id: Annotated[str, Depends(get_current_user)],
 ) -> MilestoneListResponse:
-    """Retrieve milestones from the cached schedule data."""
-    cached = await cache_get(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}")
+    """Retrieve milestones from the cached milestone hash."""
+    milestones = await _load_milestones(schedule_id)
 
-    if cached is None:
+    if milestones is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Schedule {schedule_id} not found",
         )
 
-    milestones = cached.get("milestones", [])
-
-    # Sort by target date
-    milestones_sorted = sorted(
-        milestones,
-        key=lambda m: m.get("target_date", "9999-12-31"),
-    )
+    # Validate the cached milestones in one call, then sort by target date.
+    # They are stored in target-date order (and updates cannot change the
+    # date), so this is normally a single linear pass confirming the order;
+    # it still guards hashes Redis has re-encoded without insertion order.
+    validated = _MILESTONE_LIST_ADAPTER.validate_python(list(milestones.values()))
+    validated.sort(key=attrgetter("target_date"))
+    milestones_sorted = _MILESTONE_LIST_ADAPTER.dump_python(validated, mode="json")
 
     return MilestoneListResponse(
         schedule_id=schedule_id,
@@ -116,26 +134,21 @@ async def update_milestone(
 ) -> MilestoneResponse:
     """Update a specific milestone within a schedule.
 
-    The schedule is loaded from cache, the milestone is updated, and the
-    modified schedule is written back to cache.
+    Only the milestone's field in the schedule's milestone hash is read and
+    written back; the rest of the schedule is not touched.
     """
-    cached = await cache_get(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}")
+    milestones_key = f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{MILESTONES_CACHE_SUFFIX}"
+    target_milestone: dict[str, Any] | None = await cache_hash_get(milestones_key, milestone_id)
 
-    if cached is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Schedule {schedule_id} not found",
-        )
-
-    milestones = cached.get("milestones", [])
-    target_milestone: dict[str, Any] | None = None
-    target_index: int = -1
-
-    for idx, ms in enumerate(milestones):
-        if ms.get("id") == milestone_id:
-            target_milestone = ms
-            target_index = idx
-            break
+    if target_milestone is None:
+        # Schedules cached before the milestone hash existed are migrated here
+        milestones = await _load_milestones(schedule_id)
+        if milestones is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Schedule {schedule_id} not found",
+            )
+        target_milestone = milestones.get(milestone_id)
 
     if target_milestone is None:
         raise HTTPException(
@@ -145,7 +158,7 @@ async def update_milestone(
 
     # Apply updates
     if request.status is not None:
-        target_milestone["status"] = request.status.value
+        target_milestone["status"] = _STATUS_VALUES[request.status]
     if request.actual_date is not None:
         target_milestone["actual_date"] = request.actual_date.isoformat()
     if request.name is not None:
@@ -153,14 +166,18 @@ async def update_milestone(
     if request.description is not None:
         target_milestone["description"] = request.description
 
-    # Write back to cache
-    milestones[target_index] = target_milestone
-    cached["milestones"] = milestones
-    await cache_set(
-        f"{SCHEDULE_CACHE_PREFIX}{schedule_id}",
-        cached,
+    # Validate the merged milestone before persisting it
+    target_milestone = _MILESTONE_ADAPTER.dump_python(
+        _MILESTONE_ADAPTER.validate_python(target_milestone), mode="json"
+    )
+
+    # Write back to cache and invalidate the Gantt export built from it
+    await cache_hash_set(
+        milestones_key,
+        {milestone_id: target_milestone},
         ttl=SCHEDULE_CACHE_TTL,
     )
+    await cache_delete(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{GANTT_CACHE_SUFFIX}")
 
     logger.info(
         "milestone_updated",
@@ -173,3 +190,32 @@ async def update_milestone(
         milestone=target_milestone,
         message=f"Milestone '{target_milestone.get('name')}' updated successfully.",
     )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _load_milestones(schedule_id: str) -> dict[str, dict[str, Any]] | None:
+    """Return the schedule's milestones keyed by ID, or ``None`` if it is unknown.
+
+    Reads the milestone hash.  If it is missing (schedules cached before the
+    hash was introduced, or still generating), the milestones are taken from
+    the full schedule and the hash is backfilled.
+    """
+    milestones_key = f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{MILESTONES_CACHE_SUFFIX}"
+    milestones: dict[str, dict[str, Any]] = await cache_hash_get_all(milestones_key)
+    if milestones:
+        return milestones
+
+    cached = await cache_get_compressed_json(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}")
+    if cached is None:
+        return None
+
+    schedule = Schedule.model_validate_json(cached)
+    ordered = sorted(schedule.milestones, key=attrgetter("target_date"))
+    dumped = _MILESTONE_LIST_ADAPTER.dump_python(ordered, mode="json")
+    milestones = {ms["id"]: ms for ms in dumped}
+    await cache_hash_set(milestones_key, milestones, ttl=SCHEDULE_CACHE_TTL)
+    return milestones
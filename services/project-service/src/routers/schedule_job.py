@@ -7,22 +7,40 @@ jobs table.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime, timezone
+from typing import Any
 
+import orjson
 import structlog
 from fastapi import APIRouter, BackgroundTasks, status
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from openlintel_shared.config import get_settings
 from openlintel_shared.db import get_session_factory
-from openlintel_shared.job_worker import update_job_status
+from openlintel_shared.ids import uuid7
+from openlintel_shared.job_worker import claim_job, update_job_status
 
 from src.agents.schedule_agent import ScheduleAgent
 
 logger = structlog.get_logger(__name__)
 
-router = APIRouter(prefix="/api/v1/schedules", tags=["schedules"])
+router = APIRouter(prefix="/api/v1/schedules", tags=["schedule-job"])
+
+
+# Rows fetched per server-side cursor batch when streaming project data
+_STREAM_BATCH_SIZE = 500
+
+# Schedule task batches at least this large are written with COPY
+_COPY_MIN_ROWS = 50
+
+# Schedule jobs run in the API process; cap how many run at once so a burst
+# of generate requests cannot starve the request handlers.
+_MAX_CONCURRENT_SCHEDULE_JOBS = 4
+_schedule_job_slots = asyncio.Semaphore(_MAX_CONCURRENT_SCHEDULE_JOBS)
 
 
 class ScheduleJobRequest(BaseModel):
@@ -33,133 +51,292 @@ class ScheduleJobRequest(BaseModel):
     user_id: str = ""
 
 
+# ---------------------------------------------------------------------------
+# Project data fetches
+# ---------------------------------------------------------------------------
+
+
+async def _fetch_project(
+    factory: async_sessionmaker[AsyncSession], project_id: str
+) -> dict[str, Any] | None:
+    """Return the project's id and name, or ``None`` if it does not exist."""
+    async with factory() as db:
+        result = await db.execute(
+            text("SELECT id, name FROM projects WHERE id = :pid"),
+            {"pid": project_id},
+        )
+        project = result.mappings().first()
+    return dict(project) if project else None
+
+
+async def _fetch_rooms(
+    factory: async_sessionmaker[AsyncSession], project_id: str
+) -> list[dict[str, Any]]:
+    """Return the project's rooms shaped as ScheduleAgent room inputs.
+
+    Rows are mapped straight into agent inputs as they stream in, without an
+    intermediate list of row dicts.
+    """
+    async with factory() as db:
+        result = await db.stream(
+            text(
+                "SELECT id, name, type, length_mm, width_mm, height_mm "
+                "FROM rooms WHERE project_id = :pid"
+            ).execution_options(yield_per=_STREAM_BATCH_SIZE),
+            {"pid": project_id},
+        )
+        return [
+            {
+                "id": r["id"],
+                "name": r["name"],
+                "type": r["type"],
+                "dimensions": {
+                    "length_mm": r["length_mm"] or 0,
+                    "width_mm": r["width_mm"] or 0,
+                    "height_mm": r["height_mm"] or 2700,
+                },
+            }
+            async for r in result.mappings()
+        ]
+
+
+async def _fetch_bom_items(
+    factory: async_sessionmaker[AsyncSession], project_id: str
+) -> list[dict[str, Any]]:
+    """Return the project's BOM items flattened across all BOM results.
+
+    Postgres unnests each result's ``items`` array and projects only the
+    fields ScheduleAgent reads (room, category, quantity), so rows arrive as
+    ready-made BOM items and the rest of each item is never transferred or
+    decoded.
+    """
+    async with factory() as db:
+        result = await db.stream(
+            text(
+                "SELECT dv.room_id, "
+                "COALESCE(item->>'category', 'general') AS category, "
+                "COALESCE(item->'quantity', '1'::jsonb) AS quantity "
+                "FROM bom_results br "
+                "JOIN design_variants dv ON dv.id = br.design_variant_id "
+                "JOIN rooms r ON r.id = dv.room_id "
+                "CROSS JOIN LATERAL jsonb_array_elements("
+                "CASE WHEN jsonb_typeof(br.items) = 'array' THEN br.items ELSE '[]'::jsonb END"
+                ") AS item "
+                "WHERE r.project_id = :pid"
+            ).execution_options(yield_per=_STREAM_BATCH_SIZE),
+            {"pid": project_id},
+        )
+        return [dict(r) async for r in result.mappings()]
+
+
+async def _fetch_design_variants(
+    factory: async_sessionmaker[AsyncSession], project_id: str
+) -> list[dict[str, Any]]:
+    """Return the design variants of every room in the project."""
+    async with factory() as db:
+        result = await db.stream(
+            text(
+                "SELECT dv.id, dv.room_id, dv.style, dv.budget_tier, dv.spec_json "
+                "FROM design_variants dv "
+                "JOIN rooms r ON r.id = dv.room_id "
+                "WHERE r.project_id = :pid"
+            ).execution_options(yield_per=_STREAM_BATCH_SIZE),
+            {"pid": project_id},
+        )
+        return [
+            {
+                "id": dv["id"],
+                "room_id": dv["room_id"],
+                "style": dv["style"],
+                "budget_tier": dv["budget_tier"],
+                "spec_json": dv["spec_json"] or {},
+            }
+            async for dv in result.mappings()
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+_SCHEDULE_TASK_COLUMNS = (
+    "schedule_id",
+    "task_id",
+    "start_date",
+    "end_date",
+    "on_critical_path",
+    "payload",
+)
+
+
+async def _insert_milestones(
+    db: AsyncSession,
+    schedule_id: str,
+    milestones: list[dict[str, Any]],
+    created_at: datetime,
+) -> None:
+    """Insert a schedule's milestones within the session's open transaction."""
+    rows = [
+        {
+            "id": ms.get("id", uuid7()),
+            "schedule_id": schedule_id,
+            "name": ms.get("name", "Milestone"),
+            "description": ms.get("description", ""),
+            "due_date": ms.get("target_date"),
+            "status": "pending",
+            "created_at": created_at,
+        }
+        for ms in milestones
+    ]
+
+    await db.execute(
+        text(
+            "INSERT INTO milestones (id, schedule_id, name, description, "
+            "due_date, status, created_at) "
+            "VALUES (:id, :schedule_id, :name, :description, "
+            ":due_date, :status, :created_at)"
+        ),
+        rows,
+    )
+
+
+async def _insert_schedule_tasks(
+    db: AsyncSession,
+    schedule_id: str,
+    tasks: list[dict[str, Any]],
+) -> None:
+    """Insert one ``schedule_tasks`` row per task within the open transaction.
+
+    Large batches are streamed with PostgreSQL ``COPY`` on the underlying
+    asyncpg connection; below ``_COPY_MIN_ROWS`` the COPY setup costs more
+    than it saves, so a single ``executemany`` INSERT is used instead.
+    """
+    if len(tasks) < _COPY_MIN_ROWS:
+        await db.execute(
+            text(
+                "INSERT INTO schedule_tasks (schedule_id, task_id, start_date, "
+                "end_date, on_critical_path, payload) "
+                "VALUES (:schedule_id, :task_id, :start_date, :end_date, "
+                ":on_critical_path, :payload)"
+            ).bindparams(bindparam("payload", type_=JSONB)),
+            [
+                {
+                    "schedule_id": schedule_id,
+                    "task_id": task["id"],
+                    "start_date": _parse_timestamp(task.get("start_date")),
+                    "end_date": _parse_timestamp(task.get("end_date")),
+                    "on_critical_path": bool(task.get("is_critical", False)),
+                    "payload": task,
+                }
+                for task in tasks
+            ],
+        )
+        return
+
+    # The connection's jsonb codec takes JSON text
+    records = [
+        (
+            schedule_id,
+            task["id"],
+            _parse_timestamp(task.get("start_date")),
+            _parse_timestamp(task.get("end_date")),
+            bool(task.get("is_critical", False)),
+            orjson.dumps(task).decode(),
+        )
+        for task in tasks
+    ]
+    await _copy_records(db, "schedule_tasks", _SCHEDULE_TASK_COLUMNS, records)
+
+
+async def _copy_records(
+    db: AsyncSession,
+    table: str,
+    columns: tuple[str, ...],
+    records: list[tuple[Any, ...]],
+) -> None:
+    """Bulk-load records with ``COPY`` on the session's asyncpg connection."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table, records=records, columns=columns
+    )
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    """Parse an ISO date/datetime string into a ``timestamp`` column value."""
+    return datetime.fromisoformat(value) if value else None
+
+
+# ---------------------------------------------------------------------------
+# Background job
+# ---------------------------------------------------------------------------
+
+
 async def _run_schedule_job(request: ScheduleJobRequest) -> None:
-    """Background task: fetch project data, run ScheduleAgent, persist results."""
+    """Background task: wait for a free job slot, then run the schedule job.
+
+    The slot is taken before a database session is opened, so queued jobs
+    hold no connections and stay ``pending`` in the jobs table meanwhile.
+    """
+    async with _schedule_job_slots:
+        await _execute_schedule_job(request)
+
+
+async def _execute_schedule_job(request: ScheduleJobRequest) -> None:
+    """Fetch project data, run ScheduleAgent, persist results."""
     factory = get_session_factory()
     async with factory() as db:
         try:
-            # Mark job as running
-            await update_job_status(db, request.job_id, "running", progress=5)
+            # Claim the job; a duplicate delivery of a job that is already
+            # running or finished is dropped here
+            if not await claim_job(db, request.job_id, progress=5):
+                return
 
-            # Fetch project data from DB
-            project_row = await db.execute(
-                text("SELECT id, name FROM projects WHERE id = :pid"),
-                {"pid": request.project_id},
+            # The four reads are independent, so run them concurrently on
+            # their own pooled sessions instead of serially on ``db``.
+            project, rooms, bom_items, design_variants = await asyncio.gather(
+                _fetch_project(factory, request.project_id),
+                _fetch_rooms(factory, request.project_id),
+                _fetch_bom_items(factory, request.project_id),
+                _fetch_design_variants(factory, request.project_id),
             )
-            project = project_row.mappings().first()
             if not project:
                 await update_job_status(
-                    db, request.job_id, "failed", error="Project not found"
+                    db, request.job_id, status="failed", error="Project not found"
                 )
                 return
 
-            # Fetch rooms
-            rooms_result = await db.execute(
-                text(
-                    "SELECT id, name, type, length_mm, width_mm, height_mm "
-                    "FROM rooms WHERE project_id = :pid"
-                ),
-                {"pid": request.project_id},
-            )
-            rooms = [dict(r) for r in rooms_result.mappings().all()]
-
             if not rooms:
                 await update_job_status(
-                    db, request.job_id, "failed", error="No rooms found in project"
+                    db, request.job_id, status="failed", error="No rooms found in project"
                 )
                 return
 
-            await update_job_status(db, request.job_id, "running", progress=15)
-
-            # Fetch BOM items (if any exist)
-            bom_result = await db.execute(
-                text(
-                    "SELECT br.items, dv.room_id "
-                    "FROM bom_results br "
-                    "JOIN design_variants dv ON dv.id = br.design_variant_id "
-                    "JOIN rooms r ON r.id = dv.room_id "
-                    "WHERE r.project_id = :pid"
-                ),
-                {"pid": request.project_id},
-            )
-            bom_rows = bom_result.mappings().all()
-
-            bom_items = []
-            for row in bom_rows:
-                items = row["items"] if isinstance(row["items"], list) else []
-                for item in items:
-                    bom_items.append(
-                        {
-                            "id": item.get("id", ""),
-                            "room_id": row["room_id"],
-                            "category": item.get("category", "general"),
-                            "name": item.get("name", ""),
-                            "quantity": item.get("quantity", 1),
-                            "unit": item.get("unit", "piece"),
-                        }
-                    )
-
-            # Fetch design variants
-            dv_result = await db.execute(
-                text(
-                    "SELECT id, room_id, style, budget_tier, spec_json "
-                    "FROM design_variants dv "
-                    "JOIN rooms r ON r.id = dv.room_id "
-                    "WHERE r.project_id = :pid"
-                ),
-                {"pid": request.project_id},
-            )
-            design_variants = [
-                {
-                    "id": dv["id"],
-                    "room_id": dv["room_id"],
-                    "style": dv["style"],
-                    "budget_tier": dv["budget_tier"],
-                    "spec_json": dv["spec_json"] or {},
-                }
-                for dv in dv_result.mappings().all()
-            ]
-
-            await update_job_status(db, request.job_id, "running", progress=25)
+            await update_job_status(db, request.job_id, status="running", progress=25)
 
             # Run the schedule agent
-            import uuid
-
-            schedule_id = str(uuid.uuid4())
-            room_inputs = [
-                {
-                    "id": r["id"],
-                    "name": r["name"],
-                    "type": r["type"],
-                    "dimensions": {
-                        "length_mm": r.get("length_mm") or 0,
-                        "width_mm": r.get("width_mm") or 0,
-                        "height_mm": r.get("height_mm") or 2700,
-                    },
-                }
-                for r in rooms
-            ]
+            schedule_id = uuid7()
 
             agent = ScheduleAgent()
             result = await agent.invoke(
                 schedule_id=schedule_id,
                 project_id=request.project_id,
                 project_name=project["name"],
-                rooms=room_inputs,
+                rooms=rooms,
                 bom_items=bom_items,
                 design_variants=design_variants,
                 start_date=date.today().isoformat(),
                 working_days_per_week=6,
             )
 
-            await update_job_status(db, request.job_id, "running", progress=80)
+            await update_job_status(db, request.job_id, status="running", progress=80)
 
             schedule_data = result.get("schedule_result", {})
             if not schedule_data:
                 await update_job_status(
                     db,
                     request.job_id,
-                    "failed",
+                    status="failed",
                     error=result.get("error", "No schedule result produced"),
                 )
                 return
@@ -177,56 +354,44 @@ async def _run_schedule_job(request: ScheduleJobRequest) -> None:
                     "start_date, end_date, metadata, created_at, updated_at) "
                     "VALUES (:id, :project_id, :job_id, :tasks, :critical_path, "
                     ":start_date, :end_date, :metadata, :created_at, :updated_at)"
+                ).bindparams(
+                    bindparam("tasks", type_=JSONB),
+                    bindparam("critical_path", type_=JSONB),
+                    bindparam("metadata", type_=JSONB),
                 ),
                 {
                     "id": schedule_id,
                     "project_id": request.project_id,
                     "job_id": request.job_id,
-                    "tasks": __import__("json").dumps(tasks_json),
-                    "critical_path": __import__("json").dumps(critical_path),
+                    "tasks": tasks_json,
+                    "critical_path": critical_path,
                     "start_date": start_date,
                     "end_date": end_date,
-                    "metadata": __import__("json").dumps(
-                        {
-                            "total_duration_days": schedule_data.get(
-                                "total_duration_days", 0
-                            ),
-                            "room_count": len(rooms),
-                        }
-                    ),
+                    "metadata": {
+                        "total_duration_days": schedule_data.get(
+                            "total_duration_days", 0
+                        ),
+                        "room_count": len(rooms),
+                    },
                     "created_at": now,
                     "updated_at": now,
                 },
             )
+            # Per-task rows commit atomically with the schedule row
+            if tasks_json:
+                await _insert_schedule_tasks(db, schedule_id, tasks_json)
             await db.commit()
 
             # Persist milestones
             milestones = schedule_data.get("milestones", [])
-            for ms in milestones:
-                ms_id = ms.get("id", str(uuid.uuid4()))
-                await db.execute(
-                    text(
-                        "INSERT INTO milestones (id, schedule_id, name, description, "
-                        "due_date, status, created_at) "
-                        "VALUES (:id, :schedule_id, :name, :description, "
-                        ":due_date, :status, :created_at)"
-                    ),
-                    {
-                        "id": ms_id,
-                        "schedule_id": schedule_id,
-                        "name": ms.get("name", "Milestone"),
-                        "description": ms.get("description", ""),
-                        "due_date": ms.get("target_date"),
-                        "status": "pending",
-                        "created_at": now,
-                    },
-                )
-            await db.commit()
+            if milestones:
+                await _insert_milestones(db, schedule_id, milestones, now)
+                await db.commit()
 
             await update_job_status(
                 db,
                 request.job_id,
-                "completed",
+                status="completed",
                 progress=100,
                 output_json={
                     "schedule_id": schedule_id,
@@ -253,7 +418,7 @@ async def _run_schedule_job(request: ScheduleJobRequest) -> None:
             )
             try:
                 await update_job_status(
-                    db, request.job_id, "failed", error=str(exc)[:500]
+                    db, request.job_id, status="failed", error=str(exc)[:500]
                 )
             except Exception:
                 pass
@@ -8,15 +8,27 @@ chart data.
 
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
+from operator import itemgetter
 from typing import Annotated, Any
 
+import orjson
 import structlog
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from redis.exceptions import WatchError
 
 from openlintel_shared.auth import get_current_user
 from openlintel_shared.config import Settings, get_settings
-from openlintel_shared.redis_client import cache_get, cache_set
+from openlintel_shared.redis_client import (
+    cache_get_compressed,
+    cache_get_compressed_json,
+    cache_hash_get_all,
+    cache_set,
+    compress_payload,
+    get_binary_redis,
+)
 
 from src.agents.schedule_agent import ScheduleAgent
 from src.models.schedule import (
@@ -32,6 +44,13 @@ logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/api/v1/schedules", tags=["schedules"])
 
 SCHEDULE_CACHE_PREFIX = "schedule:"
+# Milestones are also stored in a per-schedule hash (one field per milestone
+# ID) that the milestone endpoints read and update; it is authoritative for
+# milestone state once written.
+MILESTONES_CACHE_SUFFIX = ":milestones"
+# Gantt export of a completed schedule, built once and reused by GET polls.
+# Milestone updates delete it so the next read rebuilds it.
+GANTT_CACHE_SUFFIX = ":gantt"
 SCHEDULE_CACHE_TTL = 3600  # 1 hour
 
 
@@ -107,13 +126,16 @@ async def generate_schedule(
 async def get_schedule(
     schedule_id: str,
     user_id: Annotated[str, Depends(get_current_user)],
-) -> dict[str, Any]:
+) -> Response:
     """Return the schedule from cache.
 
     In production this would query the database; here we use Redis as
     the interim store while the schedule is being generated.
     """
-    cached = await cache_get(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}")
+    cached, gantt_data = await asyncio.gather(
+        _load_schedule(schedule_id),
+        cache_get_compressed(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{GANTT_CACHE_SUFFIX}"),
+    )
 
     if cached is None:
         raise HTTPException(
@@ -124,13 +146,11 @@ async def get_schedule(
     # If the schedule is complete, include Gantt export
     if cached.get("status") == ScheduleStatus.COMPLETE.value and "tasks" in cached:
         try:
-            schedule_model = Schedule(**cached)
-            gantt_data = export_gantt_json(schedule_model)
-            cached["gantt"] = gantt_data
+            cached["gantt"] = gantt_data or await _build_gantt(schedule_id, cached)
         except Exception:
             logger.warning("gantt_export_failed", schedule_id=schedule_id, exc_info=True)
 
-    return cached
+    return _json_response(cached)
 
 
 # ---------------------------------------------------------------------------
@@ -146,9 +166,18 @@ async def get_schedule(
 async def get_gantt(
     schedule_id: str,
     user_id: Annotated[str, Depends(get_current_user)],
-) -> dict[str, Any]:
-    """Export Gantt chart JSON for a completed schedule."""
-    cached = await cache_get(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}")
+) -> Response:
+    """Export Gantt chart JSON for a completed schedule.
+
+    A cached export is returned as the stored JSON bytes without decoding.
+    """
+    gantt_json = await cache_get_compressed_json(
+        f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{GANTT_CACHE_SUFFIX}"
+    )
+    if gantt_json is not None:
+        return Response(content=gantt_json, media_type="application/json")
+
+    cached = await _load_schedule(schedule_id)
 
     if cached is None:
         raise HTTPException(
@@ -163,8 +192,7 @@ async def get_gantt(
         )
 
     try:
-        schedule_model = Schedule(**cached)
-        return export_gantt_json(schedule_model)
+        return _json_response(await _build_gantt(schedule_id, cached))
     except Exception as exc:
         logger.error("gantt_export_error", schedule_id=schedule_id, error=str(exc))
         raise HTTPException(
@@ -210,11 +238,7 @@ async def _run_schedule_generation(
 
         schedule_data = result.get("schedule_result", {})
         if schedule_data:
-            await cache_set(
-                f"{SCHEDULE_CACHE_PREFIX}{schedule_id}",
-                schedule_data,
-                ttl=SCHEDULE_CACHE_TTL * 24,  # Keep for 24 hours
-            )
+            await _store_completed_schedule(schedule_id, schedule_data)
         else:
             await cache_set(
                 f"{SCHEDULE_CACHE_PREFIX}{schedule_id}",
@@ -250,3 +274,107 @@ async def _run_schedule_generation(
             },
             ttl=SCHEDULE_CACHE_TTL,
         )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _load_schedule(schedule_id: str) -> dict[str, Any] | None:
+    """Load a cached schedule with the latest milestone state applied.
+
+    Milestone updates are written only to the milestone hash, so its entries
+    replace the matching milestones of the full schedule payload.
+    """
+    cached, milestone_overrides = await asyncio.gather(
+        cache_get_compressed(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}"),
+        cache_hash_get_all(f"{SCHEDULE_CACHE_PREFIX}{schedule_id}{MILESTONES_CACHE_SUFFIX}"),
+    )
+    if cached is None or not milestone_overrides or "milestones" not in cached:
+        return cached
+
+    cached["milestones"] = [
+        milestone_overrides.get(ms.get("id"), ms) for ms in cached["milestones"]
+    ]
+    return cached
+
+
+async def _store_completed_schedule(schedule_id: str, schedule_data: dict[str, Any]) -> None:
+    """Write a completed schedule, its milestone hash and Gantt export together.
+
+    Full schedules and Gantt exports are large and repetitive, so they are
+    stored compressed; the small status placeholders stay plain JSON.  All
+    writes go out in one pipelined transaction on the binary client.
+    """
+    key = f"{SCHEDULE_CACHE_PREFIX}{schedule_id}"
+    milestones_key = f"{key}{MILESTONES_CACHE_SUFFIX}"
+    ttl = SCHEDULE_CACHE_TTL * 24  # Keep for 24 hours
+
+    # Precompute the Gantt export so polls do not rebuild it
+    try:
+        gantt_data: dict[str, Any] | None = export_gantt_json(Schedule(**schedule_data))
+    except Exception:
+        logger.warning("gantt_export_failed", schedule_id=schedule_id, exc_info=True)
+        gantt_data = None
+
+    # Insert milestones in target-date order (ISO dates sort as strings) so
+    # list reads find them already sorted
+    milestones = {
+        ms["id"]: json.dumps(ms, default=str)
+        for ms in sorted(schedule_data.get("milestones", []), key=itemgetter("target_date"))
+    }
+
+    async with get_binary_redis().pipeline(transaction=True) as pipe:
+        pipe.set(key, compress_payload(schedule_data), ex=ttl)
+        if milestones:
+            pipe.hset(milestones_key, mapping=milestones)
+            pipe.expire(milestones_key, ttl)
+        if gantt_data is not None:
+            pipe.set(f"{key}{GANTT_CACHE_SUFFIX}", compress_payload(gantt_data), ex=ttl)
+        await pipe.execute()
+
+
+def _json_response(data: dict[str, Any]) -> Response:
+    """Serialise a schedule or Gantt payload with ``orjson``.
+
+    Gantt exports carry native ``date`` and enum values, which ``orjson``
+    encodes directly without FastAPI's ``jsonable_encoder`` pass.
+    """
+    return Response(content=orjson.dumps(data), media_type="application/json")
+
+
+async def _build_gantt(schedule_id: str, schedule_data: dict[str, Any]) -> dict[str, Any]:
+    """Export a completed schedule as Gantt JSON and cache the result.
+
+    ``update_milestone`` invalidates the cached export after writing the
+    milestone hash.  To avoid caching an export built from milestones that
+    changed after ``schedule_data`` was loaded, the hash is ``WATCH``ed and
+    compared with the loaded milestones before the write; if it differs or
+    changes before ``EXEC``, the export is returned without being cached.
+    """
+    gantt_data = export_gantt_json(Schedule(**schedule_data))
+
+    key = f"{SCHEDULE_CACHE_PREFIX}{schedule_id}"
+    milestones_key = f"{key}{MILESTONES_CACHE_SUFFIX}"
+    loaded = {ms.get("id"): ms for ms in schedule_data.get("milestones", [])}
+    try:
+        async with get_binary_redis().pipeline(transaction=True) as pipe:
+            await pipe.watch(milestones_key)
+            current = await pipe.hgetall(milestones_key)
+            if any(
+                loaded.get(field.decode()) != json.loads(value)
+                for field, value in current.items()
+            ):
+                logger.info("gantt_cache_write_skipped", schedule_id=schedule_id)
+                return gantt_data
+            pipe.multi()
+            pipe.set(
+                f"{key}{GANTT_CACHE_SUFFIX}",
+                compress_payload(gantt_data),
+                ex=SCHEDULE_CACHE_TTL * 24,
+            )
+            await pipe.execute()
+    except WatchError:
+        logger.info("gantt_cache_write_skipped", schedule_id=schedule_id)
+    return gantt_data
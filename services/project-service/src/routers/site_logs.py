@@ -8,15 +8,22 @@ construction site.
 
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime, timezone
-from typing import Annotated, Any
+from typing import Annotated
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
 
 from openlintel_shared.auth import get_current_user
-from openlintel_shared.redis_client import cache_get, cache_set
+from openlintel_shared.redis_client import (
+    cache_get,
+    cache_sorted_add,
+    cache_sorted_page,
+    get_redis,
+)
 
 from src.models.site_log import SiteLogCreate, SiteLogEntry, SiteLogListResponse
 
@@ -24,9 +31,15 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/site-logs", tags=["site-logs"])
 
-SITE_LOG_CACHE_PREFIX = "site_logs:"
+# Per-project sorted set of log entries, scored so that Redis returns them
+# newest ``log_date`` first (ties broken by ``created_at``).
+SITE_LOG_CACHE_PREFIX = "site_logs:by_date:"
 SITE_LOG_CACHE_TTL = 3600 * 24 * 7  # 7 days
 
+# Earlier releases stored each project's logs as one JSON array under this
+# prefix; it is migrated into the sorted set on first access.
+LEGACY_SITE_LOG_CACHE_PREFIX = "site_logs:"
+
 
 # ---------------------------------------------------------------------------
 # POST /api/v1/site-logs — Create a site log entry
@@ -72,24 +85,23 @@ async def create_site_log(
         created_at=now,
     )
 
-    # Store in a per-project list in Redis
-    cache_key = f"{SITE_LOG_CACHE_PREFIX}{request.project_id}"
-    existing_logs = await cache_get(cache_key)
-    if existing_logs is None:
-        existing_logs = []
-    if not isinstance(existing_logs, list):
-        existing_logs = []
-
-    existing_logs.append(entry.model_dump(mode="json"))
-
-    await cache_set(cache_key, existing_logs, ttl=SITE_LOG_CACHE_TTL)
+    # Add to the per-project sorted set in Redis, carrying over any logs
+    # still in the legacy list first
+    if not await get_redis().exists(f"{SITE_LOG_CACHE_PREFIX}{request.project_id}"):
+        await _migrate_legacy_logs(request.project_id)
+    await cache_sorted_add(
+        f"{SITE_LOG_CACHE_PREFIX}{request.project_id}",
+        entry.model_dump(mode="json"),
+        _log_score(entry),
+        ttl=SITE_LOG_CACHE_TTL,
+    )
 
     logger.info(
         "site_log_created",
         log_id=log_id,
         project_id=request.project_id,
         log_date=request.log_date.isoformat(),
-        severity=request.severity.value,
+        severity=str(request.severity),
     )
 
     return entry
@@ -114,29 +126,66 @@ async def list_site_logs(
 ) -> SiteLogListResponse:
     """Retrieve site log entries from cache for a project."""
     cache_key = f"{SITE_LOG_CACHE_PREFIX}{project_id}"
-    logs = await cache_get(cache_key)
-
-    if logs is None:
-        logs = []
-    if not isinstance(logs, list):
-        logs = []
-
-    # Sort by log_date descending, then by created_at descending
-    sorted_logs = sorted(
-        logs,
-        key=lambda entry: (
-            entry.get("log_date", "0000-00-00"),
-            entry.get("created_at", ""),
-        ),
-        reverse=True,
-    )
-
-    # Apply pagination
-    total = len(sorted_logs)
-    paginated = sorted_logs[offset : offset + limit]
+    total, members = await cache_sorted_page(cache_key, offset, limit)
+    if total == 0 and await _migrate_legacy_logs(project_id):
+        total, members = await cache_sorted_page(cache_key, offset, limit)
 
     return SiteLogListResponse(
         project_id=project_id,
         total=total,
-        logs=[SiteLogEntry(**log) for log in paginated],
+        logs=[SiteLogEntry.model_validate_json(member) for member in members],
     )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _log_score(entry: SiteLogEntry) -> int:
+    """Return the sorted-set score ordering entries by log date, then creation time.
+
+    The date's ordinal fills the high bits and the creation time in whole
+    seconds the low 32 bits; for dates before the year 2870 the result stays
+    below 2**53, so it is exact as a Redis double score.
+    """
+    created = int(entry.created_at.timestamp()) if entry.created_at else 0
+    return (entry.log_date.toordinal() << 32) | created
+
+
+async def _migrate_legacy_logs(project_id: str) -> bool:
+    """Move a project's logs from the legacy JSON array into its sorted set.
+
+    Each entry is validated and added with :func:`_log_score`, then the
+    legacy key is deleted, all in one transaction.  Concurrent migrations
+    add identical members, so running twice is harmless.
+
+    Returns
+    -------
+    bool
+        ``True`` if any entries were migrated.
+    """
+    legacy_key = f"{LEGACY_SITE_LOG_CACHE_PREFIX}{project_id}"
+    legacy = await cache_get(legacy_key)
+    if legacy is None:
+        return False
+
+    members: dict[str, int] = {}
+    for raw in legacy if isinstance(legacy, list) else []:
+        try:
+            entry = SiteLogEntry.model_validate(raw)
+        except ValidationError:
+            logger.warning("site_log_migration_entry_skipped", project_id=project_id)
+            continue
+        members[json.dumps(entry.model_dump(mode="json"), default=str)] = _log_score(entry)
+
+    cache_key = f"{SITE_LOG_CACHE_PREFIX}{project_id}"
+    async with get_redis().pipeline(transaction=True) as pipe:
+        if members:
+            pipe.zadd(cache_key, members)
+            pipe.expire(cache_key, SITE_LOG_CACHE_TTL)
+        pipe.delete(legacy_key)
+        await pipe.execute()
+
+    logger.info("site_logs_migrated", project_id=project_id, count=len(members))
+    return bool(members)
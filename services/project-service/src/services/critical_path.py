@@ -1,18 +1,23 @@
 """
-Critical path calculation using OR-Tools.
+Critical path calculation.
 
 Computes the longest (critical) path through a directed acyclic graph of
 schedule tasks, identifying which tasks determine the minimum total project
 duration and cannot be delayed without extending the end date.
+
+With only precedence and lag constraints the problem is solved exactly by
+the classic CPM forward/backward pass, compiled with Numba.  The OR-Tools
+CP-SAT model is kept behind ``use_solver`` for variants that add resource
+constraints.
 """
 
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import Any
 
+import numpy as np
 import structlog
-from ortools.sat.python import cp_model
+from numba import njit
 
 logger = structlog.get_logger(__name__)
 
@@ -29,6 +34,7 @@ class CriticalPathResult:
         task_float: dict[str, int],
     ) -> None:
         self.critical_path_ids = critical_path_ids
+        self.critical_path_idset: frozenset[str] = frozenset(critical_path_ids)
         self.total_duration = total_duration
         self.task_earliest_start = task_earliest_start
         self.task_latest_start = task_latest_start
@@ -38,11 +44,14 @@ class CriticalPathResult:
 def compute_critical_path(
     tasks: list[dict[str, Any]],
     dependencies: list[dict[str, Any]],
+    *,
+    use_solver: bool = False,
 ) -> CriticalPathResult:
     """Compute the critical path through a task dependency graph.
 
-    Uses OR-Tools CP-SAT solver to find the optimal (minimum makespan) schedule,
-    then identifies zero-float tasks that form the critical path.
+    Runs the CPM forward/backward pass, which is exact and O(V + E) for
+    precedence-only schedules, then identifies zero-float tasks that form the
+    critical path.
 
     Parameters
     ----------
@@ -51,6 +60,10 @@ def compute_critical_path(
     dependencies:
         List of dependency dicts with ``from_task_id``, ``to_task_id``, and
         optional ``lag_days``.
+    use_solver:
+        Solve the minimum-makespan model with OR-Tools CP-SAT instead.  Only
+        worthwhile once resource constraints are modelled; falls back to the
+        CPM pass if the solver finds no solution.
 
     Returns
     -------
@@ -67,53 +80,197 @@ def compute_critical_path(
             task_float={},
         )
 
+    if not dependencies and not use_solver:
+        result = _independent_critical_path(tasks)
+    else:
+        # Read each dependency dict once; everything downstream works on tuples
+        edges = [
+            (dep["from_task_id"], dep["to_task_id"], dep.get("lag_days", 0))
+            for dep in dependencies
+        ]
+        graph = _build_adjacency(tasks, edges)
+        if use_solver:
+            return _solver_critical_path(graph)
+        result = _cpm_critical_path(graph)
+
+    logger.info(
+        "critical_path_computed",
+        total_duration=result.total_duration,
+        critical_task_count=len(result.critical_path_ids),
+        solver_status="CPM",
+    )
+    return result
+
+
+def _independent_critical_path(tasks: list[dict[str, Any]]) -> CriticalPathResult:
+    """Critical path of tasks without dependencies.
+
+    Every task starts on day 0, so the project lasts as long as the longest
+    task, a task's float is the difference to that, and the longest tasks
+    are critical.  Skips building the graph entirely.
+    """
+    durations = {t["id"]: t.get("duration_days", 1) for t in tasks}
+    total_duration = max(durations.values())
+    latest_start = {tid: total_duration - duration for tid, duration in durations.items()}
+    return CriticalPathResult(
+        critical_path_ids=[tid for tid, late in latest_start.items() if late <= 0],
+        total_duration=total_duration,
+        task_earliest_start=dict.fromkeys(durations, 0),
+        task_latest_start=latest_start,
+        task_float={tid: max(0, late) for tid, late in latest_start.items()},
+    )
+
+
+class _TaskGraph:
+    """Dependency graph over contiguous task indices, shared by both passes."""
+
+    def __init__(
+        self,
+        task_ids: list[str],
+        durations: np.ndarray,
+        src: np.ndarray,
+        dst: np.ndarray,
+        lags: np.ndarray,
+    ) -> None:
+        n = len(task_ids)
+        self.task_ids = task_ids
+        self.durations = durations
+        self.src = src
+        self.dst = dst
+        self.lags = lags
+        self.succ_offsets, self.succ_ids, self.succ_lags = _build_csr(n, src, dst, lags)
+        self.pred_offsets, self.pred_ids, self.pred_lags = _build_csr(n, dst, src, lags)
+
+    def run_cpm(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """Run :func:`_cpm_kernel`; returns ``(order, es, ls, total_duration)``."""
+        return _cpm_kernel(
+            self.durations,
+            self.pred_offsets,
+            self.pred_ids,
+            self.pred_lags,
+            self.succ_offsets,
+            self.succ_ids,
+            self.succ_lags,
+        )
+
+    def result(
+        self,
+        order: list[int],
+        earliest_start: list[int],
+        latest_start: list[int],
+        total_duration: int,
+    ) -> CriticalPathResult:
+        """Map index-based starts back to task IDs; zero-float tasks are critical."""
+        task_ids = self.task_ids
+        task_float = {
+            tid: max(0, late - early)
+            for tid, early, late in zip(task_ids, earliest_start, latest_start, strict=True)
+        }
+        critical_ids = [task_ids[v] for v in order if latest_start[v] - earliest_start[v] <= 0]
+        return CriticalPathResult(
+            critical_path_ids=critical_ids,
+            total_duration=int(total_duration),
+            task_earliest_start=dict(zip(task_ids, earliest_start, strict=True)),
+            task_latest_start=dict(zip(task_ids, latest_start, strict=True)),
+            task_float=task_float,
+        )
+
+
+def _build_adjacency(
+    tasks: list[dict[str, Any]],
+    dependencies: list[tuple[str, str, int]],
+) -> _TaskGraph:
+    """Index tasks and dependencies once for the CPM pass and the solver.
+
+    ``dependencies`` are normalised ``(from_task_id, to_task_id, lag_days)``
+    tuples.  Task IDs are mapped to contiguous integer indices and
+    dependencies on unknown tasks are dropped; successor and predecessor
+    adjacency are stored as CSR-style int32 offset/target/lag arrays.
+    """
     task_map: dict[str, dict[str, Any]] = {t["id"]: t for t in tasks}
     task_ids = list(task_map.keys())
+    index = {tid: idx for idx, tid in enumerate(task_ids)}
+    durations = np.fromiter(
+        (task_map[tid].get("duration_days", 1) for tid in task_ids),
+        dtype=np.int32,
+        count=len(task_ids),
+    )
+
+    edges = [
+        (from_idx, to_idx, lag)
+        for from_id, to_id, lag in dependencies
+        if (from_idx := index.get(from_id)) is not None
+        and (to_idx := index.get(to_id)) is not None
+    ]
+
+    edge_array = np.array(edges, dtype=np.int32).reshape(-1, 3)
+    return _TaskGraph(
+        task_ids,
+        durations,
+        np.ascontiguousarray(edge_array[:, 0]),
+        np.ascontiguousarray(edge_array[:, 1]),
+        np.ascontiguousarray(edge_array[:, 2]),
+    )
+
+
+def _solver_critical_path(graph: _TaskGraph) -> CriticalPathResult:
+    """Minimum-makespan critical path using the OR-Tools CP-SAT solver."""
+    from ortools.sat.python import cp_model
+
+    task_ids = graph.task_ids
+    durations: list[int] = graph.durations.tolist()
 
-    # Build adjacency: successor list and predecessor list
-    successors: dict[str, list[tuple[str, int]]] = defaultdict(list)
-    predecessors: dict[str, list[tuple[str, int]]] = defaultdict(list)
-    for dep in dependencies:
-        from_id = dep["from_task_id"]
-        to_id = dep["to_task_id"]
-        lag = dep.get("lag_days", 0)
-        if from_id in task_map and to_id in task_map:
-            successors[from_id].append((to_id, lag))
-            predecessors[to_id].append((from_id, lag))
+    # The precedence-only CPM schedule bounds the model and seeds the hint
+    cpm_order, cpm_es, cpm_ls, cpm_total = graph.run_cpm()
+    order: list[int] = cpm_order.tolist()
+    cpm_starts: list[int] = cpm_es.tolist()
 
-    # Maximum possible horizon (sum of all durations)
-    horizon = sum(t.get("duration_days", 1) for t in tasks)
+    # With precedence constraints only, the CPM makespan is an exact
+    # horizon and each task's start lies in its CPM window [ES, LS].
+    # Resource constraints would need slack added to the latest starts.
+    horizon = max(int(cpm_total), 0)
+    cpm_latest: list[int] = cpm_ls.tolist()
 
     model = cp_model.CpModel()
 
     # Decision variables: start time for each task
-    start_vars: dict[str, cp_model.IntVar] = {}
-    end_vars: dict[str, cp_model.IntVar] = {}
-    for tid in task_ids:
-        duration = task_map[tid].get("duration_days", 1)
-        start_vars[tid] = model.new_int_var(0, horizon, f"start_{tid}")
-        end_vars[tid] = model.new_int_var(0, horizon, f"end_{tid}")
-        model.add(end_vars[tid] == start_vars[tid] + duration)
-
-    # Precedence constraints
-    for dep in dependencies:
-        from_id = dep["from_task_id"]
-        to_id = dep["to_task_id"]
-        lag = dep.get("lag_days", 0)
-        if from_id in task_map and to_id in task_map:
-            # Successor cannot start until predecessor finishes + lag
-            model.add(start_vars[to_id] >= end_vars[from_id] + lag)
+    start_vars: list[cp_model.IntVar] = []
+    end_vars: list[cp_model.IntVar] = []
+    for tid, duration, earliest, latest in zip(
+        task_ids, durations, cpm_starts, cpm_latest, strict=True
+    ):
+        lower = max(earliest, 0)
+        upper = max(latest, lower)
+        start_var = model.new_int_var(lower, upper, f"start_{tid}")
+        end_var = model.new_int_var(lower + duration, upper + duration, f"end_{tid}")
+        model.add(end_var == start_var + duration)
+        start_vars.append(start_var)
+        end_vars.append(end_var)
+
+    # Precedence constraints: successor cannot start until predecessor
+    # finishes + lag
+    for from_idx, to_idx, lag in zip(
+        graph.src.tolist(), graph.dst.tolist(), graph.lags.tolist(), strict=True
+    ):
+        model.add(start_vars[to_idx] >= end_vars[from_idx] + lag)
 
     # Makespan variable: maximum of all end times
     makespan = model.new_int_var(0, horizon, "makespan")
-    for tid in task_ids:
-        model.add(makespan >= end_vars[tid])
+    for end_var in end_vars:
+        model.add(makespan >= end_var)
 
     # Minimise makespan
     model.minimize(makespan)
 
+    # Warm start from the CPM pass: without resource constraints the hint is
+    # already optimal and the solver only has to prove it
+    for start_var, start in zip(start_vars, cpm_starts, strict=True):
+        model.add_hint(start_var, start)
+    model.add_hint(makespan, int(cpm_total))
+
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 30.0
+    solver.parameters.num_workers = 8
     status = solver.solve(model)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
@@ -121,157 +278,135 @@ def compute_critical_path(
             "critical_path_solver_failed",
             status=solver.status_name(status),
         )
-        # Fallback: forward pass without solver
-        return _fallback_critical_path(tasks, dependencies)
+        # Fallback: the CPM pass already computed for the hint
+        return graph.result(order, cpm_starts, cpm_latest, cpm_total)
 
     total_duration = solver.value(makespan)
 
     # Extract earliest starts from the optimised schedule
-    earliest_start: dict[str, int] = {}
-    for tid in task_ids:
-        earliest_start[tid] = solver.value(start_vars[tid])
-
-    # Compute latest start via backward pass
-    latest_start: dict[str, int] = {}
-    for tid in task_ids:
-        duration = task_map[tid].get("duration_days", 1)
-        if not successors[tid]:
-            # Terminal tasks: latest start = total_duration - duration
-            latest_start[tid] = total_duration - duration
-        else:
-            latest_start[tid] = total_duration  # Will be refined below
-
-    # Backward pass: topological reverse order
-    topo_order = _topological_sort(task_ids, predecessors)
-    for tid in reversed(topo_order):
-        duration = task_map[tid].get("duration_days", 1)
-        if successors[tid]:
-            min_successor_ls = min(
-                latest_start.get(succ_id, total_duration) - lag
-                for succ_id, lag in successors[tid]
-            )
-            latest_start[tid] = min(latest_start[tid], min_successor_ls - duration)
-
-    # Float = latest_start - earliest_start
-    task_float: dict[str, int] = {}
-    for tid in task_ids:
-        task_float[tid] = max(0, latest_start[tid] - earliest_start[tid])
-
-    # Critical path: tasks with zero float, in topological order
-    critical_ids = [tid for tid in topo_order if task_float[tid] == 0]
-
+    earliest_start = [solver.value(start_var) for start_var in start_vars]
+
+    # Backward pass in reverse topological order against the solved makespan
+    succ_offsets: list[int] = graph.succ_offsets.tolist()
+    succ_ids: list[int] = graph.succ_ids.tolist()
+    succ_lags: list[int] = graph.succ_lags.tolist()
+    latest_start = [total_duration] * len(task_ids)
+    for v in reversed(order):
+        finish = total_duration
+        for k in range(succ_offsets[v], succ_offsets[v + 1]):
+            finish = min(finish, latest_start[succ_ids[k]] - succ_lags[k])
+        latest_start[v] = finish - durations[v]
+
+    result = graph.result(order, earliest_start, latest_start, total_duration)
     logger.info(
         "critical_path_computed",
         total_duration=total_duration,
-        critical_task_count=len(critical_ids),
+        critical_task_count=len(result.critical_path_ids),
         solver_status=solver.status_name(status),
     )
-
-    return CriticalPathResult(
-        critical_path_ids=critical_ids,
-        total_duration=total_duration,
-        task_earliest_start=earliest_start,
-        task_latest_start=latest_start,
-        task_float=task_float,
-    )
+    return result
 
 
-def _topological_sort(
-    task_ids: list[str],
-    predecessors: dict[str, list[tuple[str, int]]],
-) -> list[str]:
-    """Return a topological ordering of task IDs using Kahn's algorithm."""
-    in_degree: dict[str, int] = {tid: 0 for tid in task_ids}
-    adj: dict[str, list[str]] = defaultdict(list)
-
-    for tid, preds in predecessors.items():
-        for pred_id, _ in preds:
-            if pred_id in in_degree and tid in in_degree:
-                adj[pred_id].append(tid)
-                in_degree[tid] += 1
-
-    queue: list[str] = [tid for tid in task_ids if in_degree[tid] == 0]
-    result: list[str] = []
-
-    while queue:
-        # Stable sort: pick the first available
-        node = queue.pop(0)
-        result.append(node)
-        for neighbor in adj[node]:
-            in_degree[neighbor] -= 1
-            if in_degree[neighbor] == 0:
-                queue.append(neighbor)
-
-    # If not all nodes are in result, there is a cycle; append remaining
-    remaining = [tid for tid in task_ids if tid not in set(result)]
-    result.extend(remaining)
+def _cpm_critical_path(graph: _TaskGraph) -> CriticalPathResult:
+    """Critical path via the classic CPM forward/backward pass.
 
-    return result
+    :func:`_cpm_kernel` sweeps the graph's CSR arrays in compiled code.
+    """
+    order, es, ls, total_duration = graph.run_cpm()
+    return graph.result(order.tolist(), es.tolist(), ls.tolist(), total_duration)
 
 
-def _fallback_critical_path(
-    tasks: list[dict[str, Any]],
-    dependencies: list[dict[str, Any]],
-) -> CriticalPathResult:
-    """Simple forward-pass critical path when OR-Tools solver fails.
+def _build_csr(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    lags: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build CSR adjacency ``(offsets, targets, lags)`` from parallel edge arrays.
 
-    Uses the classic CPM forward/backward pass algorithm without the solver.
+    The neighbours of node ``v`` are ``targets[offsets[v]:offsets[v + 1]]``,
+    in edge order.  Swapping ``src`` and ``dst`` lists predecessors instead
+    of successors.
     """
-    task_map: dict[str, dict[str, Any]] = {t["id"]: t for t in tasks}
-    task_ids = list(task_map.keys())
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    order = np.argsort(src, kind="stable")
+    return (
+        offsets,
+        np.ascontiguousarray(dst[order]),
+        np.ascontiguousarray(lags[order]),
+    )
 
-    successors: dict[str, list[tuple[str, int]]] = defaultdict(list)
-    predecessors: dict[str, list[tuple[str, int]]] = defaultdict(list)
-    for dep in dependencies:
-        from_id = dep["from_task_id"]
-        to_id = dep["to_task_id"]
-        lag = dep.get("lag_days", 0)
-        if from_id in task_map and to_id in task_map:
-            successors[from_id].append((to_id, lag))
-            predecessors[to_id].append((from_id, lag))
 
-    topo = _topological_sort(task_ids, predecessors)
+@njit(cache=True, nogil=True)
+def _cpm_kernel(
+    durations: np.ndarray,
+    pred_offsets: np.ndarray,
+    pred_ids: np.ndarray,
+    pred_lags: np.ndarray,
+    succ_offsets: np.ndarray,
+    succ_ids: np.ndarray,
+    succ_lags: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Kahn topological sort plus CPM forward/backward pass over CSR arrays.
+
+    Returns ``(order, earliest_start, latest_start, total_duration)``.  Tasks
+    on a cycle are appended to ``order`` in index order.  Compiled with
+    ``nogil`` so concurrent threads can run it in parallel.
+    """
+    n = durations.shape[0]
+
+    # Kahn's algorithm; ``order`` doubles as the FIFO queue.
+    in_degree = np.empty(n, dtype=np.int32)
+    order = np.empty(n, dtype=np.int32)
+    tail = 0
+    for v in range(n):
+        in_degree[v] = pred_offsets[v + 1] - pred_offsets[v]
+        if in_degree[v] == 0:
+            order[tail] = v
+            tail += 1
+    head = 0
+    while head < tail:
+        u = order[head]
+        head += 1
+        for k in range(succ_offsets[u], succ_offsets[u + 1]):
+            v = succ_ids[k]
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                order[tail] = v
+                tail += 1
+    if tail < n:
+        # Cycle: append the unsorted tasks in their original order
+        for v in range(n):
+            if in_degree[v] > 0:
+                order[tail] = v
+                tail += 1
 
     # Forward pass: earliest start / earliest finish
-    es: dict[str, int] = {}
-    ef: dict[str, int] = {}
-    for tid in topo:
-        duration = task_map[tid].get("duration_days", 1)
-        if not predecessors[tid]:
-            es[tid] = 0
-        else:
-            es[tid] = max(
-                ef.get(pred_id, 0) + lag
-                for pred_id, lag in predecessors[tid]
-            )
-        ef[tid] = es[tid] + duration
-
-    total_duration = max(ef.values()) if ef else 0
+    es = np.zeros(n, dtype=np.int64)
+    ef = np.zeros(n, dtype=np.int64)
+    total_duration = 0
+    for i in range(n):
+        v = order[i]
+        start = 0
+        for k in range(pred_offsets[v], pred_offsets[v + 1]):
+            candidate = ef[pred_ids[k]] + pred_lags[k]
+            if k == pred_offsets[v] or candidate > start:
+                start = candidate
+        es[v] = start
+        ef[v] = start + durations[v]
+        if i == 0 or ef[v] > total_duration:
+            total_duration = ef[v]
 
     # Backward pass: latest finish / latest start
-    lf: dict[str, int] = {}
-    ls: dict[str, int] = {}
-    for tid in reversed(topo):
-        duration = task_map[tid].get("duration_days", 1)
-        if not successors[tid]:
-            lf[tid] = total_duration
-        else:
-            lf[tid] = min(
-                ls.get(succ_id, total_duration) - lag
-                for succ_id, lag in successors[tid]
-            )
-        ls[tid] = lf[tid] - duration
-
-    task_float: dict[str, int] = {}
-    for tid in task_ids:
-        task_float[tid] = max(0, ls.get(tid, 0) - es.get(tid, 0))
-
-    critical_ids = [tid for tid in topo if task_float[tid] == 0]
-
-    return CriticalPathResult(
-        critical_path_ids=critical_ids,
-        total_duration=total_duration,
-        task_earliest_start=es,
-        task_latest_start=ls,
-        task_float=task_float,
-    )
+    ls = np.full(n, total_duration, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        v = order[i]
+        finish = total_duration
+        for k in range(succ_offsets[v], succ_offsets[v + 1]):
+            candidate = ls[succ_ids[k]] - succ_lags[k]
+            if k == succ_offsets[v] or candidate < finish:
+                finish = candidate
+        ls[v] = finish - durations[v]
+
+    return order, es, ls, total_duration
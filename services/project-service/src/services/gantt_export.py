@@ -7,6 +7,7 @@ Gantt chart rendering (e.g. with react-gantt-timeline or dhtmlx-gantt).
 
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import date, timedelta
 from typing import Any
 
@@ -16,6 +17,31 @@ from src.models.schedule import Milestone, Schedule, ScheduleTask, TaskDependenc
 
 logger = structlog.get_logger(__name__)
 
+# Progress fraction shown as the Gantt bar fill for each task status
+_STATUS_PROGRESS: dict[str, float] = {
+    "not_started": 0.0,
+    "in_progress": 0.5,
+    "completed": 1.0,
+    "delayed": 0.3,
+    "blocked": 0.0,
+}
+
+# Hex colour per trade, for consistent Gantt colouring
+_TRADE_COLORS: dict[str, str] = {
+    "demolition": "#EF4444",
+    "civil": "#F97316",
+    "plumbing_rough_in": "#3B82F6",
+    "electrical_rough_in": "#EAB308",
+    "false_ceiling": "#8B5CF6",
+    "flooring": "#10B981",
+    "carpentry": "#D97706",
+    "painting": "#EC4899",
+    "mep_fixtures": "#06B6D4",
+    "soft_furnishing": "#A855F7",
+    "cleanup": "#6B7280",
+}
+_DEFAULT_TRADE_COLOR = "#9CA3AF"
+
 
 class GanttBar(dict):
     """Dictionary representing a single bar in the Gantt chart."""
@@ -57,7 +83,9 @@ def export_gantt_json(schedule: Schedule) -> dict[str, Any]:
     Returns
     -------
     dict
-        JSON-serialisable Gantt chart data.
+        Gantt chart data.  Dates are left as :class:`~datetime.date` objects
+        and enums as :class:`~enum.StrEnum` members for ``orjson`` to
+        serialise natively.
     """
     project_start = schedule.start_date or date.today()
 
@@ -70,15 +98,15 @@ def export_gantt_json(schedule: Schedule) -> dict[str, Any]:
         "schedule_id": schedule.id,
         "project_id": schedule.project_id,
         "name": schedule.name,
-        "start_date": schedule.start_date.isoformat() if schedule.start_date else None,
-        "end_date": schedule.end_date.isoformat() if schedule.end_date else None,
+        "start_date": schedule.start_date,
+        "end_date": schedule.end_date,
         "total_duration_days": schedule.total_duration_days,
         "bars": bars,
         "links": links,
         "milestones": milestones,
         "critical_path": schedule.critical_path_task_ids,
         "trade_groups": trade_groups,
-        "status": schedule.status.value,
+        "status": schedule.status,
     }
 
 
@@ -88,6 +116,8 @@ def _build_bars(
 ) -> list[dict[str, Any]]:
     """Convert schedule tasks into Gantt bar dicts."""
     bars: list[dict[str, Any]] = []
+    status_progress = _STATUS_PROGRESS.get
+    trade_color = _TRADE_COLORS.get
 
     for task in tasks:
         start = task.start_date or project_start
@@ -97,16 +127,16 @@ def _build_bars(
             "id": task.id,
             "name": task.name,
             "description": task.description,
-            "trade": task.trade.value,
+            "trade": task.trade,
             "room_id": task.room_id,
-            "start": start.isoformat(),
-            "end": end.isoformat(),
+            "start": start,
+            "end": end,
             "duration_days": task.duration_days,
-            "status": task.status.value,
+            "status": task.status,
             "is_critical": task.is_critical,
             "depends_on": task.depends_on,
-            "progress": _status_to_progress(task.status.value),
-            "color": _trade_color(task.trade.value),
+            "progress": status_progress(task.status, 0.0),
+            "color": trade_color(task.trade, _DEFAULT_TRADE_COLOR),
             "estimated_cost": task.estimated_cost,
         }
         bars.append(bar)
@@ -140,10 +170,10 @@ def _build_milestones(milestones: list[Milestone]) -> list[dict[str, Any]]:
             "id": ms.id,
             "name": ms.name,
             "description": ms.description,
-            "target_date": ms.target_date.isoformat(),
-            "actual_date": ms.actual_date.isoformat() if ms.actual_date else None,
-            "status": ms.status.value,
-            "trade": ms.trade.value if ms.trade else None,
+            "target_date": ms.target_date,
+            "actual_date": ms.actual_date,
+            "status": ms.status,
+            "trade": ms.trade,
             "task_ids": ms.task_ids,
         }
         result.append(marker)
@@ -153,66 +183,31 @@ def _build_milestones(milestones: list[Milestone]) -> list[dict[str, Any]]:
 
 def _build_trade_groups(tasks: list[ScheduleTask]) -> list[dict[str, Any]]:
     """Group tasks by trade for collapsible Gantt sections."""
-    groups: dict[str, list[str]] = {}
-    trade_dates: dict[str, tuple[date | None, date | None]] = {}
+    groups: defaultdict[str, list[str]] = defaultdict(list)
+    # Running earliest start and latest end per trade
+    starts: dict[str, date] = {}
+    ends: dict[str, date] = {}
 
     for task in tasks:
-        trade = task.trade.value
-        if trade not in groups:
-            groups[trade] = []
-            trade_dates[trade] = (task.start_date, task.end_date)
+        trade = task.trade
         groups[trade].append(task.id)
-
-        # Track earliest start and latest end per trade
-        current_start, current_end = trade_dates[trade]
-        if task.start_date:
-            if current_start is None or task.start_date < current_start:
-                current_start = task.start_date
-        if task.end_date:
-            if current_end is None or task.end_date > current_end:
-                current_end = task.end_date
-        trade_dates[trade] = (current_start, current_end)
+        start = task.start_date
+        if start and (trade not in starts or start < starts[trade]):
+            starts[trade] = start
+        end = task.end_date
+        if end and (trade not in ends or end > ends[trade]):
+            ends[trade] = end
 
     result: list[dict[str, Any]] = []
+    trade_color = _TRADE_COLORS.get
     for trade, task_ids in groups.items():
-        start_dt, end_dt = trade_dates[trade]
         result.append({
             "trade": trade,
             "task_ids": task_ids,
             "task_count": len(task_ids),
-            "start_date": start_dt.isoformat() if start_dt else None,
-            "end_date": end_dt.isoformat() if end_dt else None,
-            "color": _trade_color(trade),
+            "start_date": starts.get(trade),
+            "end_date": ends.get(trade),
+            "color": trade_color(trade, _DEFAULT_TRADE_COLOR),
         })
 
     return result
-
-
-def _status_to_progress(status: str) -> float:
-    """Map a task status to a progress percentage for Gantt bar fill."""
-    mapping = {
-        "not_started": 0.0,
-        "in_progress": 0.5,
-        "completed": 1.0,
-        "delayed": 0.3,
-        "blocked": 0.0,
-    }
-    return mapping.get(status, 0.0)
-
-
-def _trade_color(trade: str) -> str:
-    """Return a hex colour for a given trade, for consistent Gantt colouring."""
-    colors: dict[str, str] = {
-        "demolition": "#EF4444",
-        "civil": "#F97316",
-        "plumbing_rough_in": "#3B82F6",
-        "electrical_rough_in": "#EAB308",
-        "false_ceiling": "#8B5CF6",
-        "flooring": "#10B981",
-        "carpentry": "#D97706",
-        "painting": "#EC4899",
-        "mep_fixtures": "#06B6D4",
-        "soft_furnishing": "#A855F7",
-        "cleanup": "#6B7280",
-    }
-    return colors.get(trade, "#9CA3AF")
@@ -33,6 +33,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("vision_engine_shutdown")
     await dispose_engine()
     await close_redis()
+    await reconstruction.close_http_session()
 
 
 app = FastAPI(
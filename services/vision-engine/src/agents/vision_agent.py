@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from collections.abc import AsyncIterator
+from functools import lru_cache
 from typing import Any
 
+import ijson
 import structlog
 from litellm import acompletion
 
@@ -42,16 +45,71 @@ Return ONLY valid JSON in this exact format:
 Be thorough — detect ALL rooms visible in the floor plan. If dimensions cannot be determined, use null for length_mm, width_mm, and area_sq_mm."""
 
 
-async def detect_rooms_from_image(
+@lru_cache(maxsize=256)
+def _decrypt_cached(encrypted_key: str, iv: str, auth_tag: str) -> str:
+    """Decrypt an API key once per process for each ciphertext.
+
+    Multi-page plans and repeated jobs reuse the same stored key, so this
+    skips the repeated AES-GCM setup and tag check.  It is a latency
+    optimisation only: the plaintext key is held in process memory for the
+    duration of every call anyway.
+    """
+    return decrypt_api_key(encrypted_key, iv, auth_tag)
+
+
+# Upper bound on simultaneous VLM requests from one batch, to stay clear of
+# provider rate limits (HTTP 429)
+MAX_CONCURRENT_VLM_CALLS = 8
+
+# Top-level response fields describing the image rather than a room
+_LAYOUT_FIELDS = frozenset({"width", "height", "scale"})
+
+
+class _CompletionReader:
+    """Async file-like view of a streamed completion's text, for ``ijson``."""
+
+    def __init__(self, response: AsyncIterator[Any]) -> None:
+        self._chunks = aiter(response)
+        self._pending = b""
+        self.received = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes of content, or ``b""`` at end of stream."""
+        if size == 0:
+            return b""
+        while not self._pending:
+            chunk = await anext(self._chunks, None)
+            if chunk is None:
+                return b""
+            content = chunk.choices[0].delta.content
+            if content:
+                self.received += len(content)
+                self._pending = content.encode()
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+async def iter_rooms_from_image(
     image_url: str,
     api_key_material: dict[str, str],
-) -> FloorPlanResult:
-    """Send a floor plan image to GPT-4o and parse the detected rooms."""
+    layout: dict[str, Any] | None = None,
+) -> AsyncIterator[RoomPolygon]:
+    """Stream a floor plan through GPT-4o and yield rooms as they are parsed.
+
+    The completion is streamed and fed through an incremental ``ijson``
+    parser, so each room is yielded as soon as its object closes while the
+    model is still generating the rest.  The top-level ``width``,
+    ``height`` and ``scale`` values are written into ``layout`` as they
+    arrive; they follow the rooms, so ``layout`` is complete only once
+    iteration finishes.
+    """
     # Decrypt the user's API key
-    decrypted_key = decrypt_api_key(
-        encrypted_key=api_key_material["encrypted_key"],
-        iv=api_key_material["iv"],
-        auth_tag=api_key_material["auth_tag"],
+    decrypted_key = _decrypt_cached(
+        api_key_material["encrypted_key"],
+        api_key_material["iv"],
+        api_key_material["auth_tag"],
     )
 
     logger.info("vision_agent_starting", image_url=image_url[:80])
@@ -72,36 +130,91 @@ async def detect_rooms_from_image(
         response_format={"type": "json_object"},
         temperature=0.1,
         max_tokens=4096,
+        stream=True,
     )
 
-    raw_content = response.choices[0].message.content
-    logger.info("vision_agent_response_received", length=len(raw_content or ""))
-
+    reader = _CompletionReader(response)
+    builder: ijson.ObjectBuilder | None = None
     try:
-        data = json.loads(raw_content)
-    except json.JSONDecodeError:
-        logger.error("vision_agent_json_parse_failed", content=raw_content[:200])
-        return FloorPlanResult(rooms=[], width=800, height=600, scale=1.0)
-
-    # Parse rooms
-    rooms: list[RoomPolygon] = []
-    for room_data in data.get("rooms", []):
-        try:
-            polygon = [Point(x=p["x"], y=p["y"]) for p in room_data.get("polygon", [])]
-            rooms.append(RoomPolygon(
-                name=room_data.get("name", "Unknown Room"),
-                type=room_data.get("type", "other"),
-                polygon=polygon,
-                length_mm=room_data.get("length_mm"),
-                width_mm=room_data.get("width_mm"),
-                area_sq_mm=room_data.get("area_sq_mm"),
-            ))
-        except Exception as exc:
-            logger.warning("vision_agent_room_parse_error", error=str(exc), room=room_data)
+        async for prefix, event, value in ijson.parse_async(reader, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "rooms.item" and event == "end_map":
+                    room = _parse_room(builder.value)
+                    builder = None
+                    if room is not None:
+                        yield room
+            elif prefix == "rooms.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif layout is not None and prefix in _LAYOUT_FIELDS and event == "number":
+                layout[prefix] = value
+    except ijson.JSONError:
+        logger.error("vision_agent_json_parse_failed", received=reader.received)
+
+    logger.info("vision_agent_response_received", length=reader.received)
+
+
+async def detect_rooms_from_image(
+    image_url: str,
+    api_key_material: dict[str, str],
+) -> FloorPlanResult:
+    """Send a floor plan image to GPT-4o and collect the detected rooms.
 
+    Non-streaming wrapper around :func:`iter_rooms_from_image` for callers
+    that need the complete result.
+    """
+    layout: dict[str, Any] = {}
+    rooms = [room async for room in iter_rooms_from_image(image_url, api_key_material, layout)]
     return FloorPlanResult(
         rooms=rooms,
-        width=data.get("width", 800),
-        height=data.get("height", 600),
-        scale=data.get("scale", 1.0),
+        width=layout.get("width", 800),
+        height=layout.get("height", 600),
+        scale=layout.get("scale", 1.0),
     )
+
+
+async def detect_rooms_batch(
+    image_urls: list[str],
+    api_key_material: dict[str, str],
+    concurrency: int = MAX_CONCURRENT_VLM_CALLS,
+) -> list[FloorPlanResult]:
+    """Detect rooms on several floor plan pages concurrently.
+
+    Pages are analysed in parallel with at most ``concurrency`` VLM calls in
+    flight, which keeps multi-page plans near the latency of a single call
+    without tripping provider rate limits.
+
+    Returns
+    -------
+    list[FloorPlanResult]
+        One result per image URL, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _guarded(image_url: str) -> FloorPlanResult:
+        async with semaphore:
+            return await detect_rooms_from_image(image_url, api_key_material)
+
+    return list(await asyncio.gather(*(_guarded(url) for url in image_urls)))
+
+
+def _parse_room(room_data: dict[str, Any]) -> RoomPolygon | None:
+    """Build a room from one parsed ``rooms`` entry, or ``None`` if malformed.
+
+    The entry is untrusted VLM output, so it is validated: non-numeric or
+    missing vertex coordinates and other bad fields reject the room here.
+    """
+    try:
+        polygon = [Point(x=p["x"], y=p["y"]) for p in room_data.get("polygon", [])]
+        return RoomPolygon(
+            name=room_data.get("name", "Unknown Room"),
+            type=room_data.get("type", "other"),
+            polygon=polygon,
+            length_mm=room_data.get("length_mm"),
+            width_mm=room_data.get("width_mm"),
+            area_sq_mm=room_data.get("area_sq_mm"),
+        )
+    except Exception as exc:
+        logger.warning("vision_agent_room_parse_error", error=str(exc), room=room_data)
+        return None
@@ -8,19 +8,32 @@ Generates a simple glTF mesh and stores it in MinIO.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import base64
+import hashlib
+import io
+import struct
 import uuid
+from collections.abc import AsyncIterator
+from functools import lru_cache
 from typing import Annotated, Any
 
+import aiohttp
+import numpy as np
+import orjson
 import structlog
 from fastapi import APIRouter, BackgroundTasks, Depends, status
+from litellm import acompletion
+from PIL import Image
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from openlintel_shared.config import Settings, get_settings
-from openlintel_shared.db import get_db_session, get_session_factory
-from openlintel_shared.job_worker import update_job_status, get_user_api_key
+from openlintel_shared.db import get_db_session, session_scope
+from openlintel_shared.job_worker import ProgressThrottler, get_user_api_key, update_job_status
+from openlintel_shared.redis_client import cache_get, cache_set
+from openlintel_shared.storage import upload_file
 
 logger = structlog.get_logger(__name__)
 
@@ -41,6 +54,39 @@ class ReconstructionJobInput(BaseModel):
     )
 
 
+# Upper bound on simultaneous image downloads per reconstruction job
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Image bodies are streamed in chunks of this size and capped in total
+DOWNLOAD_CHUNK_SIZE = 65536
+MAX_IMAGE_BYTES = 25 * 1024 * 1024  # 25 MB
+
+# Shared across jobs; see _get_http_session
+_http_session: aiohttp.ClientSession | None = None
+
+# VLM dimension estimates keyed by image SHA-256 and reference object; only
+# successful estimates are cached, never the fallback defaults
+VLM_DIMENSIONS_CACHE_PREFIX = "vlm:dims:"
+VLM_DIMENSIONS_CACHE_TTL = 86400  # 24 hours
+
+# Marks a room-box GLB per rounded (length, width, height) in mm as uploaded
+# under reconstruction/boxes/; identical boxes are shared between jobs
+GLB_UPLOAD_CACHE_PREFIX = "gltf:uploaded:"
+GLB_UPLOAD_CACHE_TTL = 7 * 86400  # 7 days
+
+# Output of completed reconstruction jobs keyed by a hash of the job inputs, so
+# repeat requests for the same room and photos complete without re-running
+RECONSTRUCTION_RESULT_CACHE_PREFIX = "reconstruction:result:"
+RECONSTRUCTION_RESULT_CACHE_TTL = 86400  # 24 hours
+
+# Photos analysed per reconstruction job; each is a separate concurrent VLM call
+MAX_VLM_IMAGES = 4
+
+# Photos sent to the VLM are downscaled to this longest edge and JPEG quality
+VLM_IMAGE_MAX_EDGE = 1024
+VLM_IMAGE_JPEG_QUALITY = 75
+_JPEG_DATA_URI_PREFIX = b"data:image/jpeg;base64,"
+
 # Reference object real-world sizes in mm
 REFERENCE_SIZES: dict[str, dict[str, float]] = {
     "door": {"width": 900, "height": 2100},
@@ -80,8 +126,26 @@ async def run_reconstruction_job(
     db: Annotated[AsyncSession, Depends(get_db_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> dict:
-    """Accept a reconstruction job and process in the background."""
+    """Accept a reconstruction job and process in the background.
+
+    If an identical job (same project, room, photos and reference object)
+    completed within ``RECONSTRUCTION_RESULT_CACHE_TTL``, its output is
+    reused and the job is completed immediately.
+    """
     try:
+        try:
+            cached_output = await cache_get(_reconstruction_cache_key(request))
+        except Exception:
+            logger.warning("reconstruction_result_cache_read_failed", exc_info=True)
+            cached_output = None
+        if cached_output is not None:
+            await update_job_status(
+                db, request.job_id, status="completed", progress=100,
+                output_json=cached_output,
+            )
+            logger.info("reconstruction_job_reused", job_id=request.job_id)
+            return {"status": "completed", "job_id": request.job_id}
+
         await update_job_status(db, request.job_id, status="running", progress=5)
 
         background_tasks.add_task(
@@ -104,191 +168,266 @@ async def _run_reconstruction(
     settings: Settings,
 ) -> None:
     """Background task: download images, estimate depth, extract dimensions."""
-    session_factory = get_session_factory()
-    async with session_factory() as db:
-        try:
-            await update_job_status(db, request.job_id, status="running", progress=10)
-
+    # Each DB touch gets its own short session so no pooled connection is
+    # held across downloads, VLM calls or the mesh upload.
+    throttler = ProgressThrottler(request.job_id)
+    try:
+        # Progress is written only at phase boundaries: downloads, VLM
+        # estimate, mesh, and the final result.
+        async with session_scope() as db:
             # Get user's API key for VLM calls
             api_key = await get_user_api_key(db, request.user_id, provider="openai")
 
-            await update_job_status(
-                db, request.job_id, status="running", progress=20,
+            await throttler.update(
+                db, status="running", progress=20,
                 output_json={"current_step": "Downloading images"},
             )
 
-            # Download images
-            import httpx
-
-            images_data: list[bytes] = []
-            async with httpx.AsyncClient(timeout=30) as client:
-                for url in request.image_urls[:10]:  # Limit to 10 images
-                    try:
-                        resp = await client.get(url)
-                        resp.raise_for_status()
-                        images_data.append(resp.content)
-                    except Exception as dl_exc:
-                        logger.warning("image_download_failed", url=url, error=str(dl_exc))
+        api_key_material = {
+            "encrypted_key": api_key["encrypted_key"],
+            "iv": api_key["iv"],
+            "auth_tag": api_key["auth_tag"],
+        } if api_key else None
+
+        # Download images, skipping repeated URLs.  Each of the first
+        # MAX_VLM_IMAGES photos is sent to the VLM as soon as it arrives, so
+        # the VLM calls overlap the remaining downloads.
+        image_urls = list(dict.fromkeys(request.image_urls))[:10]  # Limit to 10 images
+        system_prompt = _DIMENSION_SYSTEM_PROMPTS.get(
+            request.reference_object, _DIMENSION_SYSTEM_PROMPTS[None],
+        )
+        images_data: list[bytes] = []
+        estimates: list[asyncio.Task[dict[str, float]]] = []
+        try:
+            async for image in _iter_downloaded_images(image_urls):
+                images_data.append(image)
+                if len(estimates) < MAX_VLM_IMAGES:
+                    estimates.append(asyncio.create_task(_estimate_dimensions_one(
+                        image, system_prompt, request.reference_object, api_key_material,
+                    )))
 
             if not images_data:
-                await update_job_status(
-                    db, request.job_id, status="failed",
-                    error="No images could be downloaded",
-                )
+                async with session_scope() as db:
+                    await throttler.update(
+                        db, status="failed",
+                        error="No images could be downloaded",
+                    )
                 return
 
-            await update_job_status(
-                db, request.job_id, status="running", progress=40,
-                output_json={"current_step": "Estimating depth"},
-            )
-
-            # Use VLM to estimate room dimensions from photos
-            dimensions = await _estimate_dimensions_vlm(
-                images_data=images_data,
-                reference_object=request.reference_object,
-                api_key_material={
-                    "encrypted_key": api_key["encrypted_key"],
-                    "iv": api_key["iv"],
-                    "auth_tag": api_key["auth_tag"],
-                } if api_key else None,
-            )
+            async with session_scope() as db:
+                await throttler.update(
+                    db, status="running", progress=40,
+                    output_json={"current_step": "Estimating depth"},
+                )
 
-            await update_job_status(
-                db, request.job_id, status="running", progress=70,
+            # Combine the per-photo VLM estimates of the room dimensions
+            dimensions = await _estimate_dimensions_vlm(estimates)
+        finally:
+            # A failed download or progress write, or cancellation of this
+            # job, must not leave VLM calls running; done tasks ignore cancel()
+            for estimate in estimates:
+                estimate.cancel()
+
+        async with session_scope() as db:
+            await throttler.update(
+                db, status="running", progress=70,
                 output_json={"current_step": "Generating 3D mesh"},
             )
 
-            # Generate simple glTF mesh from dimensions
-            length_mm = dimensions.get("length_mm", 4000)
-            width_mm = dimensions.get("width_mm", 3000)
-            height_mm = dimensions.get("height_mm", 2700)
-
-            mesh_key: str | None = None
-            try:
-                mesh_bytes = _generate_simple_gltf(length_mm, width_mm, height_mm)
-                mesh_key = f"reconstruction/{request.job_id}/room.glb"
-                from openlintel_shared.storage import upload_file
-
-                upload_file(
-                    settings.MINIO_BUCKET, mesh_key, mesh_bytes,
-                    content_type="model/gltf-binary", settings=settings,
-                )
-            except Exception as mesh_exc:
-                logger.warning("mesh_generation_failed", error=str(mesh_exc))
+        # Generate simple glTF mesh from dimensions
+        length_mm = dimensions.get("length_mm", 4000)
+        width_mm = dimensions.get("width_mm", 3000)
+        height_mm = dimensions.get("height_mm", 2700)
 
-            await update_job_status(
-                db, request.job_id, status="running", progress=90,
-                output_json={"current_step": "Finalising results"},
+        mesh_key: str | None = None
+        try:
+            mesh_key = await _store_room_mesh(
+                request.job_id, length_mm, width_mm, height_mm, settings,
             )
+        except Exception as mesh_exc:
+            logger.warning("mesh_generation_failed", error=str(mesh_exc))
+
+        # Build output
+        dimension_list = [
+            {"measurement": "length", "value_mm": length_mm, "confidence": dimensions.get("length_confidence", 0.7)},
+            {"measurement": "width", "value_mm": width_mm, "confidence": dimensions.get("width_confidence", 0.7)},
+            {"measurement": "height", "value_mm": height_mm, "confidence": dimensions.get("height_confidence", 0.6)},
+        ]
 
-            # Build output
-            dimension_list = [
-                {"measurement": "length", "value_mm": length_mm, "confidence": dimensions.get("length_confidence", 0.7)},
-                {"measurement": "width", "value_mm": width_mm, "confidence": dimensions.get("width_confidence", 0.7)},
-                {"measurement": "height", "value_mm": height_mm, "confidence": dimensions.get("height_confidence", 0.6)},
-            ]
-
-            output = {
-                "room_id": request.room_id,
-                "dimensions": dimension_list,
-                "length_mm": length_mm,
-                "width_mm": width_mm,
-                "height_mm": height_mm,
-                "mesh_storage_key": mesh_key,
-                "images_processed": len(images_data),
-                "reference_object": request.reference_object,
-            }
+        output = {
+            "room_id": request.room_id,
+            "dimensions": dimension_list,
+            "length_mm": length_mm,
+            "width_mm": width_mm,
+            "height_mm": height_mm,
+            "mesh_storage_key": mesh_key,
+            "images_processed": len(images_data),
+            "reference_object": request.reference_object,
+        }
 
-            await update_job_status(
-                db, request.job_id,
+        async with session_scope() as db:
+            await throttler.update(
+                db,
                 status="completed",
                 progress=100,
                 output_json=output,
             )
 
-            logger.info(
-                "reconstruction_job_completed",
-                job_id=request.job_id,
-                length_mm=length_mm,
-                width_mm=width_mm,
-                height_mm=height_mm,
+        try:
+            await cache_set(
+                _reconstruction_cache_key(request), output,
+                ttl=RECONSTRUCTION_RESULT_CACHE_TTL,
             )
+        except Exception:
+            logger.warning("reconstruction_result_cache_write_failed", exc_info=True)
+
+        logger.info(
+            "reconstruction_job_completed",
+            job_id=request.job_id,
+            length_mm=length_mm,
+            width_mm=width_mm,
+            height_mm=height_mm,
+        )
 
-        except Exception as exc:
-            logger.error("reconstruction_job_failed", job_id=request.job_id, error=str(exc))
-            await update_job_status(db, request.job_id, status="failed", error=str(exc))
+    except Exception as exc:
+        logger.error("reconstruction_job_failed", job_id=request.job_id, error=str(exc))
+        async with session_scope() as db:
+            await throttler.update(db, status="failed", error=str(exc))
 
 
-async def _estimate_dimensions_vlm(
-    images_data: list[bytes],
-    reference_object: str | None = None,
-    api_key_material: dict[str, str] | None = None,
-) -> dict[str, float]:
-    """Use a VLM to estimate room dimensions from photos.
+def _reconstruction_cache_key(request: ReconstructionJobInput) -> str:
+    """Return the result cache key for a job's inputs.
 
-    Falls back to default dimensions if VLM is unavailable.
+    Image URL order and repeats do not change the result, so the URLs are
+    deduplicated and sorted before hashing.
     """
-    import base64
+    signature = orjson.dumps([
+        request.project_id,
+        request.room_id,
+        sorted(set(request.image_urls)),
+        request.reference_object,
+    ])
+    return f"{RECONSTRUCTION_RESULT_CACHE_PREFIX}{hashlib.sha256(signature).hexdigest()}"
 
-    try:
-        import litellm
-
-        # Prepare the prompt
-        ref_info = ""
-        if reference_object and reference_object in REFERENCE_SIZES:
-            ref = REFERENCE_SIZES[reference_object]
-            ref_info = (
-                f"\nCalibration reference: {reference_object} "
-                f"(real size: {ref['width']}mm x {ref['height']}mm). "
-                f"Use this to calibrate your measurements."
-            )
 
-        system_prompt = (
-            "You are a room measurement expert. Analyse the room photos and "
-            "estimate the room dimensions in millimetres. "
-            "Return a JSON object with: length_mm, width_mm, height_mm, "
-            "length_confidence (0-1), width_confidence (0-1), height_confidence (0-1)."
-            + ref_info
+async def _get_http_session() -> aiohttp.ClientSession:
+    """Return the process-wide HTTP session used for image downloads.
+
+    The session is created on first use and shared by every job so
+    keep-alive connections (and their TLS handshakes) are reused.
+    """
+    global _http_session  # noqa: PLW0603
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=MAX_CONCURRENT_DOWNLOADS),
         )
+    return _http_session
 
-        # Encode first image as data URI
-        img_b64 = base64.b64encode(images_data[0]).decode("ascii")
-        data_uri = f"data:image/jpeg;base64,{img_b64}"
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "image_url", "image_url": {"url": data_uri}},
-                    {"type": "text", "text": "Estimate the room dimensions from this photo."},
-                ],
-            },
-        ]
+async def close_http_session() -> None:
+    """Close the shared HTTP session.
 
-        kwargs: dict[str, Any] = {
-            "model": "openai/gpt-4o",
-            "messages": messages,
-            "temperature": 0.1,
-            "max_tokens": 256,
-            "response_format": {"type": "json_object"},
-        }
+    Call this in your FastAPI ``shutdown`` lifespan event.
+    """
+    global _http_session  # noqa: PLW0603
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+async def _iter_downloaded_images(image_urls: list[str]) -> AsyncIterator[bytes]:
+    """Download images concurrently and yield them in input order, skipping failures.
+
+    At most ``MAX_CONCURRENT_DOWNLOADS`` requests are in flight at once.
+    Each image is yielded as soon as it and every earlier image have
+    finished, so callers can start work on it while later downloads are
+    still running.  Bodies are streamed in ``DOWNLOAD_CHUNK_SIZE`` chunks
+    and images larger than ``MAX_IMAGE_BYTES`` are rejected.  Images whose
+    content (by SHA-256) duplicates an earlier one, e.g. the same photo
+    served from two hosts, are dropped.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    session = await _get_http_session()
+
+    async def _fetch(url: str) -> bytes:
+        async with semaphore, session.get(url, raise_for_status=True) as resp:
+            if resp.content_length is not None and resp.content_length > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+            buffer = bytearray()
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+            return bytes(buffer)
+
+    tasks = [asyncio.create_task(_fetch(url)) for url in image_urls]
+    seen: set[bytes] = set()
+    try:
+        for url, task in zip(image_urls, tasks, strict=True):
+            try:
+                image = await task
+            except Exception as exc:
+                logger.warning("image_download_failed", url=url, error=str(exc))
+                continue
+            content_hash = hashlib.sha256(image).digest()
+            if content_hash in seen:
+                logger.info("image_download_duplicate", url=url)
+                continue
+            seen.add(content_hash)
+            yield image
+    finally:
+        # Stop outstanding downloads if the caller bails out early
+        for task in tasks:
+            task.cancel()
+
+
+def _dimension_system_prompt(reference_object: str | None) -> str:
+    """Build the VLM system prompt, with calibration details for known references."""
+    ref_info = ""
+    if reference_object and reference_object in REFERENCE_SIZES:
+        ref = REFERENCE_SIZES[reference_object]
+        ref_info = (
+            f"\nCalibration reference: {reference_object} "
+            f"(real size: {ref['width']}mm x {ref['height']}mm). "
+            f"Use this to calibrate your measurements."
+        )
 
-        response = await litellm.acompletion(**kwargs)
-        content = response.choices[0].message.content or "{}"
+    return (
+        "You are a room measurement expert. Analyse the room photos and "
+        "estimate the room dimensions in millimetres. "
+        "Return a JSON object with: length_mm, width_mm, height_mm, "
+        "length_confidence (0-1), width_confidence (0-1), height_confidence (0-1)."
+        + ref_info
+    )
 
-        dims = json.loads(content)
-        return {
-            "length_mm": float(dims.get("length_mm", 4000)),
-            "width_mm": float(dims.get("width_mm", 3000)),
-            "height_mm": float(dims.get("height_mm", 2700)),
-            "length_confidence": float(dims.get("length_confidence", 0.5)),
-            "width_confidence": float(dims.get("width_confidence", 0.5)),
-            "height_confidence": float(dims.get("height_confidence", 0.4)),
-        }
 
-    except Exception as exc:
-        logger.warning("vlm_dimension_estimation_failed", error=str(exc))
+# System prompt per reference object, built once so every call for a given
+# reference sends byte-identical text
+_DIMENSION_SYSTEM_PROMPTS: dict[str | None, str] = {
+    reference: _dimension_system_prompt(reference) for reference in (None, *REFERENCE_SIZES)
+}
+
+
+async def _estimate_dimensions_vlm(
+    estimates: list[asyncio.Task[dict[str, float]]],
+) -> dict[str, float]:
+    """Combine per-photo VLM dimension estimates into one.
+
+    ``estimates`` are the :func:`_estimate_dimensions_one` tasks started
+    for up to ``MAX_VLM_IMAGES`` photos; failed ones are skipped and the
+    rest combined with :func:`_combine_dimension_estimates`.  Falls back to
+    default dimensions if no estimate succeeded.
+    """
+    results = await asyncio.gather(*estimates, return_exceptions=True)
+    succeeded: list[dict[str, float]] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("vlm_dimension_estimation_failed", error=str(result))
+        else:
+            succeeded.append(result)
+
+    if not succeeded:
         return {
             "length_mm": 4000,
             "width_mm": 3000,
@@ -298,51 +437,249 @@ async def _estimate_dimensions_vlm(
             "height_confidence": 0.3,
         }
 
+    return _combine_dimension_estimates(succeeded)
 
-def _generate_simple_gltf(
+
+async def _estimate_dimensions_one(
+    image: bytes,
+    system_prompt: str,
+    reference_object: str | None = None,
+    api_key_material: dict[str, str] | None = None,
+) -> dict[str, float]:
+    """Estimate room dimensions from a single photo with one VLM call.
+
+    Estimates are cached by the photo's SHA-256 and the reference object,
+    so re-submitted photos skip the VLM call.
+    """
+    cache_key = (
+        f"{VLM_DIMENSIONS_CACHE_PREFIX}{hashlib.sha256(image).hexdigest()}"
+        f":{reference_object or 'none'}"
+    )
+    try:
+        cached = await cache_get(cache_key)
+    except Exception:
+        logger.warning("vlm_dimension_cache_read_failed", exc_info=True)
+        cached = None
+    if cached is not None:
+        logger.info("vlm_dimension_cache_hit", cache_key=cache_key)
+        return cached
+
+    # Encode the image as data URI, downscaled off the event loop
+    vlm_image = await asyncio.to_thread(_downscale_for_vlm, image)
+    data_uri = (_JPEG_DATA_URI_PREFIX + base64.b64encode(vlm_image)).decode("ascii")
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": [
+                {"type": "image_url", "image_url": {"url": data_uri}},
+                {"type": "text", "text": "Estimate the room dimensions from this photo."},
+            ],
+        },
+    ]
+
+    kwargs: dict[str, Any] = {
+        "model": "openai/gpt-4o",
+        "messages": messages,
+        "temperature": 0.1,
+        # The reply is a six-field JSON object of roughly 50-70 tokens
+        "max_tokens": 96,
+        "response_format": {"type": "json_object"},
+    }
+
+    response = await acompletion(**kwargs)
+    content = response.choices[0].message.content or "{}"
+
+    dims = orjson.loads(content)
+    estimate = {
+        "length_mm": float(dims.get("length_mm", 4000)),
+        "width_mm": float(dims.get("width_mm", 3000)),
+        "height_mm": float(dims.get("height_mm", 2700)),
+        "length_confidence": float(dims.get("length_confidence", 0.5)),
+        "width_confidence": float(dims.get("width_confidence", 0.5)),
+        "height_confidence": float(dims.get("height_confidence", 0.4)),
+    }
+    try:
+        await cache_set(cache_key, estimate, ttl=VLM_DIMENSIONS_CACHE_TTL)
+    except Exception:
+        logger.warning("vlm_dimension_cache_write_failed", exc_info=True)
+    return estimate
+
+
+def _combine_dimension_estimates(estimates: list[dict[str, float]]) -> dict[str, float]:
+    """Combine per-photo estimates into one.
+
+    Each dimension is the confidence-weighted median of the per-photo
+    values, which ignores a single badly framed photo; its confidence is the
+    highest reported for that dimension.
+    """
+    combined: dict[str, float] = {}
+    for measurement in ("length", "width", "height"):
+        pairs = sorted(
+            (est[f"{measurement}_mm"], max(est[f"{measurement}_confidence"], 0.0))
+            for est in estimates
+        )
+        total_weight = sum(weight for _, weight in pairs)
+        if total_weight <= 0:
+            # No usable confidences: fall back to equal weights
+            pairs = [(value, 1.0) for value, _ in pairs]
+            total_weight = float(len(pairs))
+
+        cumulative = 0.0
+        for value, weight in pairs:
+            cumulative += weight
+            if cumulative >= total_weight / 2:
+                combined[f"{measurement}_mm"] = value
+                break
+        combined[f"{measurement}_confidence"] = max(
+            est[f"{measurement}_confidence"] for est in estimates
+        )
+    return combined
+
+
+async def _store_room_mesh(
+    job_id: str,
     length_mm: float,
     width_mm: float,
     height_mm: float,
+    settings: Settings,
+) -> str:
+    """Upload the room-box GLB for the given dimensions and return its storage key.
+
+    Dimensions are rounded to whole millimetres.  The box for a given
+    rounded size is identical across jobs, so it is stored under a
+    size-addressed key that belongs to no job; the key is recorded in Redis
+    so later jobs skip the upload.
+    """
+    dims = (round(length_mm), round(width_mm), round(height_mm))
+    uploaded_key = f"{GLB_UPLOAD_CACHE_PREFIX}{dims[0]}x{dims[1]}x{dims[2]}"
+    try:
+        existing = await cache_get(uploaded_key)
+    except Exception:
+        logger.warning("mesh_upload_cache_read_failed", exc_info=True)
+        existing = None
+    if existing:
+        logger.info("mesh_upload_reused", job_id=job_id, mesh_key=existing)
+        return existing
+
+    mesh_key = f"reconstruction/boxes/{dims[0]}x{dims[1]}x{dims[2]}.glb"
+
+    def _generate_and_upload() -> None:
+        upload_file(
+            settings.MINIO_BUCKET, mesh_key, _generate_simple_gltf(*dims),
+            content_type="model/gltf-binary", settings=settings,
+        )
+
+    # Mesh packing and the S3 PUT both run in one worker-thread hop
+    await asyncio.to_thread(_generate_and_upload)
+    try:
+        await cache_set(uploaded_key, mesh_key, ttl=GLB_UPLOAD_CACHE_TTL)
+    except Exception:
+        logger.warning("mesh_upload_cache_write_failed", exc_info=True)
+    return mesh_key
+
+
+def _downscale_for_vlm(image: bytes) -> bytes:
+    """Shrink a photo to at most ``VLM_IMAGE_MAX_EDGE`` px and re-encode it as JPEG.
+
+    VLM tokens, upload size and base64 work all scale with the image bytes,
+    and the dimension estimate does not need full-resolution photos.
+    Images Pillow cannot decode are returned unchanged.
+    """
+    try:
+        with Image.open(io.BytesIO(image)) as im:
+            rgb = im.convert("RGB")
+    except Exception:
+        logger.warning("vlm_image_downscale_failed", exc_info=True)
+        return image
+
+    rgb.thumbnail((VLM_IMAGE_MAX_EDGE, VLM_IMAGE_MAX_EDGE), Image.Resampling.BILINEAR)
+    buf = io.BytesIO()
+    rgb.save(buf, "JPEG", quality=VLM_IMAGE_JPEG_QUALITY, optimize=True)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=1024)
+def _generate_simple_gltf(
+    length_mm: int,
+    width_mm: int,
+    height_mm: int,
 ) -> bytes:
     """Generate a simple glTF binary (GLB) box representing the room.
 
-    Creates a minimal valid GLB file with a single box mesh.
+    Creates a minimal valid GLB file with a single box mesh.  Takes
+    whole-millimetre dimensions so repeated room sizes hit the cache.
     """
-    import struct
-
     # Convert mm to metres for glTF (which uses metres)
     lm = length_mm / 1000.0
     wm = width_mm / 1000.0
     hm = height_mm / 1000.0
 
-    # 8 vertices of a box
-    vertices = [
-        0, 0, 0,    lm, 0, 0,    lm, wm, 0,    0, wm, 0,     # bottom
-        0, 0, hm,   lm, 0, hm,   lm, wm, hm,   0, wm, hm,    # top
-    ]
+    # Scale the unit box to the room; float32 little-endian as glTF expects
+    vertex_data = (_BOX_UNIT_VERTICES * np.array([lm, wm, hm], dtype="<f4")).tobytes()
+    buffer_length = len(_BOX_INDEX_DATA) + len(vertex_data)
 
-    # 12 triangles (6 faces x 2 triangles)
-    indices = [
-        0, 1, 2,  0, 2, 3,  # bottom
-        4, 6, 5,  4, 7, 6,  # top
-        0, 4, 5,  0, 5, 1,  # front
-        2, 6, 7,  2, 7, 3,  # back
-        0, 3, 7,  0, 7, 4,  # left
-        1, 5, 6,  1, 6, 2,  # right
-    ]
+    # Only the position bounds vary between boxes
+    json_bytes = (_GLTF_JSON_TEMPLATE % (lm, wm, hm)).encode("utf-8")
+    # JSON chunk is padded with spaces to 4-byte alignment
+    json_length = len(json_bytes) + (-len(json_bytes) & 3)
+
+    # GLB header: magic + version + length
+    # JSON chunk: length + type + data
+    # BIN chunk: length + type + data
+    # Written into one preallocated buffer instead of concatenating chunks
+    total_length = 12 + 8 + json_length + 8 + buffer_length
+    out = bytearray(total_length)
+    struct.pack_into("<III", out, 0, 0x46546C67, 2, total_length)  # glTF magic
+    struct.pack_into("<II", out, 12, json_length, 0x4E4F534A)  # JSON
+    json_end = 20 + len(json_bytes)
+    out[20:json_end] = json_bytes
+    out[json_end:20 + json_length] = b" " * (json_length - len(json_bytes))
+    bin_start = 20 + json_length
+    struct.pack_into("<II", out, bin_start, buffer_length, 0x004E4942)  # BIN
+    index_end = bin_start + 8 + len(_BOX_INDEX_DATA)
+    out[bin_start + 8:index_end] = _BOX_INDEX_DATA
+    out[index_end:] = vertex_data
+
+    return bytes(out)
+
+
+# 8 vertices of a unit box, scaled per room to (length, width, height)
+_BOX_UNIT_VERTICES = np.array(
+    [
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],  # bottom
+        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],  # top
+    ],
+    dtype="<f4",
+)
+
+# 12 triangles (6 faces x 2 triangles) over the 8 box vertices
+_BOX_INDICES = (
+    0, 1, 2,  0, 2, 3,  # bottom
+    4, 6, 5,  4, 7, 6,  # top
+    0, 4, 5,  0, 5, 1,  # front
+    2, 6, 7,  2, 7, 3,  # back
+    0, 3, 7,  0, 7, 4,  # left
+    1, 5, 6,  1, 6, 2,  # right
+)
+_BOX_VERTEX_COUNT = len(_BOX_UNIT_VERTICES)
 
-    # Pack binary data
-    vertex_data = struct.pack(f"<{len(vertices)}f", *vertices)
-    index_data = struct.pack(f"<{len(indices)}H", *indices)
+# Packed uint16 indices, padded to 4-byte alignment
+_BOX_INDEX_DATA = np.array(_BOX_INDICES, dtype="<u2").tobytes()
+_BOX_INDEX_DATA += b"\x00" * (-len(_BOX_INDEX_DATA) & 3)
 
-    # Pad to 4-byte alignment
-    while len(index_data) % 4 != 0:
-        index_data += b"\x00"
 
-    buffer_data = index_data + vertex_data
-    buffer_length = len(buffer_data)
+def _build_gltf_json_template() -> str:
+    """Serialise the box glTF document once, leaving ``%r`` slots for its bounds.
 
-    # Build glTF JSON
+    Everything except the POSITION accessor's ``max`` is fixed for a box mesh.
+    ``%r`` renders floats with the same shortest round-trip form as
+    ``orjson``, so the output is byte-identical to serialising the full
+    document per call.
+    """
+    index_bytes = len(_BOX_INDEX_DATA)
+    vertex_bytes = _BOX_UNIT_VERTICES.nbytes
     gltf_json = {
         "asset": {"version": "2.0", "generator": "OpenLintel"},
         "scene": 0,
@@ -358,17 +695,17 @@ def _generate_simple_gltf(
             {
                 "bufferView": 0,
                 "componentType": 5123,  # UNSIGNED_SHORT
-                "count": len(indices),
+                "count": len(_BOX_INDICES),
                 "type": "SCALAR",
-                "max": [max(indices)],
-                "min": [min(indices)],
+                "max": [max(_BOX_INDICES)],
+                "min": [min(_BOX_INDICES)],
             },
             {
                 "bufferView": 1,
                 "componentType": 5126,  # FLOAT
-                "count": len(vertices) // 3,
+                "count": _BOX_VERTEX_COUNT,
                 "type": "VEC3",
-                "max": [lm, wm, hm],
+                "max": ["__BOUNDS__"],
                 "min": [0, 0, 0],
             },
         ],
@@ -376,33 +713,19 @@ def _generate_simple_gltf(
             {
                 "buffer": 0,
                 "byteOffset": 0,
-                "byteLength": len(index_data),
+                "byteLength": index_bytes,
                 "target": 34963,  # ELEMENT_ARRAY_BUFFER
             },
             {
                 "buffer": 0,
-                "byteOffset": len(index_data),
-                "byteLength": len(vertex_data),
+                "byteOffset": index_bytes,
+                "byteLength": vertex_bytes,
                 "target": 34962,  # ARRAY_BUFFER
             },
         ],
-        "buffers": [{"byteLength": buffer_length}],
+        "buffers": [{"byteLength": index_bytes + vertex_bytes}],
     }
+    return orjson.dumps(gltf_json).decode().replace('"__BOUNDS__"', "%r,%r,%r")
 
-    json_str = json.dumps(gltf_json, separators=(",", ":"))
-    json_bytes = json_str.encode("utf-8")
-
-    # Pad JSON to 4-byte alignment
-    while len(json_bytes) % 4 != 0:
-        json_bytes += b" "
-
-    # GLB header: magic + version + length
-    # JSON chunk: length + type + data
-    # BIN chunk: length + type + data
-    json_chunk = struct.pack("<II", len(json_bytes), 0x4E4F534A) + json_bytes  # JSON
-    bin_chunk = struct.pack("<II", buffer_length, 0x004E4942) + buffer_data  # BIN
-
-    total_length = 12 + len(json_chunk) + len(bin_chunk)
-    header = struct.pack("<III", 0x46546C67, 2, total_length)  # glTF magic
 
-    return header + json_chunk + bin_chunk
+_GLTF_JSON_TEMPLATE = _build_gltf_json_template()
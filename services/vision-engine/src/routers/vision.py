@@ -10,8 +10,8 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from openlintel_shared.db import get_db_session, get_session_factory
-from openlintel_shared.job_worker import update_job_status, get_user_api_key
+from openlintel_shared.db import get_db_session, session_scope
+from openlintel_shared.job_worker import ProgressThrottler, get_user_api_key, update_job_status
 from openlintel_shared.config import Settings, get_settings
 
 from src.agents.vision_agent import detect_rooms_from_image
@@ -74,66 +74,68 @@ async def _run_detection(
     image_url: str,
 ) -> None:
     """Background task: run VLM room detection and persist results."""
-    session_factory = get_session_factory()
-    async with session_factory() as db:
-        try:
-            await update_job_status(db, job_id, status="running", progress=20)
-
+    # Each DB touch gets its own short session so no pooled connection is
+    # held across the VLM call.
+    throttler = ProgressThrottler(job_id)
+    try:
+        # Progress is written only at phase boundaries: before the VLM
+        # call and with the final result.
+        async with session_scope() as db:
             # Get user's API key for OpenAI
             api_key = await get_user_api_key(db, user_id, provider="openai")
             if api_key is None:
-                await update_job_status(
-                    db, job_id, status="failed",
+                await throttler.update(
+                    db, status="failed",
                     error="No API key configured for provider 'openai'",
                 )
                 return
 
-            await update_job_status(db, job_id, status="running", progress=40)
+            await throttler.update(db, status="running", progress=40)
 
-            # Run VLM detection
-            result = await detect_rooms_from_image(
-                image_url=image_url,
-                api_key_material={
-                    "encrypted_key": api_key["encrypted_key"],
-                    "iv": api_key["iv"],
-                    "auth_tag": api_key["auth_tag"],
-                },
-            )
+        # Run VLM detection
+        result = await detect_rooms_from_image(
+            image_url=image_url,
+            api_key_material={
+                "encrypted_key": api_key["encrypted_key"],
+                "iv": api_key["iv"],
+                "auth_tag": api_key["auth_tag"],
+            },
+        )
 
-            await update_job_status(db, job_id, status="running", progress=80)
-
-            # Persist result as job output
-            output = {
-                "rooms": [
-                    {
-                        "id": f"room_{i}",
-                        "name": room.name,
-                        "type": room.type,
-                        "polygon": [{"x": p.x, "y": p.y} for p in room.polygon],
-                        "lengthMm": room.length_mm,
-                        "widthMm": room.width_mm,
-                        "areaSqMm": room.area_sq_mm,
-                    }
-                    for i, room in enumerate(result.rooms)
-                ],
-                "width": result.width,
-                "height": result.height,
-                "scale": result.scale,
-            }
-
-            await update_job_status(
-                db, job_id,
+        # Persist result as job output
+        output = {
+            "rooms": [
+                {
+                    "id": f"room_{i}",
+                    "name": room.name,
+                    "type": room.type,
+                    "polygon": [{"x": p.x, "y": p.y} for p in room.polygon],
+                    "lengthMm": room.length_mm,
+                    "widthMm": room.width_mm,
+                    "areaSqMm": room.area_sq_mm,
+                }
+                for i, room in enumerate(result.rooms)
+            ],
+            "width": result.width,
+            "height": result.height,
+            "scale": result.scale,
+        }
+
+        async with session_scope() as db:
+            await throttler.update(
+                db,
                 status="completed",
                 progress=100,
                 output_json=output,
             )
 
-            logger.info(
-                "vision_job_completed",
-                job_id=job_id,
-                rooms_detected=len(result.rooms),
-            )
+        logger.info(
+            "vision_job_completed",
+            job_id=job_id,
+            rooms_detected=len(result.rooms),
+        )
 
-        except Exception as exc:
-            logger.error("vision_job_failed", job_id=job_id, error=str(exc))
-            await update_job_status(db, job_id, status="failed", error=str(exc))
+    except Exception as exc:
+        logger.error("vision_job_failed", job_id=job_id, error=str(exc))
+        async with session_scope() as db:
+            await throttler.update(db, status="failed", error=str(exc))